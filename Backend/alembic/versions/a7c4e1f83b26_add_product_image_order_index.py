@@ -0,0 +1,28 @@
+"""Add product image order index
+
+Revision ID: a7c4e1f83b26
+Revises: f6b3d9e52a17
+Create Date: 2026-10-18 17:48:21.530967
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c4e1f83b26'
+down_revision: Union[str, Sequence[str], None] = 'f6b3d9e52a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_product_images_product_id_id', 'product_images', ['product_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_product_images_product_id_id', table_name='product_images')
@@ -0,0 +1,36 @@
+"""Add product documents table
+
+Revision ID: b7d2e91c4a10
+Revises: 4523f036554e
+Create Date: 2026-10-18 14:12:40.512387
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d2e91c4a10'
+down_revision: Union[str, Sequence[str], None] = '4523f036554e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Documents are filled lazily on first read; run
+    # `python -m app.db.rebuild_product_documents` to backfill up front.
+    op.create_table('product_documents',
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('document', sa.Text(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('product_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('product_documents')
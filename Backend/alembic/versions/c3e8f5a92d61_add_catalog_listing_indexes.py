@@ -0,0 +1,38 @@
+"""Add catalog listing indexes
+
+Revision ID: c3e8f5a92d61
+Revises: b7d2e91c4a10
+Create Date: 2026-10-18 14:31:07.204519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e8f5a92d61'
+down_revision: Union[str, Sequence[str], None] = 'b7d2e91c4a10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_products_created_at_id', 'products', ['created_at', 'id'], unique=False)
+    op.create_index('ix_products_price_id', 'products', ['price', 'id'], unique=False)
+    op.create_index('ix_products_status_gender_created_at_id', 'products', ['status', 'gender', 'created_at', 'id'], unique=False)
+    op.create_index('ix_products_category_id_price_id', 'products', ['category_id', 'price', 'id'], unique=False)
+    op.create_index('ix_product_sizes_size_id_product_id', 'product_sizes', ['size_id', 'product_id'], unique=False)
+    op.create_index('ix_product_colours_colour_id_product_id', 'product_colours', ['colour_id', 'product_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_product_colours_colour_id_product_id', table_name='product_colours')
+    op.drop_index('ix_product_sizes_size_id_product_id', table_name='product_sizes')
+    op.drop_index('ix_products_category_id_price_id', table_name='products')
+    op.drop_index('ix_products_status_gender_created_at_id', table_name='products')
+    op.drop_index('ix_products_price_id', table_name='products')
+    op.drop_index('ix_products_created_at_id', table_name='products')
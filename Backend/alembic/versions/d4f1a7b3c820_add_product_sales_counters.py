@@ -0,0 +1,54 @@
+"""Add product sales counters
+
+Revision ID: d4f1a7b3c820
+Revises: c3e8f5a92d61
+Create Date: 2026-10-18 15:02:44.318092
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f1a7b3c820'
+down_revision: Union[str, Sequence[str], None] = 'c3e8f5a92d61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Counters start empty; run `python -m app.db.rebuild_sales_counters`
+    # to backfill them from existing orders.
+    op.create_table('product_sales_daily',
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('units', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('revenue', sa.Float(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('product_id', 'day')
+    )
+    op.create_table('product_sales',
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('units_7d', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('revenue_7d', sa.Float(), server_default='0', nullable=False),
+    sa.Column('units_30d', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('revenue_30d', sa.Float(), server_default='0', nullable=False),
+    sa.Column('units_total', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('revenue_total', sa.Float(), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('product_id')
+    )
+    op.add_column('products', sa.Column('popularity', sa.Integer(), server_default='0', nullable=False))
+    op.create_index('ix_products_popularity_id', 'products', ['popularity', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_products_popularity_id', table_name='products')
+    op.drop_column('products', 'popularity')
+    op.drop_table('product_sales')
+    op.drop_table('product_sales_daily')
@@ -0,0 +1,32 @@
+"""Add product image derivatives
+
+Revision ID: e5a2c8d41f93
+Revises: d4f1a7b3c820
+Create Date: 2026-10-18 15:40:12.604415
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a2c8d41f93'
+down_revision: Union[str, Sequence[str], None] = 'd4f1a7b3c820'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Stored product documents gain the new (empty) image fields on their next
+    # rewrite; run `python -m app.db.rebuild_product_documents` to do it now.
+    op.add_column('product_images', sa.Column('thumbnail_url', sa.String(), nullable=True))
+    op.add_column('product_images', sa.Column('variants', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('product_images', 'variants')
+    op.drop_column('product_images', 'thumbnail_url')
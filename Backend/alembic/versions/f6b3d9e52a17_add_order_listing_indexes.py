@@ -0,0 +1,34 @@
+"""Add order listing indexes
+
+Revision ID: f6b3d9e52a17
+Revises: e5a2c8d41f93
+Create Date: 2026-10-18 17:02:45.118302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6b3d9e52a17'
+down_revision: Union[str, Sequence[str], None] = 'e5a2c8d41f93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_orders_order_date_id', 'orders', ['order_date', 'id'], unique=False)
+    op.create_index('ix_orders_status_order_date_id', 'orders', ['status', 'order_date', 'id'], unique=False)
+    op.create_index('ix_orders_user_id_order_date_id', 'orders', ['user_id', 'order_date', 'id'], unique=False)
+    op.create_index('ix_orderitems_order_id', 'orderitems', ['order_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_orderitems_order_id', table_name='orderitems')
+    op.drop_index('ix_orders_user_id_order_date_id', table_name='orders')
+    op.drop_index('ix_orders_status_order_date_id', table_name='orders')
+    op.drop_index('ix_orders_order_date_id', table_name='orders')
@@ -4,6 +4,7 @@ from typing import List
 from app.services import cart_services
 from app.schemas.cart_schema import CartItemResponse, CartItemCreate, CartItemUpdate
 from app.utils import deps
+from app.utils.documents import json_response
 from app.models.user_model import User
 
 router = APIRouter()
@@ -62,4 +63,4 @@ def get_all_cart_items_endpoint(
 ):
 
     items = cart_services.get_user_cart_items(db=db, current_user=current_user)
-    return items
+    return json_response(items)
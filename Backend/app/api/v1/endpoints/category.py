@@ -1,10 +1,11 @@
 # app/api/v1/endpoints/categories.py
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, Response, status
 from sqlalchemy.orm import Session
 from typing import List
 from app.schemas.product_schema import CategoryResponse, CategoryCreate
-from app.utils import deps
+from app.utils import deps, http_cache
+from app.core.config import settings
 from app.models.user_model import User
 from app.services import category_services
 
@@ -44,7 +45,14 @@ def delete_category_endpoint(
 
 # This is a public endpoint, so no user dependency is needed.
 @router.get("/", response_model=List[CategoryResponse], status_code=status.HTTP_200_OK)
-def get_all_categories_endpoint(db: Session = Depends(deps.get_db)):
+def get_all_categories_endpoint(
+    request: Request, response: Response, db: Session = Depends(deps.get_db)
+):
     """Gets a list of all available categories."""
+    etag = category_services.get_categories_etag(db=db)
+    if http_cache.is_not_modified(request, etag):
+        return http_cache.not_modified_response(etag, settings.CATALOG_ETAG_CACHE_CONTROL)
+
     categories = category_services.get_all_categories(db=db)
-    return categories
+    http_cache.set_cache_headers(response, etag, settings.CATALOG_ETAG_CACHE_CONTROL)
+    return categories
\ No newline at end of file
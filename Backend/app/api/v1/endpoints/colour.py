@@ -1,11 +1,12 @@
 # app/api/v1/endpoints/colours.py
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, Response, status
 from sqlalchemy.orm import Session
 from typing import List
 
 from app.schemas.product_schema import ColourResponse, ColourCreate
-from app.utils import deps
+from app.utils import deps, http_cache
+from app.core.config import settings
 from app.models.user_model import User
 from app.services import colour_services
 
@@ -44,8 +45,15 @@ def delete_colour_endpoint(
 
 
 @router.get("/", response_model=List[ColourResponse], status_code=status.HTTP_200_OK)
-def get_all_colours_endpoint(db: Session = Depends(deps.get_db)):
+def get_all_colours_endpoint(
+    request: Request, response: Response, db: Session = Depends(deps.get_db)
+):
     """Gets a list of all available colours."""
+    etag = colour_services.get_colours_etag(db=db)
+    if http_cache.is_not_modified(request, etag):
+        return http_cache.not_modified_response(etag, settings.CATALOG_ETAG_CACHE_CONTROL)
+
     # Corrected variable name
     colours = colour_services.get_all_colours(db=db)
-    return colours
+    http_cache.set_cache_headers(response, etag, settings.CATALOG_ETAG_CACHE_CONTROL)
+    return colours
\ No newline at end of file
@@ -1,12 +1,21 @@
 # app/api/v1/endpoints/orders.py
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.orm import Session
 
 from app.services import order_services
-from app.schemas.order_schema import OrderResponse, OrderUpdate
+from app.services import flash_sale_services
+from app.schemas.order_schema import (
+    OrderResponse,
+    OrderStatus,
+    OrderSummaryPage,
+    OrderUpdate,
+)
 from app.utils import deps
+from app.utils.documents import json_response
 from app.models.user_model import User
-from typing import List
+from app.core.config import settings
+from datetime import datetime
+from typing import List, Optional
 
 router = APIRouter()
 
@@ -21,7 +30,38 @@ def create_order_endpoint(
     Creates a new order from the current user's shopping cart.
     """
     order = order_services.create_order_from_cart(db=db, current_user=current_user)
-    return order
+    return json_response(order, status_code=status.HTTP_201_CREATED)
+
+
+def flash_sale_available(product_id: int, quantity: int = Query(1, ge=1)) -> dict:
+    """
+    Turns away buyers of a sold-out (or missing) flash sale from the token
+    store alone. Declared before authentication, so those requests never
+    reach the database.
+    """
+    return flash_sale_services.get_flash_sale(product_id, quantity)
+
+
+@router.post(
+    "/flash-sale/{product_id}",
+    response_model=OrderResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+def create_flash_sale_order_endpoint(
+    product_id: int,
+    quantity: int = Query(1, ge=1),
+    sale: dict = Depends(flash_sale_available),
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_active_user),
+):
+    """
+    Buys `quantity` units of a product on flash sale, bypassing the cart.
+    Answers 409 with a shortfall report once the sale is sold out.
+    """
+    order = order_services.create_flash_sale_order(
+        db=db, current_user=current_user, product_id=product_id, quantity=quantity
+    )
+    return json_response(order, status_code=status.HTTP_201_CREATED)
 
 
 @router.get("/me", response_model=List[OrderResponse])
@@ -34,16 +74,64 @@ def get_my_orders_endpoint(
     Gets the order history for the currently logged-in user.
     """
     orders = order_services.get_user_order_history(db=db, current_user=current_user)
-    return orders
+    return json_response(orders)
+
+
+@router.get("/me/summary", response_model=OrderSummaryPage)
+def get_my_order_summaries_endpoint(
+    *,
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_active_user),
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=settings.ORDER_PAGE_MAX),
+):
+    """
+    Gets the current user's order history, newest first, in compact form:
+    each item carries only its product's id, name and primary image, and the
+    customer is left out. Pass the returned `next_cursor` back as `cursor`
+    for the next page.
+    """
+    page = order_services.get_user_order_summaries(
+        db=db, current_user=current_user, cursor=cursor, limit=limit
+    )
+    return json_response(page)
 
 
 @router.get("/admin/", response_model=List[OrderResponse])
 def get_all_orders_endpoint(
     db: Session = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_active_user),
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=settings.ORDER_PAGE_MAX),
+    status: Optional[OrderStatus] = None,
+    customer_id: Optional[int] = None,
+    customer_email: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    min_total: Optional[float] = None,
 ):
-    """Gets all orders for the admin panel."""
-    return order_services.get_all_orders_for_admin(db=db, current_user=current_user)
+    """
+    Gets one page of orders for the admin panel, newest first.
+
+    When more orders follow, the `X-Next-Cursor` response header holds the
+    cursor to pass back as `cursor` for the next page. Filters: `status`,
+    `customer_id` or `customer_email`, `date_from` (inclusive) / `date_to`
+    (exclusive) on the order date, and `min_total`.
+    """
+    orders, next_cursor = order_services.get_all_orders_for_admin(
+        db=db,
+        current_user=current_user,
+        cursor=cursor,
+        limit=limit,
+        customer_email=customer_email,
+        status=status,
+        user_id=customer_id,
+        date_from=date_from,
+        date_to=date_to,
+        min_total=min_total,
+    )
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return json_response(orders, headers=headers)
 
 
 @router.get("/admin/{order_id}", response_model=OrderResponse)
@@ -53,9 +141,10 @@ def get_single_order_endpoint(
     current_user: User = Depends(deps.get_current_active_user),
 ):
     """Gets a single order by its ID for the admin panel."""
-    return order_services.get_order_by_id_for_admin(
+    order = order_services.get_order_by_id_for_admin(
         db=db, order_id=order_id, current_user=current_user
     )
+    return json_response(order)
 
 
 @router.patch("/admin/{order_id}", response_model=OrderResponse)
@@ -1,11 +1,32 @@
 # app/api/v1/endpoints/products.py
-from fastapi import APIRouter, status, Depends, Query
+from fastapi import APIRouter, status, Depends, File, Query, Request, Response, UploadFile
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from app.schemas.product_schema import ProductResponse, ProductCreate, ProductUpdate, ProductPageResponse
+from app.schemas.product_schema import (
+    ProductResponse,
+    ProductCreate,
+    ProductUpdate,
+    ProductPageResponse,
+    ProductCursorPageResponse,
+    ProductFacetsResponse,
+    ProductSuggestion,
+    ProductImportReport,
+    ProductBulkPatch,
+    ProductBulkUpdateSummary,
+    ProductBatchResponse,
+    FlashSaleStart,
+    FlashSaleResponse,
+)
 from app.services import product_services  # Corrected import name
+from app.services import product_import_services
+from app.services import product_export_services
+from app.services import product_image_services
+from app.services import flash_sale_services
 from app.models.user_model import User
-from app.utils import deps
-from typing import List, Optional
+from app.utils import deps, http_cache
+from app.utils.documents import json_response
+from app.core.config import settings
+from typing import List, Optional, Union
 
 
 router = APIRouter()
@@ -28,6 +49,46 @@ def create_product_endpoint(
     return product
 
 
+@router.post("/import", response_model=ProductImportReport)
+def import_products_endpoint(
+    *,
+    db: Session = Depends(deps.get_db),
+    file: UploadFile = File(...),
+    current_user: User = Depends(deps.get_current_active_user)
+):
+    """
+    Bulk-creates products from a CSV (header row) or JSON Lines upload.
+    Only accessible by admin users.
+
+    Columns / keys: name, description, price, discount_price, stock, brand,
+    gender, status, category (name), sizes, colours (names) and images (URLs).
+    In CSV cells, separate multiple sizes, colours or images with "|".
+    Valid rows are created even if others fail; the report lists every
+    failed row by line number.
+    """
+    return product_import_services.import_products(
+        db=db, upload=file, current_user=current_user
+    )
+
+
+# Declared before "/{product_id}" so "bulk" isn't parsed as a product id.
+@router.patch("/bulk", response_model=ProductBulkUpdateSummary)
+def bulk_update_products_endpoint(
+    *,
+    db: Session = Depends(deps.get_db),
+    patches: List[ProductBulkPatch],
+    current_user: User = Depends(deps.get_current_active_user)
+):
+    """
+    Updates price, discount_price, stock and/or status for many products in
+    one transaction. Only accessible by admin users.
+    Returns how many products were updated and which ids don't exist.
+    """
+    return product_services.bulk_update_products(
+        db=db, patches=patches, current_user=current_user
+    )
+
+
 @router.patch(
     "/{product_id}", status_code=status.HTTP_200_OK, response_model=ProductResponse
 )
@@ -48,12 +109,179 @@ def update_product_endpoint(
     return product
 
 
+@router.get("/export")
+def export_products_endpoint(
+    *,
+    format: str = Query("ndjson", description="ndjson or csv"),
+    current_user: User = Depends(deps.get_current_active_user)
+):
+    """
+    Streams the whole catalog, ordered by id. Only accessible by admin users.
+
+    ndjson: one product per line, shaped like GET /product/{id}.
+    csv: the bulk import columns plus id, so the file can be re-imported.
+    """
+    stream = product_export_services.start_catalog_export(
+        current_user=current_user, file_format=format
+    )
+    return StreamingResponse(
+        stream,
+        media_type=product_export_services.EXPORT_FORMATS[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="products.{format}"',
+            "Cache-Control": "no-store",
+        },
+    )
+
+
+# Static routes must be declared before "/{product_id}".
+@router.post("/{product_id}/images", response_model=ProductResponse)
+def upload_product_images_endpoint(
+    *,
+    db: Session = Depends(deps.get_db),
+    product_id: int,
+    files: List[UploadFile] = File(...),
+    current_user: User = Depends(deps.get_current_active_user)
+):
+    """
+    Uploads photos for a product. Only accessible by admin users.
+
+    Each image is stored with a square thumbnail and WebP/AVIF copies at
+    IMAGE_VARIANT_WIDTHS, listed on the image as `thumbnail_url` and
+    `variants` so listing pages can request small versions.
+    """
+    return product_image_services.upload_product_images(
+        db=db, product_id=product_id, uploads=files, current_user=current_user
+    )
+
+
+@router.get("/flash-sales", response_model=List[FlashSaleResponse])
+def list_flash_sales_endpoint(
+    current_user: User = Depends(deps.get_current_active_user),
+):
+    """Lists the running flash sales. Only accessible by admin users."""
+    return flash_sale_services.list_flash_sales(current_user=current_user)
+
+
+@router.put("/{product_id}/flash-sale", response_model=FlashSaleResponse)
+def start_flash_sale_endpoint(
+    *,
+    db: Session = Depends(deps.get_db),
+    product_id: int,
+    sale_in: FlashSaleStart,
+    current_user: User = Depends(deps.get_current_active_user)
+):
+    """
+    Puts a product on flash sale. Only accessible by admin users.
+
+    `units` of its stock (default: all of it) are loaded into the token store.
+    Checkouts claim those tokens instead of locking the product row, and the
+    claims are written back to stock every FLASH_SALE_RECONCILE_INTERVAL seconds.
+    """
+    return flash_sale_services.start_flash_sale(
+        db=db, product_id=product_id, sale_in=sale_in, current_user=current_user
+    )
+
+
+@router.delete("/{product_id}/flash-sale", response_model=FlashSaleResponse)
+def end_flash_sale_endpoint(
+    product_id: int,
+    current_user: User = Depends(deps.get_current_active_user),
+):
+    """Ends a product's flash sale. Only accessible by admin users."""
+    return flash_sale_services.end_flash_sale(
+        product_id=product_id, current_user=current_user
+    )
+
+
+@router.get("/{product_id}/flash-sale", response_model=FlashSaleResponse)
+def get_flash_sale_endpoint(product_id: int, response: Response):
+    """
+    Units left in a product's flash sale, read from the token store without
+    touching the database (cheap enough for drop pages to poll). 404 if the
+    product isn't on sale.
+    """
+    response.headers["Cache-Control"] = "no-store"
+    return flash_sale_services.get_flash_sale(product_id, quantity=0)
+
+
+@router.get("/facets", response_model=ProductFacetsResponse)
+def get_product_facets_endpoint(
+    response: Response,
+    db: Session = Depends(deps.get_db),
+    gender: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    category_ids: Optional[List[int]] = Query(None),
+    size_ids: Optional[List[int]] = Query(None),
+    colour_ids: Optional[List[int]] = Query(None),
+    search: Optional[str] = None,
+):
+    """
+    Returns how many products match each gender, category, size, colour and
+    price range, given the same filters as the product listing.
+    """
+    filters = {
+        "gender": gender if gender else None,
+        "min_price": min_price,
+        "max_price": max_price,
+        "category_ids": category_ids if category_ids else None,
+        "size_ids": size_ids if size_ids else None,
+        "colour_ids": colour_ids if colour_ids else None,
+        "search": search,
+    }
+    filters = {k: v for k, v in filters.items() if v is not None}
+
+    http_cache.set_cache_headers(response, cache_control=settings.CATALOG_LIST_CACHE_CONTROL)
+    return product_services.get_product_facets(db=db, **filters)
+
+
+@router.get("/suggest", response_model=List[ProductSuggestion])
+def get_product_suggestions_endpoint(
+    response: Response,
+    db: Session = Depends(deps.get_db),
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = 8,
+):
+    """
+    Autocomplete for the search box: product names, brands and categories
+    matching what has been typed so far.
+    """
+    http_cache.set_cache_headers(response, cache_control=settings.CATALOG_LIST_CACHE_CONTROL)
+    return product_services.get_product_suggestions(db=db, query=q, limit=limit)
+
+
+@router.get("/batch", response_model=ProductBatchResponse)
+def get_products_batch_endpoint(
+    db: Session = Depends(deps.get_db),
+    ids: List[int] = Query(..., description="Product ids, e.g. ?ids=3&ids=7"),
+):
+    """
+    Returns up to PRODUCT_BATCH_MAX products by id, in the order requested.
+    Ids with no product are listed in `missing` instead of failing the request.
+    """
+    document = product_services.get_product_documents_by_ids(db=db, product_ids=ids)
+    response = json_response(document)
+    http_cache.set_cache_headers(response, cache_control=settings.CATALOG_LIST_CACHE_CONTROL)
+    return response
+
+
 @router.get("/{product_id}", response_model=ProductResponse)
 def get_product_by_id_endpoint(
-    *, db: Session = Depends(deps.get_db), product_id: int  # <-- CORRECTED LINE
+    *,
+    request: Request,
+    db: Session = Depends(deps.get_db),
+    product_id: int,
 ):
-    product = product_services.get_product_by_id(db=db, product_id=product_id)
-    return product
+    # Answer If-None-Match from the product's timestamp before loading it.
+    etag = product_services.get_product_etag(db=db, product_id=product_id)
+    if http_cache.is_not_modified(request, etag):
+        return http_cache.not_modified_response(etag, settings.CATALOG_ETAG_CACHE_CONTROL)
+
+    document = product_services.get_product_document_by_id(db=db, product_id=product_id)
+    response = json_response(document)
+    http_cache.set_cache_headers(response, etag, settings.CATALOG_ETAG_CACHE_CONTROL)
+    return response
 
 
 @router.delete("/{product_id}", status_code=status.HTTP_200_OK)
@@ -117,8 +345,9 @@ def delete_product_endpoint(
 #     return products_page
 
 
-@router.get("/", response_model=ProductPageResponse)
+@router.get("/", response_model=Union[ProductPageResponse, ProductCursorPageResponse])
 def get_all_products_endpoint(
+    response: Response,
     db: Session = Depends(deps.get_db),
     # IMPORTANT: Use get_optional_current_user instead of get_current_user
     # This allows the endpoint to work without authentication
@@ -133,12 +362,31 @@ def get_all_products_endpoint(
     size_ids: Optional[List[int]] = Query(None),
     colour_ids: Optional[List[int]] = Query(None),
     search: Optional[str] = None, # Add the search parameter
+    cursor: Optional[str] = None,
+    approximate_count: bool = False,
+    fuzzy: bool = False,
 ):
     """
     Fetches all products with pagination and advanced filtering.
     Public endpoint - works for both logged out users and admins.
     - Logged out users: only see active products
     - Admins: see all products (active + inactive)
+
+    Pagination modes:
+    - `page` (default): returns `{total, items}` using page numbers.
+    - `cursor`: send `cursor=` (empty) for the first page, then pass back the
+      returned `next_cursor` / `prev_cursor`. Returns `{items, next_cursor, prev_cursor}`.
+
+    `sort_by`: `created_at` (newest, default), `price-low`, `price-high` or
+    `popular` (most units sold over the last 30 days).
+
+    Set `approximate_count=true` to accept a planner estimate for `total` on very
+    large result sets (`total_is_estimate` is then true).
+
+    When a search matches nothing, `suggestion` holds a "did you mean" with
+    misspelled words corrected against the catalog vocabulary. Set
+    `fuzzy=true` to search that corrected query instead; `suggestion` then
+    holds the query that was searched.
     """
     # Clean up empty arrays - convert empty lists to None
     filters = {
@@ -156,6 +404,13 @@ def get_all_products_endpoint(
     filters = {k: v for k, v in filters.items() if v is not None}
 
     products_page = product_services.get_all_public_or_admin_products(
-        db=db,  page=page, limit=limit, **filters
+        db=db,
+        page=page,
+        limit=limit,
+        cursor=cursor,
+        approximate_count=approximate_count,
+        fuzzy=fuzzy,
+        **filters
     )
+    http_cache.set_cache_headers(response, cache_control=settings.CATALOG_LIST_CACHE_CONTROL)
     return products_page
\ No newline at end of file
@@ -1,11 +1,12 @@
 # app/api/v1/endpoints/sizes.py
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, Response, status
 from sqlalchemy.orm import Session
 from typing import List
 
 from app.schemas.product_schema import SizeResponse, SizeCreate
-from app.utils import deps
+from app.utils import deps, http_cache
+from app.core.config import settings
 from app.models.user_model import User
 from app.services import size_services  # Corrected import name
 
@@ -40,8 +41,15 @@ def delete_size_endpoint(
 
 
 @router.get("/", response_model=List[SizeResponse], status_code=status.HTTP_200_OK)
-def get_all_sizes_endpoint(db: Session = Depends(deps.get_db)):
+def get_all_sizes_endpoint(
+    request: Request, response: Response, db: Session = Depends(deps.get_db)
+):
     """Gets a list of all available sizes."""
+    etag = size_services.get_sizes_etag(db=db)
+    if http_cache.is_not_modified(request, etag):
+        return http_cache.not_modified_response(etag, settings.CATALOG_ETAG_CACHE_CONTROL)
+
     # Corrected variable name
     sizes = size_services.get_all_sizes(db=db)
-    return sizes
+    http_cache.set_cache_headers(response, etag, settings.CATALOG_ETAG_CACHE_CONTROL)
+    return sizes
\ No newline at end of file
@@ -5,6 +5,7 @@ from typing import List
 from app.services import wishlist_services
 from app.schemas.wishlist_schema import WishlistItemCreate, WishlistItemResponse
 from app.utils import deps
+from app.utils.documents import json_response
 from app.models.user_model import User
 
 router = APIRouter()
@@ -48,4 +49,4 @@ def get_wishlist_endpoint(
 ):
     """Gets all items in the current user's wishlist."""
     items = wishlist_services.get_user_wishlist(db=db, current_user=current_user)
-    return items
+    return json_response(items)
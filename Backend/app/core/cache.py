@@ -0,0 +1,223 @@
+# app/core/cache.py
+
+import enum
+import json
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Set
+
+from app.core.config import settings
+
+logger = logging.getLogger("default")
+
+
+def make_cache_key(prefix: str, params: Dict[str, Any]) -> str:
+    """
+    Builds a deterministic cache key from request parameters.
+    Empty values are dropped and lists are sorted, so equivalent filter sets
+    (e.g. size_ids=[2, 1] and size_ids=[1, 2]) share one cache entry.
+    """
+    normalized = {}
+    for name, value in params.items():
+        if value is None or value == [] or value == "":
+            continue
+        if isinstance(value, enum.Enum):
+            value = value.value
+        if isinstance(value, (list, tuple, set)):
+            value = sorted(value)
+        if isinstance(value, str):
+            value = value.strip()
+        normalized[name] = value
+    return f"{prefix}:{json.dumps(normalized, sort_keys=True, default=str)}"
+
+
+class CacheBackend(ABC):
+    """
+    Interface for the response caches.
+
+    Values must be JSON-serializable. Every entry may carry tags; invalidating
+    a tag drops every entry stored with it, which lets writes evict exactly
+    the cached responses they can affect.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: Any, tags: Iterable[str] = ()) -> None:
+        ...
+
+    @abstractmethod
+    def invalidate_tags(self, tags: Iterable[str]) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+
+class NullCache(CacheBackend):
+    """A backend that stores nothing (caching disabled)."""
+
+    def get(self, key: str) -> Optional[Any]:
+        return None
+
+    def set(self, key: str, value: Any, tags: Iterable[str] = ()) -> None:
+        return None
+
+    def invalidate_tags(self, tags: Iterable[str]) -> None:
+        return None
+
+    def clear(self) -> None:
+        return None
+
+
+class MemoryCache(CacheBackend):
+    """
+    A thread-safe, size-bounded LRU cache whose entries also expire after
+    `ttl` seconds. Entries live in this process only.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: int = 60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value, _ = entry
+            if expires_at < time.monotonic():
+                self._drop(key)
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, tags: Iterable[str] = ()) -> None:
+        tags = frozenset(tags)
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+            self._data[key] = (time.monotonic() + self.ttl, value, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._data) > self.max_entries:
+                self._drop(next(iter(self._data)))
+
+    def invalidate_tags(self, tags: Iterable[str]) -> None:
+        with self._lock:
+            for tag in tags:
+                for key in self._tags.pop(tag, ()):
+                    self._drop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._tags.clear()
+
+    def _drop(self, key: str) -> None:
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class RedisCache(CacheBackend):
+    """
+    A cache shared by every worker, stored in Redis.
+
+    Values are stored as JSON under "<prefix>:<key>" with a TTL. Each tag is a
+    Redis set of the keys stored with it, so invalidation deletes exactly the
+    tagged entries. Redis errors are logged and treated as cache misses; the
+    cache must never take the API down.
+    """
+
+    def __init__(self, url: str, ttl: int = 60, prefix: str = "cache"):
+        # Imported lazily so the in-memory backend works without the client installed.
+        import redis
+
+        self._redis = redis.Redis.from_url(url)
+        self._errors = (redis.RedisError,)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    def _tag(self, tag: str) -> str:
+        return f"{self.prefix}:tag:{tag}"
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            raw = self._redis.get(self._key(key))
+        except self._errors as e:
+            logger.warning(f"Cache read failed: {e}")
+            return None
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key: str, value: Any, tags: Iterable[str] = ()) -> None:
+        try:
+            pipe = self._redis.pipeline()
+            pipe.set(self._key(key), json.dumps(value), ex=self.ttl)
+            for tag in tags:
+                pipe.sadd(self._tag(tag), self._key(key))
+                # Tag sets only need to outlive the entries they point at.
+                pipe.expire(self._tag(tag), self.ttl)
+            pipe.execute()
+        except self._errors as e:
+            logger.warning(f"Cache write failed: {e}")
+
+    def invalidate_tags(self, tags: Iterable[str]) -> None:
+        tag_keys = [self._tag(tag) for tag in tags]
+        if not tag_keys:
+            return
+        try:
+            keys = self._redis.sunion(tag_keys)
+            pipe = self._redis.pipeline()
+            if keys:
+                pipe.delete(*keys)
+            pipe.delete(*tag_keys)
+            pipe.execute()
+        except self._errors as e:
+            logger.warning(f"Cache invalidation failed: {e}")
+
+    def clear(self) -> None:
+        try:
+            keys = list(self._redis.scan_iter(match=f"{self.prefix}:*"))
+            if keys:
+                self._redis.delete(*keys)
+        except self._errors as e:
+            logger.warning(f"Cache clear failed: {e}")
+
+
+_cache: Optional[CacheBackend] = None
+
+
+def get_cache() -> CacheBackend:
+    """
+    Returns the process-wide response cache selected by settings.CACHE_BACKEND
+    ("memory", "redis" or "none").
+    """
+    global _cache
+    if _cache is None:
+        backend = settings.CACHE_BACKEND.lower()
+        if backend == "redis":
+            _cache = RedisCache(settings.REDIS_URL, ttl=settings.CACHE_TTL)
+        elif backend == "none":
+            _cache = NullCache()
+        else:
+            _cache = MemoryCache(max_entries=settings.CACHE_MAX_ENTRIES, ttl=settings.CACHE_TTL)
+    return _cache
@@ -1,4 +1,5 @@
 import os
+from typing import List, Optional
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 
@@ -16,6 +17,62 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7 # Token expires in 7 days
 
+    # Answer catalog filters from an in-process bitmap index (see app/core/product_index.py)
+    PRODUCT_FILTER_INDEX: bool = False
+    PRODUCT_FILTER_INDEX_MAX_AGE: int = 300  # Seconds before a full rebuild
+
+    # Seconds before the in-process categories/sizes/colours copy is reloaded
+    # even without a change being announced (see app/core/reference_data.py)
+    REFERENCE_DATA_MAX_AGE: int = 300
+
+    # Uploaded product images and their derivatives (see app/utils/images.py)
+    MEDIA_ROOT: str = os.getenv("MEDIA_ROOT", "media")
+    MEDIA_URL: str = "/media"
+    IMAGE_VARIANT_WIDTHS: List[int] = [320, 640, 1024, 1600]
+    IMAGE_THUMBNAIL_SIZE: int = 240  # Square, cropped to fit
+    IMAGE_FORMATS: List[str] = ["webp", "avif"]  # Ones Pillow can't encode are skipped
+    IMAGE_WORKERS: Optional[int] = None  # Process pool size; None = one per CPU
+    IMAGE_UPLOAD_MAX_FILES: int = 10
+
+    # Typeahead suggestions (see app/core/suggest_index.py)
+    SUGGEST_INDEX_MAX_AGE: int = 300  # Seconds before a full rebuild
+    SUGGEST_MAX_LIMIT: int = 20
+
+    # Rows validated, inserted and committed together by the bulk product import
+    PRODUCT_IMPORT_CHUNK_SIZE: int = 500
+
+    # Products read from the cursor, loaded and written out together by the catalog export
+    PRODUCT_EXPORT_BATCH_SIZE: int = 1000
+
+    # Most ids accepted by one GET /product/batch request
+    PRODUCT_BATCH_MAX: int = 100
+
+    # Most orders on one page of GET /order/admin/
+    ORDER_PAGE_MAX: int = 200
+
+    # Most patches accepted by one PATCH /product/bulk request
+    PRODUCT_BULK_UPDATE_MAX: int = 1000
+
+    # With approximate_count, listings estimated above this many rows report
+    # the planner's estimate instead of an exact total.
+    APPROXIMATE_COUNT_THRESHOLD: int = 10000
+
+    # Response caching (see app/core/cache.py): "memory", "redis" or "none"
+    CACHE_BACKEND: str = "memory"
+    CACHE_TTL: int = 60  # Seconds
+    CACHE_MAX_ENTRIES: int = 2048  # Per process, memory backend only
+    REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+    # Flash sales (see app/core/flash_sale.py): "memory" (one worker only) or
+    # "redis" (REDIS_URL, shared by every worker)
+    FLASH_SALE_BACKEND: str = "memory"
+    FLASH_SALE_RECONCILE_INTERVAL: float = 1.0  # Seconds between stock write-backs
+
+    # HTTP caching for public catalog reads. Listings may be served stale for a
+    # short while; ETagged resources are revalidated (a cheap 304) every time.
+    CATALOG_LIST_CACHE_CONTROL: str = "public, max-age=30, stale-while-revalidate=60"
+    CATALOG_ETAG_CACHE_CONTROL: str = "public, no-cache"
+
     class Config:
         case_sensitive = True
 
@@ -0,0 +1,296 @@
+# app/core/flash_sale.py
+
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from app.core.config import settings
+
+
+class FlashSale(NamedTuple):
+    remaining: int  # Units still available
+    price: float  # Unit price, fixed when the sale started
+
+
+Shortfall = Dict[str, int]
+
+
+class FlashSaleStore(ABC):
+    """
+    Stock tokens for products on flash sale, held outside the database.
+
+    Starting a sale loads a product's sellable units as tokens. While it runs,
+    checkouts claim tokens here (an atomic counter) instead of locking the
+    product row, and every claim is added to a pending tally. A background
+    reconciler drains that tally and subtracts it from Product.stock in
+    batches, so the hot rows are written once per interval rather than once
+    per order.
+
+    `pending` is signed: releasing units (a failed checkout or a cancelled
+    order) subtracts from it, so the reconciler puts them back into stock.
+    """
+
+    @abstractmethod
+    def start(self, product_id: int, units: int, price: float) -> bool:
+        """Puts a product on sale. Returns False if it already is."""
+
+    @abstractmethod
+    def end(self, product_id: int) -> Optional[int]:
+        """Takes a product off sale. Returns its unsold units (None if not on sale)."""
+
+    @abstractmethod
+    def sales(self, product_ids: Optional[Iterable[int]] = None) -> Dict[int, FlashSale]:
+        """The sales running for these products (all of them when None)."""
+
+    @abstractmethod
+    def claim(self, quantities: Dict[int, int]) -> Tuple[Dict[int, int], List[Shortfall]]:
+        """
+        Claims tokens for the products in `quantities` that are on sale, all or
+        nothing. Returns ({product_id: units} claimed, []) on success, or
+        ({}, shortfalls) if any sale is short, with one
+        {"product_id", "requested", "available"} per short product.
+        Products not on sale are ignored.
+        """
+
+    @abstractmethod
+    def release(self, quantities: Dict[int, int]) -> None:
+        """
+        Returns claimed units. They go back into the sale if it's still
+        running, and come off the pending tally either way.
+        """
+
+    @abstractmethod
+    def take_pending(self) -> Dict[int, int]:
+        """Atomically reads and clears the pending tally ({product_id: units})."""
+
+    @abstractmethod
+    def restore_pending(self, pending: Dict[int, int]) -> None:
+        """Adds a tally taken with take_pending back (its write-back failed)."""
+
+
+class MemoryFlashSaleStore(FlashSaleStore):
+    """
+    A store in this process only. Tokens aren't shared between workers, so use
+    it with a single worker (and in tests).
+    """
+
+    def __init__(self):
+        self._sales: Dict[int, list] = {}  # product_id -> [remaining, price]
+        self._pending: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def start(self, product_id: int, units: int, price: float) -> bool:
+        with self._lock:
+            if product_id in self._sales:
+                return False
+            self._sales[product_id] = [units, price]
+            return True
+
+    def end(self, product_id: int) -> Optional[int]:
+        with self._lock:
+            sale = self._sales.pop(product_id, None)
+            return None if sale is None else sale[0]
+
+    def sales(self, product_ids: Optional[Iterable[int]] = None) -> Dict[int, FlashSale]:
+        with self._lock:
+            ids = self._sales if product_ids is None else product_ids
+            return {
+                product_id: FlashSale(*self._sales[product_id])
+                for product_id in ids
+                if product_id in self._sales
+            }
+
+    def claim(self, quantities: Dict[int, int]) -> Tuple[Dict[int, int], List[Shortfall]]:
+        with self._lock:
+            on_sale = {
+                product_id: units
+                for product_id, units in quantities.items()
+                if product_id in self._sales
+            }
+            shortfalls = [
+                {
+                    "product_id": product_id,
+                    "requested": units,
+                    "available": self._sales[product_id][0],
+                }
+                for product_id, units in sorted(on_sale.items())
+                if self._sales[product_id][0] < units
+            ]
+            if shortfalls:
+                return {}, shortfalls
+            for product_id, units in on_sale.items():
+                self._sales[product_id][0] -= units
+                self._pending[product_id] = self._pending.get(product_id, 0) + units
+            return on_sale, []
+
+    def release(self, quantities: Dict[int, int]) -> None:
+        with self._lock:
+            for product_id, units in quantities.items():
+                if product_id in self._sales:
+                    self._sales[product_id][0] += units
+                self._pending[product_id] = self._pending.get(product_id, 0) - units
+
+    def take_pending(self) -> Dict[int, int]:
+        with self._lock:
+            pending = {pid: units for pid, units in self._pending.items() if units}
+            self._pending = {}
+            return pending
+
+    def restore_pending(self, pending: Dict[int, int]) -> None:
+        with self._lock:
+            for product_id, units in pending.items():
+                self._pending[product_id] = self._pending.get(product_id, 0) + units
+
+
+# KEYS: the pending hash, then one remaining-units key per product.
+# ARGV: the product ids, then the quantities, in the same order.
+_CLAIM_SCRIPT = """
+local n = #KEYS - 1
+local short = {}
+local on_sale = {}
+for i = 1, n do
+    local left = redis.call('GET', KEYS[i + 1])
+    if left then
+        if tonumber(left) < tonumber(ARGV[n + i]) then
+            table.insert(short, ARGV[i])
+            table.insert(short, left)
+        else
+            table.insert(on_sale, i)
+        end
+    end
+end
+if #short > 0 then
+    return {0, short}
+end
+local claimed = {}
+for _, i in ipairs(on_sale) do
+    redis.call('DECRBY', KEYS[i + 1], ARGV[n + i])
+    redis.call('HINCRBY', KEYS[1], ARGV[i], ARGV[n + i])
+    table.insert(claimed, ARGV[i])
+end
+return {1, claimed}
+"""
+
+# Same KEYS and ARGV as the claim script.
+_RELEASE_SCRIPT = """
+local n = #KEYS - 1
+for i = 1, n do
+    if redis.call('EXISTS', KEYS[i + 1]) == 1 then
+        redis.call('INCRBY', KEYS[i + 1], ARGV[n + i])
+    end
+    redis.call('HINCRBY', KEYS[1], ARGV[i], -tonumber(ARGV[n + i]))
+end
+return n
+"""
+
+
+class RedisFlashSaleStore(FlashSaleStore):
+    """
+    A store shared by every worker. Each product's tokens are a counter key;
+    claims and releases run as Lua scripts, so a multi-product claim is
+    atomic. Unlike the response cache, Redis errors are raised: selling
+    without the store could oversell.
+    """
+
+    def __init__(self, url: str, prefix: str = "flash-sale"):
+        # Imported lazily so the in-memory backend works without the client installed.
+        import redis
+
+        self._redis = redis.Redis.from_url(url, decode_responses=True)
+        self._claim = self._redis.register_script(_CLAIM_SCRIPT)
+        self._release = self._redis.register_script(_RELEASE_SCRIPT)
+        self._prices = f"{prefix}:prices"
+        self._pending = f"{prefix}:pending"
+        self.prefix = prefix
+
+    def _remaining(self, product_id) -> str:
+        return f"{self.prefix}:remaining:{product_id}"
+
+    def _script_args(self, quantities: Dict[int, int]) -> Tuple[list, list]:
+        ids = list(quantities)
+        keys = [self._pending, *(self._remaining(product_id) for product_id in ids)]
+        return keys, [*ids, *(quantities[product_id] for product_id in ids)]
+
+    def start(self, product_id: int, units: int, price: float) -> bool:
+        if not self._redis.set(self._remaining(product_id), units, nx=True):
+            return False
+        self._redis.hset(self._prices, product_id, price)
+        return True
+
+    def end(self, product_id: int) -> Optional[int]:
+        pipe = self._redis.pipeline()
+        pipe.get(self._remaining(product_id))
+        pipe.delete(self._remaining(product_id))
+        pipe.hdel(self._prices, product_id)
+        remaining = pipe.execute()[0]
+        return None if remaining is None else int(remaining)
+
+    def sales(self, product_ids: Optional[Iterable[int]] = None) -> Dict[int, FlashSale]:
+        if product_ids is None:
+            prices = self._redis.hgetall(self._prices)
+            ids = list(prices)
+        else:
+            ids = list(product_ids)
+            if not ids:
+                return {}
+            prices = dict(zip(ids, self._redis.hmget(self._prices, ids)))
+        if not ids:
+            return {}
+        remaining = self._redis.mget([self._remaining(product_id) for product_id in ids])
+        return {
+            int(product_id): FlashSale(int(left), float(prices[product_id]))
+            for product_id, left in zip(ids, remaining)
+            if left is not None and prices[product_id] is not None
+        }
+
+    def claim(self, quantities: Dict[int, int]) -> Tuple[Dict[int, int], List[Shortfall]]:
+        if not quantities:
+            return {}, []
+        keys, args = self._script_args(quantities)
+        ok, values = self._claim(keys=keys, args=args)
+        if ok:
+            return {int(pid): quantities[int(pid)] for pid in values}, []
+        short = dict(zip(values[::2], values[1::2]))
+        return {}, [
+            {
+                "product_id": product_id,
+                "requested": quantities[product_id],
+                "available": int(short[str(product_id)]),
+            }
+            for product_id in sorted(quantities)
+            if str(product_id) in short
+        ]
+
+    def release(self, quantities: Dict[int, int]) -> None:
+        if quantities:
+            keys, args = self._script_args(quantities)
+            self._release(keys=keys, args=args)
+
+    def take_pending(self) -> Dict[int, int]:
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.hgetall(self._pending)
+        pipe.delete(self._pending)
+        pending = pipe.execute()[0]
+        return {int(pid): int(units) for pid, units in pending.items() if int(units)}
+
+    def restore_pending(self, pending: Dict[int, int]) -> None:
+        pipe = self._redis.pipeline()
+        for product_id, units in pending.items():
+            pipe.hincrby(self._pending, product_id, units)
+        pipe.execute()
+
+
+_store: Optional[FlashSaleStore] = None
+_store_lock = threading.Lock()
+
+
+def get_flash_sale_store() -> FlashSaleStore:
+    """The process-wide store selected by settings.FLASH_SALE_BACKEND."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            if settings.FLASH_SALE_BACKEND.lower() == "redis":
+                _store = RedisFlashSaleStore(settings.REDIS_URL)
+            else:
+                _store = MemoryFlashSaleStore()
+        return _store
@@ -0,0 +1,143 @@
+# app/core/reference_data.py
+
+import hashlib
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy.orm import Session
+
+from app.core.cache import get_cache
+from app.core.config import settings
+from app.models.product_model import Category, Colour, Size
+
+MODELS = {"categories": Category, "sizes": Size, "colours": Colour}
+
+# Shared cache key holding the current change token. Writers replace it, and
+# every worker compares it with the token its snapshot was loaded at.
+VERSION_KEY = "reference-data:version"
+
+
+class ReferenceData:
+    """
+    An in-process copy of the categories, sizes and colours tables.
+
+    These tables are small and rarely change, so they're loaded whole and kept
+    as detached ORM objects keyed by id. Validating ids is then a dict lookup,
+    and `attach` puts the cached rows into a session (merge with load=False)
+    without running SQL.
+
+    Every worker checks its snapshot against a change token in the shared
+    cache (get_cache()). With CACHE_BACKEND=redis, an admin's add or delete in
+    one worker therefore reloads every worker on its next request. If the
+    token has expired from the cache, or caching is off, the snapshot is
+    reloaded after `max_age` seconds.
+
+    Without a shared cache another worker's add isn't announced, so a lookup
+    that misses reloads once before reporting the id as unknown. Deletes can
+    still be served for up to `max_age`; the foreign keys reject those writes.
+    """
+
+    def __init__(self, max_age: int = 300):
+        self.max_age = max_age
+        self._lock = threading.RLock()
+        self._token: Optional[str] = None
+        # Digest of the loaded rows, so every worker reports the same version
+        self._version: Optional[str] = None
+        self._loaded_at: Optional[float] = None
+        # kind -> {id: detached row}, in id order
+        self._rows: Dict[str, Dict[int, object]] = {}
+
+    def _ensure_current(self, db: Session) -> None:
+        cache = get_cache()
+        shared_token = cache.get(VERSION_KEY)
+        with self._lock:
+            fresh = (
+                self._loaded_at is not None
+                and time.monotonic() - self._loaded_at <= self.max_age
+            )
+            if shared_token is not None and shared_token == self._token and fresh:
+                return
+            if shared_token is None and fresh:
+                # The token expired (or caching is off): publish ours again.
+                cache.set(VERSION_KEY, self._token)
+                return
+            self._load(db)
+            self._token = shared_token or uuid.uuid4().hex
+            if shared_token is None:
+                cache.set(VERSION_KEY, self._token)
+
+    def _rows_for(self, db: Session, kind: str, ids: Sequence[int]) -> Dict[int, object]:
+        """The current rows of `kind`, reloaded once if any of `ids` is unknown."""
+        self._ensure_current(db)
+        with self._lock:
+            if any(id_ not in self._rows[kind] for id_ in ids):
+                self._load(db)
+            return self._rows[kind]
+
+    def _load(self, db: Session) -> None:
+        # A separate session, so expunging the rows doesn't detach objects
+        # the caller's session is using.
+        with Session(bind=db.get_bind()) as loader:
+            rows = {
+                kind: {row.id: row for row in loader.query(model).order_by(model.id)}
+                for kind, model in MODELS.items()
+            }
+            digest = hashlib.sha1()
+            for kind, model in MODELS.items():
+                columns = model.__table__.columns.keys()
+                for row in rows[kind].values():
+                    digest.update(repr((kind, [getattr(row, c) for c in columns])).encode())
+            loader.expunge_all()
+        self._rows = rows
+        self._version = digest.hexdigest()
+        self._loaded_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        """
+        Call after committing an add or delete. Every worker, this one
+        included, reloads on its next lookup.
+        """
+        with self._lock:
+            self._loaded_at = None
+            self._token = None
+        get_cache().set(VERSION_KEY, uuid.uuid4().hex)
+
+    # --- Lookups ---
+
+    def version(self, db: Session) -> str:
+        """Digest of the tables' contents, the same in every worker (for ETags)."""
+        self._ensure_current(db)
+        return self._version
+
+    def all(self, db: Session, kind: str) -> List[object]:
+        self._ensure_current(db)
+        return list(self._rows[kind].values())
+
+    def get(self, db: Session, kind: str, id_: int) -> Optional[object]:
+        return self._rows_for(db, kind, [id_]).get(id_)
+
+    def missing(self, db: Session, kind: str, ids: Sequence[int]) -> List[int]:
+        """The ids in `ids` that don't exist."""
+        rows = self._rows_for(db, kind, ids)
+        return [id_ for id_ in ids if id_ not in rows]
+
+    def find(self, db: Session, kind: str, **values) -> Optional[object]:
+        """The first row whose attributes equal `values`."""
+        self._ensure_current(db)
+        for row in self._rows[kind].values():
+            if all(getattr(row, name) == value for name, value in values.items()):
+                return row
+        return None
+
+    def attach(self, db: Session, kind: str, ids: Sequence[int]) -> List[object]:
+        """
+        Session-bound copies of the rows with these ids, for assigning to
+        relationships. Unknown and repeated ids are skipped. No SQL is emitted.
+        """
+        rows = self._rows_for(db, kind, ids)
+        return [db.merge(rows[id_], load=False) for id_ in dict.fromkeys(ids) if id_ in rows]
+
+
+reference_data = ReferenceData(max_age=settings.REFERENCE_DATA_MAX_AGE)
@@ -0,0 +1,123 @@
+# app/core/spelling.py
+
+from collections import defaultdict
+from itertools import combinations
+from typing import Dict, Iterable, Optional, Set
+
+
+def max_distance_for(word: str) -> int:
+    """Edits tolerated for a word: short words get fewer, or everything matches."""
+    if len(word) <= 3:
+        return 0
+    if len(word) <= 5:
+        return 1
+    return 2
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Optimal string alignment distance (Levenshtein plus adjacent swaps),
+    giving up as soon as it must exceed `limit`. Returns limit + 1 then.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (
+                previous2 is not None
+                and i > 1
+                and j > 1
+                and a[i - 1] == b[j - 2]
+                and a[i - 2] == b[j - 1]
+            ):
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+def _deletes(word: str, distance: int) -> Set[str]:
+    """Every string obtained by deleting up to `distance` characters."""
+    variants = {word}
+    for count in range(1, min(distance, len(word) - 1) + 1):
+        for positions in combinations(range(len(word)), count):
+            variants.add("".join(ch for i, ch in enumerate(word) if i not in positions))
+    return variants
+
+
+class SpellingIndex:
+    """
+    A symmetric-delete index for correcting misspelled words.
+
+    Each vocabulary word is stored under every string reachable from it by
+    deleting up to two characters. Two words within edit distance d always
+    share such a variant, so correcting a word only means generating its own
+    deletes and verifying the few words found under them, instead of
+    comparing against the whole vocabulary.
+
+    Not thread-safe on its own; SuggestIndex guards it with its lock.
+    """
+
+    MAX_DISTANCE = 2
+
+    def __init__(self):
+        # word -> how many catalog entries use it (ranks equally close corrections)
+        self._counts: Dict[str, int] = {}
+        self._variants: Dict[str, Set[str]] = defaultdict(set)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._counts
+
+    def add(self, words: Iterable[str]) -> None:
+        for word in words:
+            if word in self._counts:
+                self._counts[word] += 1
+                continue
+            self._counts[word] = 1
+            for variant in _deletes(word, self.MAX_DISTANCE):
+                self._variants[variant].add(word)
+
+    def remove(self, words: Iterable[str]) -> None:
+        for word in words:
+            count = self._counts.get(word)
+            if count is None:
+                continue
+            if count > 1:
+                self._counts[word] = count - 1
+                continue
+            del self._counts[word]
+            for variant in _deletes(word, self.MAX_DISTANCE):
+                words_here = self._variants.get(variant)
+                if words_here is not None:
+                    words_here.discard(word)
+                    if not words_here:
+                        del self._variants[variant]
+
+    def correct(self, word: str) -> Optional[str]:
+        """
+        Returns the closest known word to `word` (fewest edits, then most
+        used), or None if `word` is already known or nothing is close enough.
+        """
+        if word in self._counts or word.isdigit():
+            return None
+        limit = max_distance_for(word)
+        if limit == 0:
+            return None
+        candidates: Set[str] = set()
+        for variant in _deletes(word, limit):
+            candidates |= self._variants.get(variant, set())
+        best = None
+        for candidate in candidates:
+            distance = edit_distance(word, candidate, limit)
+            if distance > limit:
+                continue
+            rank = (distance, -self._counts[candidate], candidate)
+            if best is None or rank < best:
+                best = rank
+        return best[2] if best else None
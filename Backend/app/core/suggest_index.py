@@ -0,0 +1,273 @@
+# app/core/suggest_index.py
+
+import bisect
+import heapq
+import re
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.spelling import SpellingIndex
+from app.models.product_model import Category, Product, ProductStatus
+
+_WORD = re.compile(r"\w+")
+
+EntryKey = Tuple[str, object]
+
+
+def normalize(text: str) -> str:
+    """Lowercases and strips accents, so "Café" and "cafe" index the same."""
+    text = unicodedata.normalize("NFKD", text or "")
+    return "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+
+
+def tokenize(text: str) -> List[str]:
+    return _WORD.findall(normalize(text))
+
+
+def trigrams(text: str) -> Set[str]:
+    text = " ".join(tokenize(text))
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class SuggestIndex:
+    """
+    An in-process typeahead index over product names, brands and category names.
+
+    Each suggestion is an entry: a product name (one per active product), or
+    a brand or category name weighted by how many active products carry it.
+    Two structures answer lookups:
+
+    - a sorted list of (word, entry) pairs, where a bisect finds every word
+      starting with the typed prefix;
+    - a trigram -> entries map, used when prefixes alone don't fill the
+      requested number of suggestions, so infix input ("odie") still matches.
+
+    The words of all entries also form the catalog vocabulary that search
+    queries are spell-corrected against (see correct_query).
+
+    Like the filter index, it's built lazily, updated by this process's
+    product writes, and rebuilt after `max_age` seconds.
+    """
+
+    # Upper bound on the prefix matches ranked per lookup, so a one-letter
+    # query costs about the same as a long one on a large catalog.
+    MAX_CANDIDATES = 2000
+    # Queries this short match a large share of the index; their results are
+    # memoized until the next write.
+    MEMO_MAX_LENGTH = 2
+
+    def __init__(self, max_age: int = 300):
+        self.max_age = max_age
+        self._lock = threading.RLock()
+        self._built_at: Optional[float] = None
+        self._reset()
+
+    def _reset(self) -> None:
+        # entry key -> {"text", "kind", "id", "weight", "words", "normalized"}
+        self._entries: Dict[EntryKey, dict] = {}
+        self._words: List[Tuple[str, EntryKey]] = []
+        self._trigrams: Dict[str, Set[EntryKey]] = defaultdict(set)
+        # product id -> the entries it contributes to, for updates.
+        self._products: Dict[int, List[Tuple[EntryKey, str, str, object]]] = {}
+        self._category_names: Dict[int, str] = {}
+        self._memo: Dict[Tuple[str, int], List[dict]] = {}
+        self._spelling = SpellingIndex()
+
+    # --- Maintenance ---
+
+    @property
+    def is_built(self) -> bool:
+        return self._built_at is not None
+
+    def is_stale(self) -> bool:
+        return (
+            self._built_at is None or time.monotonic() - self._built_at > self.max_age
+        )
+
+    def build(self, db: Session) -> None:
+        """(Re)builds the index from two flat queries."""
+        categories = dict(db.query(Category.id, Category.name))
+        products = db.query(
+            Product.id, Product.name, Product.brand, Product.category_id, Product.status
+        ).all()
+        with self._lock:
+            self._reset()
+            self._category_names = categories
+            for row in products:
+                self._add_product(row.id, row.name, row.brand, row.category_id, row.status)
+            self._built_at = time.monotonic()
+
+    def ensure_built(self, db: Session) -> None:
+        if self.is_stale():
+            self.build(db)
+
+    def upsert(self, product: Product) -> None:
+        """Applies a created or updated product to an already built index."""
+        if not self.is_built:
+            return
+        with self._lock:
+            if product.category is not None:
+                self._category_names[product.category.id] = product.category.name
+            self._remove_product(product.id)
+            self._add_product(
+                product.id, product.name, product.brand, product.category_id, product.status
+            )
+
+    def invalidate(self) -> None:
+        """Forces a rebuild on the next lookup."""
+        with self._lock:
+            self._built_at = None
+
+    def _add_product(self, product_id, name, brand, category_id, status) -> None:
+        if status not in (ProductStatus.active, ProductStatus.active.value):
+            return
+        contributions = [(("product", product_id), name, "product", product_id)]
+        if brand:
+            contributions.append((("brand", normalize(brand).strip()), brand, "brand", None))
+        if category_id in self._category_names:
+            category_name = self._category_names[category_id]
+            contributions.append(
+                (("category", category_id), category_name, "category", category_id)
+            )
+        for key, text, kind, entry_id in contributions:
+            self._add_entry(key, text, kind, entry_id)
+        self._products[product_id] = contributions
+
+    def _remove_product(self, product_id: int) -> None:
+        for key, *_ in self._products.pop(product_id, []):
+            self._remove_entry(key)
+
+    def _add_entry(self, key: EntryKey, text: str, kind: str, entry_id) -> None:
+        self._memo.clear()
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry["weight"] += 1
+            return
+        words = tokenize(text)
+        self._entries[key] = {
+            "text": text,
+            "kind": kind,
+            "id": entry_id,
+            "weight": 1,
+            "words": words,
+            "normalized": " ".join(words),
+        }
+        self._spelling.add(words)
+        for word in set(words):
+            bisect.insort(self._words, (word, key))
+        for gram in trigrams(text):
+            self._trigrams[gram].add(key)
+
+    def _remove_entry(self, key: EntryKey) -> None:
+        self._memo.clear()
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+        entry["weight"] -= 1
+        if entry["weight"] > 0:
+            return
+        del self._entries[key]
+        self._spelling.remove(entry["words"])
+        for word in set(entry["words"]):
+            position = bisect.bisect_left(self._words, (word, key))
+            if position < len(self._words) and self._words[position] == (word, key):
+                del self._words[position]
+        for gram in trigrams(entry["text"]):
+            keys = self._trigrams.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._trigrams[gram]
+
+    # --- Queries ---
+
+    def _prefix_matches(self, prefix: str) -> Set[EntryKey]:
+        """Entries having a word that starts with `prefix`."""
+        matches: Set[EntryKey] = set()
+        start = bisect.bisect_left(self._words, (prefix,))
+        for word, key in self._words[start : start + self.MAX_CANDIDATES]:
+            if not word.startswith(prefix):
+                break
+            matches.add(key)
+        return matches
+
+    def suggest(self, query: str, limit: int = 8) -> List[dict]:
+        """
+        Returns up to `limit` suggestions for what the user has typed so far.
+
+        Every query word must prefix a word of the suggestion. Results are
+        ranked by match quality (whole-text prefix, then word prefix, then
+        infix), then by weight, then shorter text first.
+        """
+        words = tokenize(query)
+        if not words or limit <= 0:
+            return []
+        normalized_query = " ".join(words)
+
+        with self._lock:
+            memo_key = (normalized_query, limit)
+            if memo_key in self._memo:
+                return self._memo[memo_key]
+
+            # 1. Candidates come from the most selective (longest) word; the
+            # remaining words then have to prefix some word of the entry.
+            candidates = self._prefix_matches(max(words, key=len))
+            ranked = []
+            for key in candidates:
+                entry = self._entries[key]
+                if all(any(w.startswith(q) for w in entry["words"]) for q in words):
+                    quality = 0 if entry["normalized"].startswith(normalized_query) else 1
+                    ranked.append((quality, key))
+
+            # 2. Not enough prefix hits: fall back to entries that contain the
+            # query text anywhere (all of its trigrams).
+            if len(ranked) < limit and len(normalized_query) >= 3:
+                grams = trigrams(normalized_query)
+                key_sets = sorted((self._trigrams.get(g, set()) for g in grams), key=len)
+                infix = set.intersection(*key_sets) - candidates if key_sets else set()
+                for key in infix:
+                    if normalized_query in self._entries[key]["normalized"]:
+                        ranked.append((2, key))
+
+            best = heapq.nsmallest(
+                limit,
+                ranked,
+                key=lambda item: (
+                    item[0],
+                    -self._entries[item[1]]["weight"],
+                    len(self._entries[item[1]]["text"]),
+                    self._entries[item[1]]["text"],
+                ),
+            )
+            results = [
+                {
+                    "text": self._entries[key]["text"],
+                    "kind": self._entries[key]["kind"],
+                    "id": self._entries[key]["id"],
+                }
+                for _, key in best
+            ]
+            if len(normalized_query) <= self.MEMO_MAX_LENGTH:
+                self._memo[memo_key] = results
+            return results
+
+    def correct_query(self, query: str) -> Optional[str]:
+        """
+        Returns `query` with each word the catalog doesn't know replaced by its
+        closest vocabulary word, or None if no word needed (or had) a correction.
+        """
+        words = tokenize(query)
+        with self._lock:
+            corrected = [self._spelling.correct(word) or word for word in words]
+        if corrected == words:
+            return None
+        return " ".join(corrected)
+
+
+suggest_index = SuggestIndex(max_age=settings.SUGGEST_INDEX_MAX_AGE)
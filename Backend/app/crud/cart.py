@@ -2,6 +2,7 @@ from sqlalchemy.orm import Session
 from app.models.cart_model import CartItem
 from app.schemas.cart_schema import CartItemCreate
 from typing import Dict, Any, List
+from app.crud.loaders import cart_item_relations
 
 def get_existing_cart_item(
     db: Session, user_id: int, product_id: int, size_id: int, colour_id: int
@@ -53,8 +54,15 @@ def delete_cart_item(db: Session, db_obj: CartItem) -> None:
 
 
 
-def get_all_cart_items_for_user(db: Session, user_id: int) -> List[CartItem]:
+def get_all_cart_items_for_user(
+    db: Session, user_id: int, with_products: bool = True
+) -> List[CartItem]:
     """
     Gets all cart items for a specific user.
     """
-    return db.query(CartItem).filter(CartItem.user_id == user_id).all()
+    return (
+        db.query(CartItem)
+        .options(*cart_item_relations(with_products))
+        .filter(CartItem.user_id == user_id)
+        .all()
+    )
@@ -1,7 +1,12 @@
 from sqlalchemy.orm import Session
 from typing import List
-from app.models.product_model import Category
+from app.models.product_model import Category, Product
 from app.schemas.product_schema import CategoryCreate
+from app.crud.product import touch_products
+from app.core.product_index import product_index
+from app.core.reference_data import reference_data
+from app.core.suggest_index import suggest_index
+from app.crud.product_document import delete_product_documents
 
 
 def create_category(db: Session, category_in: CategoryCreate) -> Category:
@@ -9,6 +14,7 @@ def create_category(db: Session, category_in: CategoryCreate) -> Category:
     db.add(category)
     db.commit()
     db.refresh(category)
+    reference_data.invalidate()
     return category
 
 
@@ -20,8 +26,21 @@ def get_all_categories(db: Session) -> List[Category]:
     return db.query(Category).all()
 
 
-def delete_category(db: Session, db_obj: Category) -> None:
+
+def delete_category(db: Session, db_obj: Category) -> List[int]:
+    """Deletes a category. Returns the ids of the products that were in it."""
+    product_ids = [
+        product_id
+        for (product_id,) in db.query(Product.id).filter(Product.category_id == db_obj.id)
+    ]
+    deleted_id = db_obj.id
     db.delete(db_obj)
+    # These products are left without a category, which their documents can't
+    # represent; drop them so reads rebuild from the rows.
+    touch_products(db, product_ids)
+    delete_product_documents(db, product_ids)
     db.commit()
-    # A delete operation typically returns nothing (None).
-    return None
+    reference_data.invalidate()
+    product_index.remove_value("category_id", deleted_id)
+    suggest_index.invalidate()
+    return product_ids
@@ -2,8 +2,12 @@
 
 from sqlalchemy.orm import Session
 from typing import List
-from app.models.product_model import Colour
+from app.models.product_model import Colour, product_colours_table
 from app.schemas.product_schema import ColourCreate
+from app.crud.product import touch_products
+from app.core.product_index import product_index
+from app.core.reference_data import reference_data
+from app.crud.product_document import rebuild_product_documents
 
 def create_colour(db: Session, colour_in: ColourCreate) -> Colour:
     """Creates a new colour in the database."""
@@ -11,6 +15,7 @@ def create_colour(db: Session, colour_in: ColourCreate) -> Colour:
     db.add(colour)
     db.commit()
     db.refresh(colour)
+    reference_data.invalidate()
     return colour
 
 def get_colour(db: Session, colour_id: int) -> Colour | None:
@@ -21,8 +26,24 @@ def get_all_colours(db: Session) -> List[Colour]:
     """Gets all colours from the database."""
     return db.query(Colour).all()
 
-def delete_colour(db: Session, db_obj: Colour) -> None:
-    """Deletes a given colour object from the database."""
+
+def delete_colour(db: Session, db_obj: Colour) -> List[int]:
+    """
+    Deletes a given colour object from the database. Returns the ids of the
+    products that had it.
+    """
+    product_ids = [
+        product_id
+        for (product_id,) in db.query(product_colours_table.c.product_id).filter(
+            product_colours_table.c.colour_id == db_obj.id
+        )
+    ]
+    deleted_id = db_obj.id
     db.delete(db_obj)
+    # The colour drops out of these products' documents in the same commit.
+    touch_products(db, product_ids)
+    rebuild_product_documents(db, product_ids)
     db.commit()
-    return None
\ No newline at end of file
+    reference_data.invalidate()
+    product_index.remove_value("colour_id", deleted_id)
+    return product_ids
\ No newline at end of file
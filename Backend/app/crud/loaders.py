@@ -0,0 +1,70 @@
+# app/crud/loaders.py
+
+"""
+Relationship loading strategies for the read paths.
+
+Response schemas nest a full ProductResponse (category, sizes, colours and
+images) inside products, cart items, wishlist items and orders. Without
+explicit loader options Pydantic's from_attributes serialization lazy-loads
+each relationship per row, so a page of N rows costs ~4N extra queries.
+
+Every option here uses selectinload, which loads a relationship for the
+whole result set in one "WHERE id IN (...)" query. The number of queries
+per request is therefore fixed by the depth of the response tree, not by
+the number of rows on the page.
+"""
+
+from typing import List
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
+
+from app.models.product_model import Product
+from app.models.cart_model import CartItem
+from app.models.wishlist_model import WishlistItem
+from app.models.order_model import Order, OrderItem
+
+
+def product_relations(path=None) -> List[LoaderOption]:
+    """
+    Loader options for everything ProductResponse serializes.
+    Pass `path` (e.g. selectinload(CartItem.product)) to apply them
+    to a product that is reached through another relationship.
+    """
+    options = [
+        selectinload(Product.category),
+        selectinload(Product.sizes),
+        selectinload(Product.colours),
+        selectinload(Product.images),
+    ]
+    if path is None:
+        return options
+    return [path.options(*options)]
+
+
+def cart_item_relations(with_products: bool = True) -> List[LoaderOption]:
+    """
+    Loader options for CartItemResponse. Pass with_products=False when the
+    products will come from the product document store instead.
+    """
+    options = [selectinload(CartItem.size), selectinload(CartItem.colour)]
+    if with_products:
+        options += product_relations(selectinload(CartItem.product))
+    return options
+
+
+def wishlist_item_relations(with_products: bool = True) -> List[LoaderOption]:
+    """Loader options for WishlistItemResponse."""
+    if not with_products:
+        return []
+    return product_relations(selectinload(WishlistItem.product))
+
+
+def order_relations(with_products: bool = True) -> List[LoaderOption]:
+    """Loader options for OrderResponse (items, their products and the customer)."""
+    items = selectinload(Order.items)
+    options = [selectinload(Order.customer)]
+    if with_products:
+        options += product_relations(items.selectinload(OrderItem.product))
+    else:
+        options.append(items)
+    return options
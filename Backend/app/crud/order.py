@@ -1,33 +1,68 @@
 # app/crud/order.py
 
-from sqlalchemy.orm import Session
-from typing import List
+from datetime import datetime
+from sqlalchemy import Integer, func, insert, literal, select, tuple_
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session, aliased
+from typing import Any, List, Optional, Sequence, Tuple
 
-from app.models.order_model import Order, OrderItem
+from app.models.order_model import Order, OrderItem, OrderStatus
 from app.models.cart_model import CartItem
-from app.models.user_model import User
-
-
-def create_order(db: Session, user: User, total_amount: float) -> Order:
-    """Creates the main Order record."""
-    db_order = Order(customer=user, total_amount=total_amount)
-    db.add(db_order)
-    # We don't commit yet! The service will handle the final commit.
-    db.flush()  # flush sends the data to the DB to get the ID, but doesn't commit.
-    db.refresh(db_order)
-    return db_order
-
-
-def create_order_item(db: Session, order: Order, cart_item: CartItem) -> OrderItem:
-    """Creates a single OrderItem record from a CartItem."""
-    db_order_item = OrderItem(
-        order=order,
-        product_id=cart_item.product_id,
-        quantity=cart_item.quantity,
-        price_at_purchase=cart_item.product.price,  # Get price from the product relationship
+from app.models.product_model import Product, ProductImage
+from app.crud.loaders import order_relations
+
+
+def get_cart_lines(db: Session, user_id: int) -> List[Row]:
+    """
+    The user's cart as (product_id, quantity, price) rows, joined to the
+    products' current prices in one query.
+    """
+    return (
+        db.query(CartItem.product_id, CartItem.quantity, Product.price)
+        .join(Product, CartItem.product_id == Product.id)
+        .filter(CartItem.user_id == user_id)
+        .order_by(CartItem.id)
+        .all()
     )
-    db.add(db_order_item)
-    return db_order_item
+
+
+def create_order(db: Session, user_id: int, total_amount: float) -> Row:
+    """
+    Inserts the main Order record and returns its (id, status, order_date).
+    We don't commit yet! The service will handle the final commit.
+    """
+    return db.execute(
+        insert(Order)
+        .values(user_id=user_id, total_amount=total_amount, status=OrderStatus.processing)
+        .returning(Order.id, Order.status, Order.order_date)
+    ).one()
+
+
+def create_order_items(db: Session, order_id: int, lines: Sequence[Row]) -> List[Row]:
+    """
+    Inserts one OrderItem per cart line in a multi-row INSERT ... RETURNING
+    and returns the new (id, product_id, quantity, price_at_purchase) rows.
+    The rows carry their own values, so they needn't come back in line order,
+    which lets every dialect batch the insert. Does not commit.
+    """
+    result = db.execute(
+        insert(OrderItem).returning(
+            OrderItem.id,
+            OrderItem.product_id,
+            OrderItem.quantity,
+            OrderItem.price_at_purchase,
+        ),
+        [
+            {
+                "order_id": order_id,
+                "product_id": line.product_id,
+                "quantity": line.quantity,
+                "price_at_purchase": line.price,
+            }
+            for line in lines
+        ],
+    )
+    return sorted(result.all(), key=lambda item: item.id)
 
 
 def clear_user_cart(db: Session, user_id: int) -> None:
@@ -36,29 +71,141 @@ def clear_user_cart(db: Session, user_id: int) -> None:
     return None
 
 
-def get_orders_by_user(db: Session, user_id: int) -> List[Order]:
+def get_orders_by_user(
+    db: Session, user_id: int, with_products: bool = True
+) -> List[Order]:
     """
     Gets all orders placed by a specific user.
     """
     return (
         db.query(Order)
+        .options(*order_relations(with_products))
         .filter(Order.user_id == user_id)
         .order_by(Order.order_date.desc())
         .all()
     )
 
 
-def get_order_by_id(db: Session, order_id: int) -> Order | None:
+def get_order_by_id(
+    db: Session, order_id: int, with_products: bool = True
+) -> Order | None:
     """Gets a single order by its primary key ID."""
-    return db.query(Order).filter(Order.id == order_id).first()
+    return (
+        db.query(Order)
+        .options(*order_relations(with_products))
+        .filter(Order.id == order_id)
+        .first()
+    )
+
 
+def _apply_order_filters(
+    query,
+    *,
+    status: Optional[OrderStatus] = None,
+    user_id: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    min_total: Optional[float] = None,
+):
+    """Applies the order listing filters. date_from is inclusive, date_to exclusive."""
+    if status is not None:
+        query = query.filter(Order.status == status)
+    if user_id is not None:
+        query = query.filter(Order.user_id == user_id)
+    if date_from is not None:
+        query = query.filter(Order.order_date >= date_from)
+    if date_to is not None:
+        query = query.filter(Order.order_date < date_to)
+    if min_total is not None:
+        query = query.filter(Order.total_amount >= min_total)
+    return query
 
-def get_all_orders(db: Session, skip: int = 0, limit: int = 100) -> List[Order]:
-    """Gets all orders, with pagination. For admin use."""
+
+def _before(after: Tuple[datetime, int]):
+    """Orders after an (order_date, id) keyset, newest first."""
+    return tuple_(Order.order_date, Order.id) < tuple_(
+        literal(after[0], Order.order_date.type), literal(after[1], Integer)
+    )
+
+
+def get_orders_keyset(
+    db: Session,
+    *,
+    after: Optional[Tuple[datetime, int]] = None,
+    limit: int = 50,
+    with_products: bool = True,
+    **filters: Any,
+) -> Tuple[List[Order], bool]:
+    """
+    Fetches one page of orders, newest first, after an (order_date, id)
+    keyset. Returns the page and whether more orders follow.
+
+    The keyset never uses OFFSET, and the items and customers are batch-loaded,
+    so every page costs the same however deep it is.
+    """
+    query = _apply_order_filters(db.query(Order), **filters)
+    if after is not None:
+        query = query.filter(_before(after))
+    orders = (
+        query.options(*order_relations(with_products))
+        .order_by(Order.order_date.desc(), Order.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+    return orders[:limit], len(orders) > limit
+
+
+def get_order_summary_rows(
+    db: Session,
+    user_id: int,
+    *,
+    after: Optional[Tuple[datetime, int]] = None,
+    limit: int = 20,
+) -> List[Row]:
+    """
+    One page of a user's orders (up to limit + 1 of them, newest first)
+    as flat rows, one per item: the order's id, order_date, status and
+    total_amount, then item_id, product_id, quantity, price_at_purchase,
+    the product's name and its first image's image_url and thumbnail_url.
+
+    A single statement: the page of orders is picked by keyset in a
+    subquery and joined to its items, products and first images.
+    """
+    page_query = db.query(
+        Order.id, Order.order_date, Order.status, Order.total_amount
+    ).filter(Order.user_id == user_id)
+    if after is not None:
+        page_query = page_query.filter(_before(after))
+    page = (
+        page_query.order_by(Order.order_date.desc(), Order.id.desc())
+        .limit(limit + 1)
+        .subquery()
+    )
+    # Aliased so the outer join to product_images doesn't correlate it away.
+    image = aliased(ProductImage)
+    first_image_id = (
+        select(func.min(image.id))
+        .where(image.product_id == OrderItem.product_id)
+        .scalar_subquery()
+    )
     return (
-        db.query(Order)
-        .order_by(Order.order_date.desc())
-        .offset(skip)
-        .limit(limit)
+        db.query(
+            page.c.id,
+            page.c.order_date,
+            page.c.status,
+            page.c.total_amount,
+            OrderItem.id.label("item_id"),
+            OrderItem.product_id,
+            OrderItem.quantity,
+            OrderItem.price_at_purchase,
+            Product.name,
+            ProductImage.image_url,
+            ProductImage.thumbnail_url,
+        )
+        .select_from(page)
+        .outerjoin(OrderItem, OrderItem.order_id == page.c.id)
+        .outerjoin(Product, Product.id == OrderItem.product_id)
+        .outerjoin(ProductImage, ProductImage.id == first_image_id)
+        .order_by(page.c.order_date.desc(), page.c.id.desc(), OrderItem.id)
         .all()
     )
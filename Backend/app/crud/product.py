@@ -1,6 +1,35 @@
+import json
+from datetime import datetime, timezone
+from sqlalchemy import (
+    Integer,
+    String,
+    case,
+    cast,
+    exists,
+    func,
+    insert,
+    literal,
+    tuple_,
+    union_all,
+    update,
+)
 from sqlalchemy.orm import Session
 from app.schemas.product_schema import ProductCreate, ProductStatus, ProductGender
-from app.models.product_model import Product, Category, Size, Colour, ProductImage
+from app.models.product_model import (
+    Product,
+    ProductImage,
+    product_sizes_table,
+    product_colours_table,
+)
+from app.crud.loaders import product_relations
+from app.crud.product_document import (
+    rebuild_product_documents,
+    save_product_documents,
+)
+from app.crud.search import apply_product_search
+from app.core.product_index import product_index
+from app.core.reference_data import reference_data
+from app.core.suggest_index import suggest_index
 from typing import Dict, Any, Optional, List, Tuple
 
 
@@ -8,18 +37,12 @@ def create_product(db: Session, product_in: ProductCreate) -> Product:
     """
     Creates a new product in the database, handling all its relationships.
     """
-    category_obj = (
-        db.query(Category).filter(Category.id == product_in.category_id).first()
-    )
-    size_objs = db.query(Size).filter(Size.id.in_(product_in.size_ids)).all()
-    colour_objs = db.query(Colour).filter(Colour.id.in_(product_in.colour_ids)).all()
-
-    # Basic validation (a real app might have more)
-    if not category_obj:
+    # 1. Validate the references against the in-process reference data.
+    if reference_data.get(db, "categories", product_in.category_id) is None:
         raise ValueError(f"Category with id {product_in.category_id} not found.")
-    if len(size_objs) != len(product_in.size_ids):
+    if reference_data.missing(db, "sizes", product_in.size_ids):
         raise ValueError("One or more size IDs are invalid.")
-    if len(colour_objs) != len(product_in.colour_ids):
+    if reference_data.missing(db, "colours", product_in.colour_ids):
         raise ValueError("One or more colour IDs are invalid.")
 
     # 2. Create the main Product object, but don't assign relationships yet.
@@ -30,9 +53,9 @@ def create_product(db: Session, product_in: ProductCreate) -> Product:
     db_product = Product(**product_data)
 
     # 3. Now, assign the fetched SQLAlchemy objects to the relationships.
-    db_product.category = category_obj
-    db_product.sizes = size_objs
-    db_product.colours = colour_objs
+    db_product.category = reference_data.attach(db, "categories", [product_in.category_id])[0]
+    db_product.sizes = reference_data.attach(db, "sizes", product_in.size_ids)
+    db_product.colours = reference_data.attach(db, "colours", product_in.colour_ids)
 
     # 4. Handle the images. Loop through the image data, create ProductImage
     # objects, and associate them with the product.
@@ -40,17 +63,101 @@ def create_product(db: Session, product_in: ProductCreate) -> Product:
         db_image = ProductImage(image_url=image_data.image_url, product=db_product)
         db.add(db_image)
 
-    # 5. Add the final product to the session and commit.
+    # 5. Add the final product to the session, write its response document
+    # in the same transaction, and commit.
     db.add(db_product)
+    save_product_documents(db, [db_product])
     db.commit()
     db.refresh(db_product)
 
+    # 6. Keep the in-process filter and typeahead indexes in step with the new row.
+    product_index.upsert(db_product)
+    suggest_index.upsert(db_product)
+
     return db_product
 
 
+def bulk_create_products(db: Session, products: List[Dict[str, Any]]) -> List[int]:
+    """
+    Inserts many products at once: one multi-row INSERT per table instead of
+    a round trip per product. Each dict holds Product columns plus
+    `size_ids`, `colour_ids` and `image_urls` (ids already validated).
+    Does not commit. Returns the new product ids in input order.
+    """
+    if not products:
+        return []
+    relation_keys = ("size_ids", "colour_ids", "image_urls")
+
+    # 1. Products, with their generated ids returned in input order.
+    product_ids = list(
+        db.execute(
+            insert(Product).returning(Product.id, sort_by_parameter_order=True),
+            [{k: v for k, v in p.items() if k not in relation_keys} for p in products],
+        ).scalars()
+    )
+
+    # 2. Images and association rows for the whole batch.
+    pairs = list(zip(product_ids, products))
+    images = [
+        {"product_id": product_id, "image_url": url}
+        for product_id, product in pairs
+        for url in product["image_urls"]
+    ]
+    sizes = [
+        {"product_id": product_id, "size_id": size_id}
+        for product_id, product in pairs
+        for size_id in set(product["size_ids"])
+    ]
+    colours = [
+        {"product_id": product_id, "colour_id": colour_id}
+        for product_id, product in pairs
+        for colour_id in set(product["colour_ids"])
+    ]
+    if images:
+        db.execute(insert(ProductImage), images)
+    if sizes:
+        db.execute(insert(product_sizes_table), sizes)
+    if colours:
+        db.execute(insert(product_colours_table), colours)
+
+    # 3. Response documents, in the same transaction as the rows.
+    rebuild_product_documents(db, product_ids)
+    return product_ids
+
+
+def bulk_update_products(db: Session, patches: List[Dict[str, Any]]) -> None:
+    """
+    Applies per-product column changes with set-based UPDATEs by primary key
+    (patches with the same set of columns share one executemany UPDATE).
+    Each patch is {"id": ..., <column>: <value>, ...}. Does not commit.
+    """
+    if not patches:
+        return
+    now = datetime.now(timezone.utc)
+    db.execute(update(Product), [{**patch, "updated_at": now} for patch in patches])
+    rebuild_product_documents(db, [patch["id"] for patch in patches])
+
+
 def get_product(db: Session, product_id: int) -> Product | None:
 
-    return db.query(Product).filter(product_id == Product.id).first()
+    return (
+        db.query(Product)
+        .options(*product_relations())
+        .filter(product_id == Product.id)
+        .first()
+    )
+
+
+def get_product_version(db: Session, product_id: int) -> Optional[Tuple]:
+    """
+    Returns (updated_at, created_at) for a product without loading it, or
+    None if it doesn't exist. Cheap enough to run before every detail read.
+    """
+    return (
+        db.query(Product.updated_at, Product.created_at)
+        .filter(Product.id == product_id)
+        .first()
+    )
 
 
 def update_product(db: Session, db_obj: Product, obj_in: Dict[str, Any]) -> Product:
@@ -63,12 +170,148 @@ def update_product(db: Session, db_obj: Product, obj_in: Dict[str, Any]) -> Prod
         # Use setattr to update the fields on the database object
         setattr(db_obj, field, value)
 
+    # Set explicitly: onupdate doesn't fire when only relationships (sizes,
+    # colours) change, and updated_at is what the product's ETag is built from.
+    db_obj.updated_at = datetime.now(timezone.utc)
+
     db.add(db_obj)
+    save_product_documents(db, [db_obj])
+    db.commit()
+    db.refresh(db_obj)
+    product_index.upsert(db_obj)
+    suggest_index.upsert(db_obj)
+    return db_obj
+
+
+def add_product_images(
+    db: Session, db_obj: Product, images: List[Dict[str, Any]]
+) -> Product:
+    """
+    Attaches images ({"image_url", "thumbnail_url", "variants"}) to a product
+    and rewrites its document in the same commit.
+    """
+    for image in images:
+        db.add(ProductImage(product=db_obj, **image))
+    db_obj.updated_at = datetime.now(timezone.utc)
+    save_product_documents(db, [db_obj])
     db.commit()
     db.refresh(db_obj)
     return db_obj
 
 
+def reserve_stock(db: Session, quantities: Dict[int, int]) -> List[Dict[str, int]]:
+    """
+    Takes `quantities` ({product_id: units}) out of stock, all or nothing.
+    Returns [] on success, or one {"product_id", "requested", "available"}
+    per product that is short; the caller must then roll back. Does not commit.
+
+    The rows are first locked with SELECT ... FOR UPDATE in id order, so
+    concurrent checkouts only wait for the products they share and can't
+    deadlock. A single guarded UPDATE (stock >= requested for every row)
+    then applies the whole reservation. Its rowcount confirms it even where
+    FOR UPDATE is a no-op (SQLite, which serializes writers instead).
+    """
+    if not quantities:
+        return []
+    product_ids = sorted(quantities)
+
+    def shortfalls(only_short: bool = True) -> List[Dict[str, int]]:
+        available = dict(
+            db.query(Product.id, Product.stock)
+            .filter(Product.id.in_(product_ids))
+            .order_by(Product.id)
+            .with_for_update()
+        )
+        return [
+            {
+                "product_id": product_id,
+                "requested": quantities[product_id],
+                "available": available.get(product_id, 0),
+            }
+            for product_id in product_ids
+            if not only_short or available.get(product_id, 0) < quantities[product_id]
+        ]
+
+    # 1. Lock the rows (in id order) and check every line.
+    short = shortfalls()
+    if short:
+        return short
+
+    # 2. Apply the reservation in one guarded statement.
+    requested = case(quantities, value=Product.id)
+    result = db.execute(
+        update(Product)
+        .where(Product.id.in_(product_ids), Product.stock >= requested)
+        .values(stock=Product.stock - requested, updated_at=datetime.now(timezone.utc))
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != len(product_ids):
+        # Another checkout took stock between the check and the update
+        # (possible only without row locks). Report what is left now.
+        return shortfalls() or shortfalls(only_short=False)
+
+    # 3. Stock is part of the product documents.
+    rebuild_product_documents(db, product_ids)
+    return []
+
+
+def release_stock(db: Session, quantities: Dict[int, int]) -> None:
+    """Puts `quantities` ({product_id: units}) back into stock. Does not commit."""
+    adjust_stock(db, quantities)
+
+
+def adjust_stock(db: Session, deltas: Dict[int, int]) -> None:
+    """
+    Adds `deltas` ({product_id: units}, negative to take units out) to stock,
+    unguarded. Does not commit.
+    """
+    if not deltas:
+        return
+    product_ids = sorted(deltas)
+    # Same lock order as reserve_stock.
+    db.query(Product.id).filter(Product.id.in_(product_ids)).order_by(
+        Product.id
+    ).with_for_update().all()
+    db.execute(
+        update(Product)
+        .where(Product.id.in_(product_ids))
+        .values(
+            stock=Product.stock + case(deltas, value=Product.id),
+            updated_at=datetime.now(timezone.utc),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    rebuild_product_documents(db, product_ids)
+
+
+def touch_products(db: Session, product_ids: List[int]) -> None:
+    """
+    Bumps updated_at (and so the ETag) of products whose response changed
+    through a related row, e.g. a deleted size. Does not commit.
+    """
+    if product_ids:
+        db.query(Product).filter(Product.id.in_(product_ids)).update(
+            {Product.updated_at: datetime.now(timezone.utc)}, synchronize_session=False
+        )
+
+
+def get_products_by_ids(db: Session, product_ids: List[int]) -> List[Product]:
+    """
+    Loads the given products (with their relationships) in one batch.
+    Results follow the order of `product_ids`; unknown ids are skipped.
+    """
+    if not product_ids:
+        return []
+    products = (
+        db.query(Product)
+        .options(*product_relations())
+        .filter(Product.id.in_(product_ids))
+        .all()
+    )
+    by_id = {product.id: product for product in products}
+    return [by_id[product_id] for product_id in product_ids if product_id in by_id]
+
+
 # def get_all_products(
 #     db: Session,
 #     *,
@@ -102,36 +345,54 @@ def update_product(db: Session, db_obj: Product, obj_in: Dict[str, Any]) -> Prod
 #     return items, total_count
 
 
-def get_all_products(
-    db: Session,
+# Sort options shared by offset and keyset pagination.
+# Each entry is (column, descending). Product.id is always appended as a
+# tie-breaker so rows with equal sort values keep a stable order.
+PRODUCT_SORT_COLUMNS = {
+    "created_at": (Product.created_at, True),
+    "price-low": (Product.price, False),
+    "price-high": (Product.price, True),
+    # Best sellers: units sold over the last 30 days (see app/crud/sales.py).
+    "popular": (Product.popularity, True),
+}
+DEFAULT_PRODUCT_SORT = "created_at"
+
+
+def resolve_product_sort(sort_by: Optional[str]) -> str:
+    """Returns a valid sort key, falling back to the default for unknown values."""
+    return sort_by if sort_by in PRODUCT_SORT_COLUMNS else DEFAULT_PRODUCT_SORT
+
+
+def get_product_sort_value(product: Product, sort_by: Optional[str]) -> Any:
+    """Reads the value a product is ordered by for the given sort key."""
+    column, _ = PRODUCT_SORT_COLUMNS[resolve_product_sort(sort_by)]
+    return getattr(product, column.key)
+
+
+def _apply_product_filters(
+    query,
     *,
     status: Optional[ProductStatus] = None,
     gender: Optional[ProductGender] = None,
-    sort_by: Optional[str] = None,
     min_price: Optional[float] = None,
     max_price: Optional[float] = None,
     category_ids: Optional[List[int]] = None,
     size_ids: Optional[List[int]] = None,
     colour_ids: Optional[List[int]] = None,
     search: Optional[str] = None,
-    skip: int = 0,
-    limit: int = 20,
-) -> Tuple[List[Product], int]:
+):
     """
-    Fetches a list of products with advanced filtering, sorting, and pagination.
-    """
-    query = db.query(Product)
+    Applies the catalog filters to a Product query.
+    Returns the filtered query and a search relevance expression
+    (None when there is no search term).
 
+    Size and colour filters are EXISTS semi-joins against the association
+    tables, so they never multiply product rows and no DISTINCT is needed.
+    """
+    search_rank = None
     if search:
-        # Use .ilike() for case-insensitive search on both name and description
-        search_term = f"%{search}%"
-        query = query.filter(
-            (Product.name.ilike(search_term)) | (Product.description.ilike(search_term))
-        )
-
-    # Track if we need joins for many-to-many relationships
-    needs_size_join = size_ids and len(size_ids) > 0
-    needs_colour_join = colour_ids and len(colour_ids) > 0
+        # Full-text search (tsvector on Postgres, FTS5 on SQLite)
+        query, search_rank = apply_product_search(query, search)
 
     # --- Apply basic filters ---
     if status:
@@ -147,34 +408,210 @@ def get_all_products(
     if category_ids and len(category_ids) > 0:
         query = query.filter(Product.category_id.in_(category_ids))
 
-    # --- Handle many-to-many relationships carefully ---
-    if needs_size_join:
-        query = query.join(Product.sizes).filter(Size.id.in_(size_ids))
-    if needs_colour_join:
-        query = query.join(Product.colours).filter(Colour.id.in_(colour_ids))
+    # --- Handle many-to-many relationships with semi-joins ---
+    # Each EXISTS probe is answered from the association table's
+    # (product_id, size_id) / (product_id, colour_id) primary key.
+    if size_ids:
+        query = query.filter(
+            exists().where(
+                product_sizes_table.c.product_id == Product.id,
+                product_sizes_table.c.size_id.in_(size_ids),
+            )
+        )
+    if colour_ids:
+        query = query.filter(
+            exists().where(
+                product_colours_table.c.product_id == Product.id,
+                product_colours_table.c.colour_id.in_(colour_ids),
+            )
+        )
 
-    # --- Get total count BEFORE pagination ---
-    # Use distinct() only if we have joins that might create duplicates
-    if needs_size_join or needs_colour_join:
-        total_count = query.distinct().count()
-    else:
-        total_count = query.count()
+    return query, search_rank
+
+
+def get_all_products(
+    db: Session,
+    *,
+    sort_by: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 20,
+    count_total: bool = True,
+    **filters: Any,
+) -> Tuple[List[Product], Optional[int]]:
+    """
+    Fetches a list of products with advanced filtering, sorting, and pagination.
+    When searching, results are ordered by relevance unless another sort is requested.
+
+    The total is returned alongside the page (None when count_total is False).
+    It rides on the page query as an uncorrelated count subquery, so both come
+    back in one round trip. (A count(*) OVER () window would do the same, but
+    it has to see every row before ORDER BY, which stops the database walking
+    a listing index and forces a full sort.)
+    """
+    query, search_rank = _apply_product_filters(db.query(Product), **filters)
+    filtered_query = query
+    total_count = None
 
     # --- Apply sorting ---
-    if sort_by == "created_at":
-        query = query.order_by(Product.created_at.desc())
-    elif sort_by == "price-low":
-        query = query.order_by(Product.price.asc())
-    elif sort_by == "price-high":
-        query = query.order_by(Product.price.desc())
+    rank_sort = search_rank is not None and sort_by in (None, "relevance")
+    column, descending = PRODUCT_SORT_COLUMNS[resolve_product_sort(sort_by)]
+    if rank_sort:
+        rank_column = search_rank.label("search_rank")
+        query = query.add_columns(rank_column)
+        query = query.order_by(rank_column.desc(), Product.id.desc())
+    elif descending:
+        query = query.order_by(column.desc(), Product.id.desc())
     else:
-        # Default sorting by created_at desc
-        query = query.order_by(Product.created_at.desc())
+        query = query.order_by(column.asc(), Product.id.asc())
+
+    # --- Get total count in the same round trip ---
+    if count_total:
+        count_subquery = (
+            filtered_query.with_entities(func.count(Product.id))
+            .statement.correlate(None)
+            .scalar_subquery()
+        )
+        query = query.add_columns(count_subquery.label("total_count"))
 
     # --- Apply pagination ---
-    if needs_size_join or needs_colour_join:
-        items = query.distinct().offset(skip).limit(limit).all()
+    # Relationships are batch-loaded so serializing the page stays a fixed
+    # number of queries no matter how many products it holds.
+    query = query.options(*product_relations())
+    rows = query.offset(skip).limit(limit).all()
+
+    if count_total:
+        if rows:
+            total_count = rows[0].total_count
+        elif skip == 0:
+            total_count = 0
+        else:
+            # Past the last page the count has no row to ride on.
+            total_count = filtered_query.count()
+
+    if rank_sort or count_total:
+        items = [row[0] for row in rows]
     else:
-        items = query.offset(skip).limit(limit).all()
+        items = rows
 
     return items, total_count
+
+
+def estimate_product_count(db: Session, **filters: Any) -> Optional[int]:
+    """
+    Returns the planner's row estimate for a product listing, or None if the
+    database cannot provide one. This reads statistics only; no rows are scanned.
+    """
+    bind = db.get_bind()
+    if bind.dialect.name != "postgresql":
+        return None
+
+    query, _ = _apply_product_filters(db.query(Product.id), **filters)
+    compiled = query.statement.compile(
+        dialect=bind.dialect, compile_kwargs={"render_postcompile": True}
+    )
+    plan = (
+        db.connection()
+        .exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params)
+        .scalar()
+    )
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def get_products_keyset(
+    db: Session,
+    *,
+    sort_by: Optional[str] = None,
+    after: Optional[Tuple[Any, int]] = None,
+    backwards: bool = False,
+    limit: int = 20,
+    **filters: Any,
+) -> Tuple[List[Product], bool]:
+    """
+    Fetches one page of products positioned relative to a (sort value, id) keyset.
+
+    Unlike get_all_products this never uses OFFSET, so the cost of a page does
+    not grow with how deep into the catalog it is. Returns the page in display
+    order and whether more rows exist in the direction of travel.
+    """
+    query, _ = _apply_product_filters(db.query(Product), **filters)
+
+    # Walking backwards flips both the comparison and the ordering. The page is
+    # reversed again below so callers always receive it in display order.
+    column, descending = PRODUCT_SORT_COLUMNS[resolve_product_sort(sort_by)]
+    scan_descending = descending != backwards
+
+    if after is not None:
+        keyset = tuple_(column, Product.id)
+        position = tuple_(literal(after[0], column.type), literal(after[1], Integer))
+        if scan_descending:
+            query = query.filter(keyset < position)
+        else:
+            query = query.filter(keyset > position)
+
+    if scan_descending:
+        query = query.order_by(column.desc(), Product.id.desc())
+    else:
+        query = query.order_by(column.asc(), Product.id.asc())
+
+    # Fetch one extra row to learn whether another page exists.
+    items = query.options(*product_relations()).limit(limit + 1).all()
+    has_more = len(items) > limit
+    items = items[:limit]
+
+    if backwards:
+        items.reverse()
+
+    return items, has_more
+
+
+# Lower bounds of the price buckets shown in the filter sidebar.
+# Bucket i covers [edges[i], edges[i + 1]); the last bucket is open-ended.
+PRICE_BUCKET_EDGES = [0, 50, 100, 250, 500, 1000]
+
+
+def get_product_facet_counts(db: Session, **filters: Any) -> Dict[str, Dict[Any, int]]:
+    """
+    Counts matching products per gender, category, size, colour and price bucket.
+
+    Each facet is counted with all filters applied except its own (so picking
+    another value of that facet shows a meaningful number). All five grouped
+    counts are sent to the database as a single UNION ALL statement.
+    """
+    price_bucket = case(
+        *[
+            (Product.price < edge, index)
+            for index, edge in enumerate(PRICE_BUCKET_EDGES[1:])
+        ],
+        else_=len(PRICE_BUCKET_EDGES) - 1,
+    )
+
+    facets = [
+        # (facet name, grouped column, own filter(s), association table to join)
+        ("gender", Product.gender, ("gender",), None),
+        ("category_id", Product.category_id, ("category_ids",), None),
+        ("size_id", product_sizes_table.c.size_id, ("size_ids",), product_sizes_table),
+        ("colour_id", product_colours_table.c.colour_id, ("colour_ids",), product_colours_table),
+        ("price", price_bucket, ("min_price", "max_price"), None),
+    ]
+
+    statements = []
+    for name, key, own_filters, association in facets:
+        query = db.query(
+            literal(name).label("facet"),
+            cast(key, String).label("value"),
+            func.count().label("count"),
+        ).select_from(Product)
+        if association is not None:
+            query = query.join(association, association.c.product_id == Product.id)
+        scoped_filters = {k: v for k, v in filters.items() if k not in own_filters}
+        query, _ = _apply_product_filters(query, **scoped_filters)
+        statements.append(query.group_by(key).statement)
+
+    counts: Dict[str, Dict[Any, int]] = {name: {} for name, _, _, _ in facets}
+    for facet, value, count in db.execute(union_all(*statements)):
+        if value is None:
+            continue
+        counts[facet][value if facet == "gender" else int(value)] = count
+    return counts
@@ -0,0 +1,149 @@
+# app/crud/product_document.py
+
+"""
+The product document store: one row per product holding its serialized
+ProductResponse. Writers call save/rebuild before committing, so a document
+is always exactly as current as the product it describes; readers fetch the
+JSON text and return it as-is.
+"""
+
+from typing import Dict, Iterable, List
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.db.upsert import upsert
+from app.models.product_model import Product, ProductDocument
+from app.schemas.product_schema import ProductResponse
+from app.crud.loaders import product_relations
+
+
+def render_product_document(product: Product) -> str:
+    """Serializes a product (with its relationships loaded) to response JSON."""
+    return ProductResponse.model_validate(product).model_dump_json()
+
+
+def save_product_documents(db: Session, products: Iterable[Product]) -> None:
+    """
+    Writes the documents for already-loaded products, in one multi-row upsert
+    however many there are. Does not commit: call it inside the transaction
+    that changed the products.
+    """
+    products = list(products)
+    if not products:
+        return
+    db.flush()  # New products need their ids (and images theirs) first.
+    table = ProductDocument.__table__
+    statement = upsert(db, table).values(
+        [
+            {"product_id": product.id, "document": render_product_document(product)}
+            for product in products
+        ]
+    )
+    db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[table.c.product_id],
+            set_={"document": statement.excluded.document, "updated_at": func.now()},
+        )
+    )
+
+
+def rebuild_product_documents(db: Session, product_ids: Iterable[int]) -> None:
+    """Reloads the given products and rewrites their documents. Does not commit."""
+    product_ids = list(set(product_ids))
+    if not product_ids:
+        return
+    db.flush()
+    products = (
+        db.query(Product)
+        .options(*product_relations())
+        .filter(Product.id.in_(product_ids))
+        .populate_existing()
+        .all()
+    )
+    save_product_documents(db, products)
+
+
+def delete_product_documents(db: Session, product_ids: Iterable[int]) -> None:
+    """Drops documents so the next read rebuilds them. Does not commit."""
+    product_ids = list(set(product_ids))
+    if product_ids:
+        db.query(ProductDocument).filter(
+            ProductDocument.product_id.in_(product_ids)
+        ).delete(synchronize_session=False)
+
+
+def get_product_documents(db: Session, product_ids: Iterable[int]) -> Dict[int, str]:
+    """
+    Returns {product_id: document JSON} for the given ids in one query.
+    Missing documents (e.g. products created before the store existed) are
+    built and saved on the way; ids with no product are left out.
+    """
+    product_ids = list(set(product_ids))
+    if not product_ids:
+        return {}
+    documents = dict(
+        db.query(ProductDocument.product_id, ProductDocument.document).filter(
+            ProductDocument.product_id.in_(product_ids)
+        )
+    )
+    missing = [product_id for product_id in product_ids if product_id not in documents]
+    if missing:
+        documents.update(_backfill_product_documents(db, missing))
+    return documents
+
+
+def _backfill_product_documents(db: Session, product_ids: List[int]) -> Dict[int, str]:
+    """
+    Builds and stores the documents of products that have none, and returns
+    them. This runs in a session of its own, so a read never commits the
+    caller's transaction. The insert skips documents that already exist, so
+    two requests backfilling the same product can't collide.
+    """
+    with Session(bind=db.get_bind()) as writer:
+        products = (
+            writer.query(Product)
+            .options(*product_relations())
+            .filter(Product.id.in_(product_ids))
+            .all()
+        )
+        built = {product.id: render_product_document(product) for product in products}
+        if built:
+            table = ProductDocument.__table__
+            writer.execute(
+                upsert(writer, table)
+                .values(
+                    [
+                        {"product_id": product_id, "document": document}
+                        for product_id, document in built.items()
+                    ]
+                )
+                .on_conflict_do_nothing(index_elements=[table.c.product_id])
+            )
+            writer.commit()
+    return built
+
+
+def get_product_document(db: Session, product_id: int) -> str | None:
+    return get_product_documents(db, [product_id]).get(product_id)
+
+
+def rebuild_all_product_documents(db: Session, batch_size: int = 500) -> int:
+    """Rewrites every product's document, committing per batch. Returns the count."""
+    total = 0
+    last_id = 0
+    while True:
+        batch: List[int] = [
+            product_id
+            for (product_id,) in db.query(Product.id)
+            # Products orphaned by a category delete have no valid document.
+            .filter(Product.id > last_id, Product.category_id.isnot(None))
+            .order_by(Product.id)
+            .limit(batch_size)
+        ]
+        if not batch:
+            return total
+        rebuild_product_documents(db, batch)
+        db.commit()
+        db.expunge_all()
+        total += len(batch)
+        last_id = batch[-1]
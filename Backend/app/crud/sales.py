@@ -0,0 +1,281 @@
+# app/crud/sales.py
+
+"""
+Per-product sales counters, maintained incrementally.
+
+Placing an order adds its lines to three places, and cancelling one takes
+them out again (units sold on flash sale are added when their stock is
+written back, see services.flash_sale_services.reconcile_flash_sales):
+
+- product_sales_daily: units and revenue per product per day;
+- product_sales: rolling 7/30-day and all-time totals per product;
+- products.popularity: the 30-day unit count, indexed for sort_by=popular.
+
+Increments only ever add to the windows. Days that have aged out of a window
+are removed by refresh_sales_windows, which should run daily
+(`python -m app.db.rebuild_sales_counters --windows`).
+rebuild_sales_counters recomputes everything from orderitems.
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import bindparam, case, delete, func, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.db.upsert import upsert
+from app.models.order_model import Order, OrderItem, OrderStatus
+from app.models.product_model import Product
+from app.models.sales_model import ProductSales, ProductSalesDay
+
+# Window name -> length in days. Product.popularity mirrors POPULARITY_WINDOW.
+SALES_WINDOWS = {"7d": 7, "30d": 30}
+POPULARITY_WINDOW = "30d"
+
+products_table = Product.__table__
+daily_table = ProductSalesDay.__table__
+sales_table = ProductSales.__table__
+
+WINDOW_COLUMNS = [
+    f"{measure}_{name}" for name in SALES_WINDOWS for measure in ("units", "revenue")
+]
+
+
+def _today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def _window_start(days: int, today: date) -> date:
+    """First day inside a window of `days` days ending today."""
+    return today - timedelta(days=days - 1)
+
+
+def order_day(placed: Optional[datetime]) -> date:
+    """The UTC day an order placed at `placed` counts towards."""
+    placed = placed or datetime.now(timezone.utc)
+    if placed.tzinfo is not None:
+        placed = placed.astimezone(timezone.utc)
+    return placed.date()
+
+
+def _utc_day(db: Session, column):
+    """SQL for the UTC day of a timestamp column (the same day as order_day)."""
+    if db.get_bind().dialect.name == "postgresql":
+        # date() alone would follow the session's TimeZone setting.
+        return func.date(func.timezone("UTC", column))
+    # SQLite stores the UTC wall time the timestamps were written with.
+    return func.date(column)
+
+
+def _set_popularity(db: Session, popularity: Dict[int, int], mode: str) -> None:
+    """
+    Adds to ("add") or overwrites ("set") products.popularity for
+    {product_id: units}, in one statement however many products there are.
+    updated_at is set to itself so its onupdate doesn't fire: sales don't
+    change a product's document or ETag.
+    """
+    if not popularity:
+        return
+    units = case(popularity, value=products_table.c.id)
+    db.execute(
+        update(products_table)
+        .where(products_table.c.id.in_(sorted(popularity)))
+        .values(
+            popularity=products_table.c.popularity + units if mode == "add" else units,
+            updated_at=products_table.c.updated_at,
+        )
+    )
+
+
+def record_sales(
+    db: Session,
+    day: date,
+    lines: Iterable[Tuple[int, int, float]],
+    sign: int = 1,
+) -> None:
+    """
+    Adds (sign=1) or removes (sign=-1) sales made on `day` to the counters.
+    `lines` are (product_id, quantity, unit price) tuples. Does not commit:
+    call it inside the transaction that places or cancels the order.
+    """
+    # 1. Net the lines per product, in id order: every write below then locks
+    # rows in the same order as reserve_stock, so concurrent checkouts of the
+    # same products can't deadlock.
+    netted: Dict[int, list] = defaultdict(lambda: [0, 0.0])
+    for product_id, quantity, price in lines:
+        netted[product_id][0] += sign * quantity
+        netted[product_id][1] += sign * quantity * price
+    if not netted:
+        return
+    totals = dict(sorted(netted.items()))
+
+    today = _today()
+    in_window = {
+        name: day >= _window_start(days, today) for name, days in SALES_WINDOWS.items()
+    }
+
+    # 2. The day's bucket.
+    daily = upsert(db, daily_table)
+    db.execute(
+        daily.on_conflict_do_update(
+            index_elements=[daily_table.c.product_id, daily_table.c.day],
+            set_={
+                "units": daily_table.c.units + daily.excluded.units,
+                "revenue": daily_table.c.revenue + daily.excluded.revenue,
+            },
+        ),
+        [
+            {"product_id": product_id, "day": day, "units": units, "revenue": revenue}
+            for product_id, (units, revenue) in totals.items()
+        ],
+    )
+
+    # 3. The rolling and all-time totals; windows the day falls outside get 0.
+    rows = []
+    for product_id, (units, revenue) in totals.items():
+        row = {"product_id": product_id, "units_total": units, "revenue_total": revenue}
+        for name in SALES_WINDOWS:
+            row[f"units_{name}"] = units if in_window[name] else 0
+            row[f"revenue_{name}"] = revenue if in_window[name] else 0.0
+        rows.append(row)
+    summary = upsert(db, sales_table)
+    db.execute(
+        summary.on_conflict_do_update(
+            index_elements=[sales_table.c.product_id],
+            set_={
+                column: sales_table.c[column] + summary.excluded[column]
+                for column in ["units_total", "revenue_total", *WINDOW_COLUMNS]
+            },
+        ),
+        rows,
+    )
+
+    # 4. The indexed sort key.
+    if in_window[POPULARITY_WINDOW]:
+        _set_popularity(
+            db,
+            {product_id: units for product_id, (units, _) in totals.items() if units},
+            mode="add",
+        )
+
+
+def record_order_sales(
+    db: Session, order: Order, sign: int = 1, exclude: Iterable[int] = ()
+) -> None:
+    """
+    Counts (sign=1) or uncounts (sign=-1) an order's items, except those of
+    the products in `exclude`. Does not commit.
+    """
+    exclude = set(exclude)
+    record_sales(
+        db,
+        order_day(order.order_date),
+        [
+            (item.product_id, item.quantity, item.price_at_purchase)
+            for item in order.items
+            if item.product_id not in exclude
+        ],
+        sign=sign,
+    )
+
+
+def refresh_sales_windows(db: Session, today: Optional[date] = None) -> int:
+    """
+    Recomputes every rolling window (and products.popularity) from the daily
+    buckets, dropping days that have aged out. Does not commit.
+    Returns how many products sold anything within the longest window.
+    """
+    today = today or _today()
+    starts = {name: _window_start(days, today) for name, days in SALES_WINDOWS.items()}
+
+    # 1. Sum each window from the buckets that can still be inside one.
+    sums = []
+    for name, start in starts.items():
+        inside = daily_table.c.day >= start
+        sums.append(func.sum(case((inside, daily_table.c.units), else_=0)).label(f"units_{name}"))
+        sums.append(
+            func.sum(case((inside, daily_table.c.revenue), else_=0)).label(f"revenue_{name}")
+        )
+    rows = db.execute(
+        select(daily_table.c.product_id, *sums)
+        .where(daily_table.c.day >= min(starts.values()))
+        .group_by(daily_table.c.product_id)
+    ).all()
+
+    # 2. Clear the windows, then write the fresh sums.
+    db.execute(
+        update(sales_table)
+        .where(or_(*(sales_table.c[column] != 0 for column in WINDOW_COLUMNS)))
+        .values({column: 0 for column in WINDOW_COLUMNS})
+    )
+    if rows:
+        db.execute(
+            update(sales_table)
+            .where(sales_table.c.product_id == bindparam("s_product_id"))
+            .values({column: bindparam(f"s_{column}") for column in WINDOW_COLUMNS}),
+            [
+                {
+                    "s_product_id": row.product_id,
+                    **{f"s_{column}": getattr(row, column) or 0 for column in WINDOW_COLUMNS},
+                }
+                for row in rows
+            ],
+        )
+
+    # 3. Mirror the popularity window onto products.
+    db.execute(
+        update(products_table)
+        .where(products_table.c.popularity != 0)
+        .values(popularity=0, updated_at=products_table.c.updated_at)
+    )
+    _set_popularity(
+        db,
+        {
+            row.product_id: getattr(row, f"units_{POPULARITY_WINDOW}")
+            for row in rows
+            if getattr(row, f"units_{POPULARITY_WINDOW}")
+        },
+        mode="set",
+    )
+    return len(rows)
+
+
+def rebuild_sales_counters(db: Session) -> int:
+    """
+    Rebuilds all counters from orderitems (cancelled orders excluded).
+    Does not commit. Returns how many products have ever sold anything.
+    """
+    db.execute(delete(daily_table))
+    db.execute(delete(sales_table))
+
+    # 1. One bucket per product per (UTC) day.
+    day = _utc_day(db, Order.order_date)
+    db.execute(
+        insert(daily_table).from_select(
+            ["product_id", "day", "units", "revenue"],
+            select(
+                OrderItem.product_id,
+                day,
+                func.sum(OrderItem.quantity),
+                func.sum(OrderItem.quantity * OrderItem.price_at_purchase),
+            )
+            .join(Order, OrderItem.order_id == Order.id)
+            .where(Order.status != OrderStatus.cancelled)
+            .group_by(OrderItem.product_id, day),
+        )
+    )
+
+    # 2. All-time totals; the windows are filled from the buckets next.
+    db.execute(
+        insert(sales_table).from_select(
+            ["product_id", "units_total", "revenue_total"],
+            select(
+                daily_table.c.product_id,
+                func.sum(daily_table.c.units),
+                func.sum(daily_table.c.revenue),
+            ).group_by(daily_table.c.product_id),
+        )
+    )
+    refresh_sales_windows(db)
+    return db.execute(select(func.count()).select_from(sales_table)).scalar()
@@ -0,0 +1,88 @@
+# app/crud/search.py
+
+import re
+from typing import List, Optional, Tuple
+from sqlalchemy import column, false, func, literal_column, select, table
+from app.models.product_model import Product
+
+# Postgres: a generated, weighted tsvector column (name > brand > description)
+# maintained by the database itself and indexed with GIN. See the
+# "add product full text search" migration.
+PG_SEARCH_CONFIG = "english"
+pg_search_vector = literal_column("products.search_vector")
+
+# SQLite: an FTS5 external-content table kept in sync by triggers.
+# See the DDL registered at the bottom of app/models/product_model.py.
+products_fts = table("products_fts", column("rowid"))
+
+# Runs of letters and digits: what both backends' tokenizers treat as words
+# (underscores and punctuation separate words in tsvector and FTS5 alike).
+_WORD_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+
+def _search_words(term: str) -> List[str]:
+    return _WORD_RE.findall(term)
+
+
+def _fts5_query(words: List[str]) -> str:
+    """
+    Builds a safe FTS5 query: every word is quoted (so user input can never
+    be parsed as FTS syntax) and prefix-matched, and all words must match.
+    """
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def _tsquery(words: List[str]) -> str:
+    """
+    The Postgres equivalent, for to_tsquery: every word prefix-matched
+    (`word:*`), all of them required. Words are letters and digits only, so
+    they can't carry tsquery operators.
+    """
+    return " & ".join(f"{word}:*" for word in words)
+
+
+def apply_product_search(query, term: str) -> Tuple[object, Optional[object]]:
+    """
+    Filters a Product query by a full-text search term.
+
+    Both backends match the same way: every word of the term must appear,
+    as a word or a word prefix. A term with no words matches nothing.
+
+    Returns the filtered query and a relevance expression (higher is more
+    relevant) that callers can order by, or None when the backend cannot
+    rank results.
+    """
+    words = _search_words(term)
+    if not words:
+        return query.filter(false()), None
+
+    dialect = query.session.get_bind().dialect.name
+
+    if dialect == "postgresql":
+        ts_query = func.to_tsquery(PG_SEARCH_CONFIG, _tsquery(words))
+        query = query.filter(pg_search_vector.op("@@")(ts_query))
+        return query, func.ts_rank_cd(pg_search_vector, ts_query)
+
+    if dialect == "sqlite":
+        match = _fts5_query(words)
+        # bm25() returns lower-is-better scores, so negate it for ranking.
+        # Column weights mirror the Postgres setweight() A/B/C ordering.
+        hits = (
+            select(
+                products_fts.c.rowid.label("product_id"),
+                (-func.bm25(literal_column("products_fts"), 10.0, 5.0, 1.0)).label(
+                    "rank"
+                ),
+            )
+            .where(literal_column("products_fts").op("MATCH")(match))
+            .subquery("search_hits")
+        )
+        query = query.join(hits, hits.c.product_id == Product.id)
+        return query, hits.c.rank
+
+    # Any other backend: fall back to a case-insensitive substring match.
+    search_term = f"%{term}%"
+    query = query.filter(
+        (Product.name.ilike(search_term)) | (Product.description.ilike(search_term))
+    )
+    return query, None
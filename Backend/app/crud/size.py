@@ -2,8 +2,12 @@
 
 from sqlalchemy.orm import Session
 from typing import List
-from app.models.product_model import Size
+from app.models.product_model import Size, product_sizes_table
 from app.schemas.product_schema import SizeCreate
+from app.crud.product import touch_products
+from app.core.product_index import product_index
+from app.core.reference_data import reference_data
+from app.crud.product_document import rebuild_product_documents
 
 
 def create_size(db: Session, size_in: SizeCreate) -> Size:
@@ -12,6 +16,7 @@ def create_size(db: Session, size_in: SizeCreate) -> Size:
     db.add(size)
     db.commit()
     db.refresh(size)
+    reference_data.invalidate()
     return size
 
 
@@ -25,8 +30,24 @@ def get_all_sizes(db: Session) -> List[Size]:
     return db.query(Size).all()
 
 
-def delete_size(db: Session, db_obj: Size) -> None:
-    """Deletes a given size object from the database."""
+
+def delete_size(db: Session, db_obj: Size) -> List[int]:
+    """
+    Deletes a given size object from the database. Returns the ids of the
+    products that had it.
+    """
+    product_ids = [
+        product_id
+        for (product_id,) in db.query(product_sizes_table.c.product_id).filter(
+            product_sizes_table.c.size_id == db_obj.id
+        )
+    ]
+    deleted_id = db_obj.id
     db.delete(db_obj)
+    # The size drops out of these products' documents in the same commit.
+    touch_products(db, product_ids)
+    rebuild_product_documents(db, product_ids)
     db.commit()
-    return None
+    reference_data.invalidate()
+    product_index.remove_value("size_id", deleted_id)
+    return product_ids
@@ -3,6 +3,7 @@
 from sqlalchemy.orm import Session
 from typing import List
 from app.models.wishlist_model import WishlistItem
+from app.crud.loaders import wishlist_item_relations
 
 def get_existing_wishlist_item(
     db: Session, user_id: int, product_id: int
@@ -33,6 +34,13 @@ def delete_wishlist_item(db: Session, db_obj: WishlistItem) -> None:
     db.commit()
     return None
 
-def get_all_wishlist_items_for_user(db: Session, user_id: int) -> List[WishlistItem]:
+def get_all_wishlist_items_for_user(
+    db: Session, user_id: int, with_products: bool = True
+) -> List[WishlistItem]:
     """Gets all wishlist items for a specific user."""
-    return db.query(WishlistItem).filter(WishlistItem.user_id == user_id).all()
+    return (
+        db.query(WishlistItem)
+        .options(*wishlist_item_relations(with_products))
+        .filter(WishlistItem.user_id == user_id)
+        .all()
+    )
@@ -1,7 +1,8 @@
 from app.db.base_class import Base
 
 from app.models.user_model import User
-from app.models.product_model import Product, Category, Size, Colour, ProductImage
+from app.models.product_model import Product, Category, Size, Colour, ProductImage, ProductDocument
 from app.models.cart_model import CartItem
 from app.models.wishlist_model import WishlistItem
-from app.models.order_model import Order, OrderItem
\ No newline at end of file
+from app.models.order_model import Order, OrderItem
+from app.models.sales_model import ProductSalesDay, ProductSales
\ No newline at end of file
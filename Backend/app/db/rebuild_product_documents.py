@@ -0,0 +1,15 @@
+# app/db/rebuild_product_documents.py
+
+from app.db.session import SessionLocal
+from app.db import base  # noqa: F401  (registers every model with the mapper)
+from app.crud import product_document as product_document_crud
+
+
+if __name__ == "__main__":
+    print("Rebuilding product documents...")
+    db = SessionLocal()
+    try:
+        count = product_document_crud.rebuild_all_product_documents(db)
+        print(f"Rebuilt {count} product documents.")
+    finally:
+        db.close()
@@ -0,0 +1,26 @@
+# app/db/rebuild_sales_counters.py
+
+import sys
+
+from app.db.session import SessionLocal
+from app.db import base  # noqa: F401  (registers every model with the mapper)
+from app.crud import sales as sales_crud
+
+
+if __name__ == "__main__":
+    # --windows: only roll the 7/30-day windows forward (run daily).
+    # Otherwise: recompute every counter from the order history.
+    windows_only = "--windows" in sys.argv[1:]
+    db = SessionLocal()
+    try:
+        if windows_only:
+            print("Refreshing sales windows...")
+            count = sales_crud.refresh_sales_windows(db)
+            print(f"{count} products sold within the last 30 days.")
+        else:
+            print("Rebuilding sales counters from order history...")
+            count = sales_crud.rebuild_sales_counters(db)
+            print(f"Rebuilt sales counters for {count} products.")
+        db.commit()
+    finally:
+        db.close()
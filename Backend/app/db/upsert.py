@@ -0,0 +1,15 @@
+# app/db/upsert.py
+
+from sqlalchemy.orm import Session
+
+
+def upsert(db: Session, table):
+    """
+    An INSERT for `table` supporting ON CONFLICT DO UPDATE / DO NOTHING on
+    this session's dialect (Postgres in production, SQLite locally).
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    return dialect_insert(table)
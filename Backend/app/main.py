@@ -1,5 +1,8 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
+from fastapi.staticfiles import StaticFiles
 from starlette.middleware.cors import CORSMiddleware
+import os
 import time
 import logging
 
@@ -7,15 +10,28 @@ from app.core.config import settings
 from app.core.logging_config import setup_logging
 from app.api.v1 import api_router
 from app.core.config import settings # Make sure settings is imported
+from app.utils.images import shutdown_image_pool
+from app.services.flash_sale_services import flash_sale_reconciler
 
 # Call the setup function to apply our logging config
 setup_logging()
 logger = logging.getLogger("default")
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    flash_sale_reconciler.start()
+    yield
+    # Write back the last flash-sale claims before exiting.
+    flash_sale_reconciler.stop()
+    # Let in-flight image resizes finish before the workers exit.
+    shutdown_image_pool()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
 )
 
 # Logging Middleware
@@ -43,6 +59,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Let browsers read the admin order list's pagination cursor.
+    expose_headers=["X-Next-Cursor"],
 )
 
 # A simple root endpoint to test everything is working
@@ -52,4 +70,9 @@ def read_root():
     return {"message": f"Welcome to {settings.PROJECT_NAME}"}
 
 
-app.include_router(api_router, prefix=settings.API_V1_STR)
\ No newline at end of file
+app.include_router(api_router, prefix=settings.API_V1_STR)
+
+# Uploaded product images and their derivatives. In production, serve this
+# directory from the web server or a CDN instead.
+os.makedirs(settings.MEDIA_ROOT, exist_ok=True)
+app.mount(settings.MEDIA_URL, StaticFiles(directory=settings.MEDIA_ROOT), name="media")
\ No newline at end of file
@@ -1,5 +1,6 @@
 # app/models/order.py
-from sqlalchemy import Column, Integer, ForeignKey, Float, DateTime, Enum as SQLAlchemyEnum
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, ForeignKey, Float, DateTime, Index, Enum as SQLAlchemyEnum
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base_class import Base
@@ -13,11 +14,24 @@ class OrderStatus(enum.Enum):
 
 class Order(Base):
     __tablename__ = "orders"
+    # Order listings are sorted newest first as (order_date, id) keysets
+    # (crud.order.get_orders_keyset); the status and customer filters each
+    # have an index that returns their rows in that order.
+    __table_args__ = (
+        Index("ix_orders_order_date_id", "order_date", "id"),
+        Index("ix_orders_status_order_date_id", "status", "order_date", "id"),
+        Index("ix_orders_user_id_order_date_id", "user_id", "order_date", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     total_amount = Column(Float, nullable=False)
     status = Column(SQLAlchemyEnum(OrderStatus, name="orderstatus"), nullable=False, default=OrderStatus.processing)
-    order_date = Column(DateTime(timezone=True), server_default=func.now())
+    # Stamped in Python so keyset cursors compare exactly (see Product.created_at)
+    order_date = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+    )
     
     # Foreign Key to link to the User
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -30,6 +44,8 @@ class Order(Base):
 
 class OrderItem(Base):
     __tablename__ = "orderitems"
+    # Items are batch-loaded by order_id for each page of orders.
+    __table_args__ = (Index("ix_orderitems_order_id", "order_id"),)
     
     id = Column(Integer, primary_key=True, index=True)
     quantity = Column(Integer, nullable=False)
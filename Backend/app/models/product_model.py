@@ -1,3 +1,5 @@
+from datetime import datetime, timezone
+
 from sqlalchemy import (
     Column,
     Integer,
@@ -6,7 +8,12 @@ from sqlalchemy import (
     Float,
     DateTime,
     ForeignKey,
+    Index,
+    JSON,
     Table,
+    Text,
+    DDL,
+    event,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -19,6 +26,9 @@ product_sizes_table = Table(
     Base.metadata,
     Column("product_id", Integer, ForeignKey("products.id"), primary_key=True),
     Column("size_id", Integer, ForeignKey("sizes.id"), primary_key=True),
+    # The primary key serves lookups by product; this serves lookups by size
+    # (size facet counts, and size filters when the planner starts from sizes).
+    Index("ix_product_sizes_size_id_product_id", "size_id", "product_id"),
 )
 
 # This table connects Products and Colours
@@ -27,6 +37,7 @@ product_colours_table = Table(
     Base.metadata,
     Column("product_id", Integer, ForeignKey("products.id"), primary_key=True),
     Column("colour_id", Integer, ForeignKey("colours.id"), primary_key=True),
+    Index("ix_product_colours_colour_id_product_id", "colour_id", "product_id"),
 )
 
 
@@ -71,14 +82,36 @@ class Colour(Base):
 
 class ProductImage(Base):
     __tablename__ = "product_images"
+    # A product's images in upload order; the first is its primary image.
+    __table_args__ = (Index("ix_product_images_product_id_id", "product_id", "id"),)
     id = Column(Integer, primary_key=True, index=True)
     image_url = Column(String, nullable=False)
+    # Derivatives of uploaded originals (app/utils/images.py); empty for
+    # images added by URL.
+    thumbnail_url = Column(String, nullable=True)
+    variants = Column(JSON, nullable=True)  # [{"width", "format", "url"}]
     product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
     product = relationship("Product", back_populates="images")
 
 
 class Product(Base):
     __tablename__ = "products"
+    # Composite indexes matching the catalog listing's filter/sort paths
+    # (crud.product.get_all_products). Every listing sort is (column, id), so
+    # each index ends in id and can return rows already in page order.
+    __table_args__ = (
+        Index("ix_products_created_at_id", "created_at", "id"),
+        Index("ix_products_price_id", "price", "id"),
+        Index(
+            "ix_products_status_gender_created_at_id",
+            "status",
+            "gender",
+            "created_at",
+            "id",
+        ),
+        Index("ix_products_category_id_price_id", "category_id", "price", "id"),
+        Index("ix_products_popularity_id", "popularity", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True, nullable=False)
@@ -87,6 +120,8 @@ class Product(Base):
     discount_price = Column(Float, nullable=True)  # Optional sale price
     stock = Column(Integer, nullable=False, default=0)
     brand = Column(String, index=True, nullable=True)
+    # Units sold over the last 30 days (app/crud/sales.py keeps it current)
+    popularity = Column(Integer, nullable=False, default=0, server_default="0")
 
     gender = Column(SQLAlchemyEnum(ProductGender, name="productgender"), nullable=False)
     status = Column(
@@ -95,7 +130,14 @@ class Product(Base):
         default=ProductStatus.active,
     )
 
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Stamped in Python so the stored value keeps its microseconds: SQLite's
+    # CURRENT_TIMESTAMP has whole seconds, which never compares equal to a
+    # keyset cursor decoded back into a datetime (paging would repeat rows).
+    created_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+    )
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # --- Relationships ---
@@ -113,3 +155,69 @@ class Product(Base):
     )
 
     wishlisted_by = relationship("WishlistItem", back_populates="product")
+
+
+class ProductDocument(Base):
+    """
+    The product's ready-to-send ProductResponse JSON, rewritten in the same
+    transaction as every change to the product (see app/crud/product_document.py),
+    so read paths can return it without joining the five product tables.
+    """
+
+    __tablename__ = "product_documents"
+
+    product_id = Column(
+        Integer, ForeignKey("products.id", ondelete="CASCADE"), primary_key=True
+    )
+    document = Column(Text, nullable=False)
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+
+# --- Full-text search (SQLite) ---
+# Postgres keeps a generated tsvector column created by Alembic. For local and
+# test runs on SQLite (schema created with metadata.create_all) we build an
+# FTS5 index over the same fields and keep it in sync with triggers.
+_SQLITE_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+        name, brand, description,
+        content='products', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS products_fts_ai AFTER INSERT ON products BEGIN
+        INSERT INTO products_fts(rowid, name, brand, description)
+        VALUES (new.id, new.name, coalesce(new.brand, ''), new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS products_fts_ad AFTER DELETE ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, name, brand, description)
+        VALUES ('delete', old.id, old.name, coalesce(old.brand, ''), old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS products_fts_au
+    AFTER UPDATE OF name, brand, description ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, name, brand, description)
+        VALUES ('delete', old.id, old.name, coalesce(old.brand, ''), old.description);
+        INSERT INTO products_fts(rowid, name, brand, description)
+        VALUES (new.id, new.name, coalesce(new.brand, ''), new.description);
+    END
+    """,
+]
+
+for _statement in _SQLITE_FTS_DDL:
+    event.listen(
+        Product.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="sqlite"),
+    )
+
+event.listen(
+    Product.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS products_fts").execute_if(dialect="sqlite"),
+)
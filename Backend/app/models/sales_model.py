@@ -0,0 +1,43 @@
+# app/models/sales_model.py
+from sqlalchemy import Column, Integer, Float, Date, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.db.base_class import Base
+
+
+class ProductSalesDay(Base):
+    """
+    Units sold and revenue per product per (UTC) day. Adjusted in the same
+    transaction as every order placement or cancellation (see
+    app/crud/sales.py); the rolling windows are summed from these rows.
+    """
+
+    __tablename__ = "product_sales_daily"
+
+    product_id = Column(
+        Integer, ForeignKey("products.id", ondelete="CASCADE"), primary_key=True
+    )
+    day = Column(Date, primary_key=True)
+    units = Column(Integer, nullable=False, default=0, server_default="0")
+    revenue = Column(Float, nullable=False, default=0, server_default="0")
+
+
+class ProductSales(Base):
+    """
+    A product's sales over rolling windows and in total. The 30-day unit count
+    is mirrored to Product.popularity, which is what sort_by=popular orders by.
+    """
+
+    __tablename__ = "product_sales"
+
+    product_id = Column(
+        Integer, ForeignKey("products.id", ondelete="CASCADE"), primary_key=True
+    )
+    units_7d = Column(Integer, nullable=False, default=0, server_default="0")
+    revenue_7d = Column(Float, nullable=False, default=0, server_default="0")
+    units_30d = Column(Integer, nullable=False, default=0, server_default="0")
+    revenue_30d = Column(Float, nullable=False, default=0, server_default="0")
+    units_total = Column(Integer, nullable=False, default=0, server_default="0")
+    revenue_total = Column(Float, nullable=False, default=0, server_default="0")
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
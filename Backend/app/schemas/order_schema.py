@@ -1,7 +1,7 @@
 # app/schemas/order.py
 
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 from datetime import datetime
 import enum
 
@@ -42,6 +42,38 @@ class OrderResponse(BaseModel):
         from_attributes = True
 
 
+class OrderSummaryItem(BaseModel):
+    """An order line in the order history summary: just enough to show it."""
+
+    id: int
+    product_id: int
+    name: Optional[str] = None
+    image_url: Optional[str] = None
+    thumbnail_url: Optional[str] = None
+    quantity: int
+    price_at_purchase: float
+
+
+class OrderSummary(BaseModel):
+    """An order without its customer or full product details."""
+
+    id: int
+    total_amount: float
+    status: str
+    order_date: datetime
+    items: List[OrderSummaryItem]
+
+
+class OrderSummaryPage(BaseModel):
+    """
+    One page of order summaries, newest first. Pass next_cursor back
+    unchanged as `cursor` for the next page; it is null on the last one.
+    """
+
+    items: List[OrderSummary]
+    next_cursor: Optional[str] = None
+
+
 class OrderStatus(str, enum.Enum):
     processing = "processing"
     shipped = "shipped"
@@ -1,5 +1,5 @@
 # app/schemas/product.py
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator
 from typing import List, Optional
 import enum
 
@@ -84,8 +84,18 @@ class ProductImageCreate(ProductImageBase):
     pass
 
 
+class ProductImageVariant(BaseModel):
+    width: int
+    format: str
+    url: str
+
+
 class ProductImageResponse(ProductImageBase):
     id: int
+    # Set for uploaded images: a square thumbnail and resized copies
+    # (WebP/AVIF) for responsive srcsets.
+    thumbnail_url: Optional[str] = None
+    variants: Optional[List[ProductImageVariant]] = None
 
     class Config:
         from_attributes = True
@@ -134,6 +144,56 @@ class ProductUpdate(BaseModel):
     # Image updates would typically be handled by separate endpoints
 
 
+class ProductImportRow(ProductBase):
+    """
+    One product in a bulk import file. Relationships are given by name
+    (matched case-insensitively) and images by URL.
+    """
+
+    category: str
+    sizes: List[str] = []
+    colours: List[str] = []
+    images: List[str] = []
+
+
+class ProductBulkPatch(BaseModel):
+    """
+    One product's changes in a bulk update. Omitted fields are left as they
+    are; send discount_price: null to end a sale.
+    """
+
+    id: int
+    price: Optional[float] = Field(None, gt=0)
+    discount_price: Optional[float] = Field(None, gt=0)
+    stock: Optional[int] = Field(None, ge=0)
+    status: Optional[ProductStatus] = None
+
+    @field_validator("price", "stock", "status", mode="before")
+    @classmethod
+    def reject_null(cls, value):
+        # These columns are NOT NULL: they may be omitted, but not cleared.
+        if value is None:
+            raise ValueError("may be omitted but not null")
+        return value
+
+
+class ProductBulkUpdateSummary(BaseModel):
+    updated: int
+    not_found: List[int]
+
+
+class FlashSaleStart(BaseModel):
+    """Units to sell as flash-sale tokens; omit to offer all the stock."""
+
+    units: Optional[int] = Field(None, ge=1)
+
+
+class FlashSaleResponse(BaseModel):
+    product_id: int
+    remaining: int
+    price: float
+
+
 class ProductResponse(ProductBase):
     id: int
     # When returning a product, we want to show the full nested objects
@@ -148,4 +208,83 @@ class ProductResponse(ProductBase):
 class ProductPageResponse(BaseModel):
     """A schema for returning a paginated list of products."""
     total: int
-    items: List[ProductResponse]
\ No newline at end of file
+    items: List[ProductResponse]
+    total_is_estimate: bool = False
+    # A spell-corrected search query, offered when the search found nothing:
+    # a "did you mean", or in fuzzy mode the query that was searched instead.
+    suggestion: Optional[str] = None
+
+
+class ProductCursorPageResponse(BaseModel):
+    """
+    A schema for returning one keyset-paginated page of products.
+    The cursors are opaque; pass them back unchanged as the `cursor` parameter.
+    """
+    items: List[ProductResponse]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+    suggestion: Optional[str] = None
+
+
+class ProductBatchResponse(BaseModel):
+    """Products fetched by id, in request order, plus the ids that don't exist."""
+    items: List[ProductResponse]
+    missing: List[int]
+
+
+# --- Facet Schemas ---
+
+
+class FacetIdCount(BaseModel):
+    id: int
+    count: int
+
+
+class FacetValueCount(BaseModel):
+    value: str
+    count: int
+
+
+class PriceRangeCount(BaseModel):
+    min_price: float
+    max_price: Optional[float] = None  # None means "and above"
+    count: int
+
+
+class ProductFacetsResponse(BaseModel):
+    """
+    Product counts per filter option for the catalog filter sidebar.
+    Each facet is counted with every other active filter applied.
+    """
+    genders: List[FacetValueCount]
+    categories: List[FacetIdCount]
+    sizes: List[FacetIdCount]
+    colours: List[FacetIdCount]
+    price_ranges: List[PriceRangeCount]
+
+
+# --- Typeahead Schemas ---
+
+
+class ProductSuggestion(BaseModel):
+    """
+    One autocomplete suggestion. `kind` is "product", "brand" or "category";
+    `id` is the product or category id (None for brands).
+    """
+    text: str
+    kind: str
+    id: Optional[int] = None
+
+
+# --- Bulk Import Schemas ---
+
+
+class ProductImportRowError(BaseModel):
+    row: int  # Line number in the uploaded file
+    errors: List[str]
+
+
+class ProductImportReport(BaseModel):
+    created: int
+    failed: int
+    errors: List[ProductImportRowError]
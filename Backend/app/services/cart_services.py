@@ -1,10 +1,12 @@
 from sqlalchemy.orm import Session
 from app.crud import cart as cart_crud
+from app.crud import product_document as product_document_crud
 from app.schemas.cart_schema import CartItemCreate, CartItemUpdate
+from app.schemas.product_schema import SizeResponse, ColourResponse
 from app.models.user_model import User
 from app.models.cart_model import CartItem
 from fastapi import status, HTTPException
-from typing import List
+from app.utils.documents import embed_documents, json_list
 
 def add_item_to_cart(
     db: Session, current_user: User, cart_in: CartItemCreate
@@ -83,9 +85,30 @@ def delete_item_from_cart(
     # 3. Call the simple CRUD function to perform the deletion.
     return cart_crud.delete_cart_item(db=db, db_obj=item_to_delete)
 
-def get_user_cart_items(db: Session, current_user: User) -> List[CartItem]:
+def get_user_cart_items(db: Session, current_user: User) -> str:
     """
-    Service to get all cart items for the current user.
+    Service to get all cart items for the current user, as CartItemResponse
+    JSON. Products come pre-serialized from the product document store.
     """
-    # The service simply calls the appropriate CRUD function.
-    return cart_crud.get_all_cart_items_for_user(db=db, user_id=current_user.id)
+    # 1. Load the cart rows with their size and colour, but not the products.
+    items = cart_crud.get_all_cart_items_for_user(
+        db=db, user_id=current_user.id, with_products=False
+    )
+
+    # 2. Fetch every product's document in one query and splice them in.
+    documents = product_document_crud.get_product_documents(
+        db, [item.product_id for item in items]
+    )
+    return json_list(
+        embed_documents(
+            {
+                "quantity": item.quantity,
+                "id": item.id,
+                "size": SizeResponse.model_validate(item.size).model_dump(),
+                "colour": ColourResponse.model_validate(item.colour).model_dump(),
+            },
+            product=documents[item.product_id],
+        )
+        for item in items
+        if item.product_id in documents
+    )
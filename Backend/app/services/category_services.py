@@ -5,6 +5,9 @@ from app.models.product_model import Category
 from app.schemas.product_schema import CategoryCreate
 from app.models.user_model import User
 from app.crud import category as category_crud
+from app.core.reference_data import reference_data
+from app.services.product_services import invalidate_product_caches
+from app.utils.http_cache import make_etag
 
 
 def create_new_category(
@@ -16,9 +19,7 @@ def create_new_category(
             detail="Not authorized to perform this action.",
         )
     # Check if category already exists
-    existing_category = (
-        db.query(Category).filter(Category.name == category_in.name).first()
-    )
+    existing_category = reference_data.find(db, "categories", name=category_in.name)
     if existing_category:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -41,8 +42,16 @@ def delete_category_by_id(db: Session, current_user: User, category_id: int) ->
             status_code=status.HTTP_404_NOT_FOUND, detail="Category not found"
         )
 
-    return category_crud.delete_category(db=db, db_obj=category_to_delete)
+    # 2. Delete it, then evict the listings and facet counts showing it.
+    product_ids = category_crud.delete_category(db=db, db_obj=category_to_delete)
+    invalidate_product_caches(product_ids, [category_id])
 
 
 def get_all_categories(db: Session) -> List[Category]:
-    return category_crud.get_all_categories(db=db)
+    """Served from the in-process reference data."""
+    return reference_data.all(db, "categories")
+
+
+def get_categories_etag(db: Session) -> str:
+    """ETag for the category list; changes with the reference data version."""
+    return make_etag("categories", reference_data.version(db))
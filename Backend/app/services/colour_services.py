@@ -8,6 +8,9 @@ from app.models.product_model import Colour
 from app.schemas.product_schema import ColourCreate
 from app.models.user_model import User
 from app.crud import colour as colour_crud
+from app.core.reference_data import reference_data
+from app.services.product_services import invalidate_product_caches
+from app.utils.http_cache import make_etag
 
 
 def create_new_colour(
@@ -21,13 +24,9 @@ def create_new_colour(
         )
 
     # Check if colour name or hex code already exists to prevent duplicates
-    existing_colour = (
-        db.query(Colour)
-        .filter(
-            (Colour.name == colour_in.name) | (Colour.hex_code == colour_in.hex_code)
-        )
-        .first()
-    )
+    existing_colour = reference_data.find(
+        db, "colours", name=colour_in.name
+    ) or reference_data.find(db, "colours", hex_code=colour_in.hex_code)
     if existing_colour:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -51,9 +50,16 @@ def delete_colour_by_id(db: Session, current_user: User, colour_id: int) -> None
             status_code=status.HTTP_404_NOT_FOUND, detail="Colour not found"
         )
 
-    return colour_crud.delete_colour(db=db, db_obj=colour_to_delete)
+    product_ids = colour_crud.delete_colour(db=db, db_obj=colour_to_delete)
+    # Evict the listings and facet counts that showed the colour.
+    invalidate_product_caches(product_ids, [])
 
 
 def get_all_colours(db: Session) -> List[Colour]:
-    """Service to get all colours."""
-    return colour_crud.get_all_colours(db=db)
+    """Service to get all colours, served from the in-process reference data."""
+    return reference_data.all(db, "colours")
+
+
+def get_colours_etag(db: Session) -> str:
+    """ETag for the colour list; changes with the reference data version."""
+    return make_etag("colours", reference_data.version(db))
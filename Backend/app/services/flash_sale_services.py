@@ -0,0 +1,206 @@
+# app/services/flash_sale_services.py
+
+import logging
+import threading
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.flash_sale import get_flash_sale_store
+from app.crud import product as product_crud
+from app.crud import sales as sales_crud
+from app.db.session import SessionLocal
+from app.models.product_model import Product
+from app.models.user_model import User
+from app.schemas.product_schema import FlashSaleStart
+from app.services.product_services import invalidate_product_pages
+
+logger = logging.getLogger("default")
+
+
+def _require_admin(current_user: User) -> None:
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to perform this action.",
+        )
+
+
+def _sale_response(product_id: int, sale) -> dict:
+    return {"product_id": product_id, "remaining": sale.remaining, "price": sale.price}
+
+
+def start_flash_sale(
+    db: Session, product_id: int, sale_in: FlashSaleStart, current_user: User
+) -> dict:
+    """
+    Puts a product on flash sale with `units` (default: all its stock) as
+    tokens. (Admin only)
+
+    Start a sale before the drop opens: a checkout already past its token
+    claim when the sale starts still takes its units from the database.
+    """
+    _require_admin(current_user)
+
+    # 1. Write back any earlier sale's claims, so the stock read below is exact.
+    reconcile_flash_sales()
+
+    # 2. Lock the row while the tokens are loaded from it.
+    product = (
+        db.query(Product).filter(Product.id == product_id).with_for_update().first()
+    )
+    if not product:
+        raise HTTPException(status_code=404, detail="Product not found")
+    units = product.stock if sale_in.units is None else sale_in.units
+    if units < 1 or units > product.stock:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A sale needs between 1 and {product.stock} units (the stock).",
+        )
+
+    # 3. Load the tokens. Orders are charged Product.price, as at checkout.
+    store = get_flash_sale_store()
+    started = store.start(product_id, units, product.price)
+    db.commit()
+    if not started:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="This product is already on flash sale.",
+        )
+    return _sale_response(product_id, store.sales([product_id])[product_id])
+
+
+def end_flash_sale(product_id: int, current_user: User) -> dict:
+    """
+    Takes a product off flash sale and writes its claims back to stock.
+    Unsold tokens simply lapse: they were never taken out of stock. (Admin only)
+    """
+    _require_admin(current_user)
+    store = get_flash_sale_store()
+    sale = store.sales([product_id]).get(product_id)
+    remaining = store.end(product_id)
+    if sale is None or remaining is None:
+        raise HTTPException(status_code=404, detail="No flash sale for this product.")
+    reconcile_flash_sales(prices={product_id: sale.price})
+    return _sale_response(product_id, sale._replace(remaining=remaining))
+
+
+def list_flash_sales(current_user: User) -> List[dict]:
+    """Every running sale. (Admin only)"""
+    _require_admin(current_user)
+    sales = get_flash_sale_store().sales()
+    return [_sale_response(product_id, sales[product_id]) for product_id in sorted(sales)]
+
+
+def get_flash_sale(product_id: int, quantity: int = 1) -> dict:
+    """
+    A product's running sale, read from the token store only (no database
+    round trip). Raises 404 if there is none, and 409 if fewer than
+    `quantity` units are left, so request handlers can turn away sold-out
+    buyers before doing anything else.
+    """
+    sale = get_flash_sale_store().sales([product_id]).get(product_id)
+    if sale is None:
+        raise HTTPException(status_code=404, detail="No flash sale for this product.")
+    if sale.remaining < quantity:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={
+                "message": "Sold out." if not sale.remaining else "Not enough stock left.",
+                "shortfalls": [
+                    {
+                        "product_id": product_id,
+                        "requested": quantity,
+                        "available": sale.remaining,
+                    }
+                ],
+            },
+        )
+    return _sale_response(product_id, sale)
+
+
+# --- Reconciliation ---
+
+
+def reconcile_flash_sales(prices: Optional[Dict[int, float]] = None) -> Dict[int, int]:
+    """
+    Subtracts the units claimed since the last run from Product.stock (in
+    one statement, with the product documents rebuilt) and adds them to the
+    sales counters, then evicts the cached pages showing those products.
+    Returns {product_id: units}. If the write fails, the tally is put back
+    for the next run.
+
+    Units are counted at the sale price, as of today (UTC). `prices` gives
+    it for sales that have already ended; failing that, the product's
+    current price is used.
+    """
+    store = get_flash_sale_store()
+    claimed = store.take_pending()
+    if not claimed:
+        return {}
+    prices = {
+        **{pid: sale.price for pid, sale in store.sales(claimed).items()},
+        **(prices or {}),
+    }
+    db = SessionLocal()
+    try:
+        product_crud.adjust_stock(db, {pid: -units for pid, units in claimed.items()})
+        unpriced = [pid for pid in claimed if pid not in prices]
+        if unpriced:
+            prices.update(
+                db.query(Product.id, Product.price).filter(Product.id.in_(unpriced)).all()
+            )
+        sales_crud.record_sales(
+            db,
+            sales_crud.order_day(None),
+            [(pid, units, prices.get(pid, 0.0)) for pid, units in claimed.items()],
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        store.restore_pending(claimed)
+        raise
+    finally:
+        db.close()
+    invalidate_product_pages(claimed)
+    return claimed
+
+
+class FlashSaleReconciler:
+    """Runs reconcile_flash_sales every `interval` seconds on a daemon thread."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="flash-sale-reconciler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops the thread, then writes back whatever is still pending."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._reconcile()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._reconcile()
+
+    def _reconcile(self) -> None:
+        try:
+            reconcile_flash_sales()
+        except Exception:
+            logger.exception("Flash sale stock write-back failed; will retry.")
+
+
+flash_sale_reconciler = FlashSaleReconciler(settings.FLASH_SALE_RECONCILE_INTERVAL)
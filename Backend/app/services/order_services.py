@@ -3,77 +3,364 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from app.schemas.order_schema import OrderUpdate
+from collections import defaultdict
+from datetime import datetime
+import json
 from app.crud import order as order_crud
-from app.crud import cart as cart_crud
+from app.crud import product as product_crud
+from app.crud import product_document as product_document_crud
+from app.crud import sales as sales_crud
+from app.crud import user as user_crud
+from app.schemas.user_schema import UserResponse
+from app.utils import pagination
+from app.utils.documents import embed_documents, json_list
+from app.services.product_services import invalidate_product_pages
+from app.services.flash_sale_services import get_flash_sale
+from app.core.flash_sale import get_flash_sale_store
 from app.models.user_model import User
 from app.models.order_model import Order
-from typing import List
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from pydantic_core import to_jsonable_python
 
 
-def create_order_from_cart(db: Session, current_user: User) -> Order:
+class OrderLine(NamedTuple):
+    """An order line not read from the cart (same fields as get_cart_lines rows)."""
+
+    product_id: int
+    quantity: int
+    price: float
+
+
+def create_order_from_cart(db: Session, current_user: User) -> str:
     """
-    The main business logic for creating an order from a user's cart.
-    This is a transactional operation.
+    The main business logic for creating an order from a user's cart, as
+    OrderResponse JSON. This is a transactional operation, and takes the same
+    few statements however many lines the cart has.
     """
-    # 1. Get all items from the user's cart.
-    cart_items = cart_crud.get_all_cart_items_for_user(db, user_id=current_user.id)
-    if not cart_items:
+    # 1. Get the cart lines with their products' current prices (one query).
+    lines = order_crud.get_cart_lines(db, user_id=current_user.id)
+    if not lines:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot create an order from an empty cart.",
         )
+    return _place_order(db, current_user, lines, clear_cart=True)
 
+
+def create_flash_sale_order(
+    db: Session, current_user: User, product_id: int, quantity: int
+) -> str:
+    """
+    Buys `quantity` units of a product on flash sale directly, bypassing the
+    cart, as OrderResponse JSON. The price comes from the token store, and
+    the product row isn't touched: its stock and sales counters are written
+    back later, in batches, by reconcile_flash_sales.
+    """
+    sale = get_flash_sale(product_id, quantity)
+    line = OrderLine(product_id, quantity, sale["price"])
+    return _place_order(db, current_user, [line], clear_cart=False)
+
+
+def _place_order(db: Session, current_user: User, lines, clear_cart: bool) -> str:
     # 2. Calculate the total amount of the order.
-    total_amount = sum(item.product.price * item.quantity for item in cart_items)
+    total_amount = sum(line.price * line.quantity for line in lines)
+    quantities = _quantities_by_product(
+        (line.product_id, line.quantity) for line in lines
+    )
 
     # --- TRANSACTION START ---
-    # Our get_db dependency handles the final commit or rollback.
 
-    # 3. Create the main Order record.
-    new_order = order_crud.create_order(
-        db, user=current_user, total_amount=total_amount
-    )
+    # 3. Reserve the stock for every line, all or nothing: flash-sale
+    # products from the token store (before any database write), the rest
+    # from their rows.
+    claimed = _reserve_or_reject(db, quantities)
+    try:
+        # 4. Create the main Order record (INSERT ... RETURNING).
+        order = order_crud.create_order(
+            db, user_id=current_user.id, total_amount=total_amount
+        )
 
-    # 4. Create an OrderItem for each item in the cart.
-    for item in cart_items:
-        order_crud.create_order_item(db, order=new_order, cart_item=item)
+        # 5. Create every OrderItem in one multi-row INSERT.
+        items = order_crud.create_order_items(db, order_id=order.id, lines=lines)
+
+        # 6. Count the sale towards the products' popularity. Units claimed
+        # from the token store are counted by the reconciler instead, so a
+        # flash-sale checkout takes no lock on the product's rows.
+        sales_crud.record_sales(
+            db,
+            sales_crud.order_day(order.order_date),
+            [
+                (line.product_id, line.quantity, line.price)
+                for line in lines
+                if line.product_id not in claimed
+            ],
+        )
 
-    # 5. Clear the user's cart.
-    order_crud.clear_user_cart(db, user_id=current_user.id)
+        # 7. Clear the user's cart.
+        if clear_cart:
+            order_crud.clear_user_cart(db, user_id=current_user.id)
 
-    # 6. Commit the transaction.
-    db.commit()
+        # 8. Commit the transaction.
+        db.commit()
+    except BaseException:
+        db.rollback()
+        get_flash_sale_store().release(claimed)
+        raise
 
     # --- TRANSACTION END ---
+    # Flash-sale products' pages are evicted when their stock is written back.
+    invalidate_product_pages(set(quantities) - set(claimed))
+
+    # 9. Build the response from what was just written, plus the product
+    # documents (one query).
+    documents = product_document_crud.get_product_documents(
+        db, [line.product_id for line in lines]
+    )
+    return _render_order(
+        _order_fields(order.id, total_amount, order.status, order.order_date, current_user),
+        [item._asdict() for item in items],
+        documents,
+    )
+
+
+def _quantities_by_product(lines) -> dict:
+    """{product_id: total units} over (product_id, quantity) lines."""
+    quantities = defaultdict(int)
+    for product_id, quantity in lines:
+        quantities[product_id] += quantity
+    return dict(quantities)
+
+
+def _reject(shortfalls: List[dict]) -> None:
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail={
+            "message": "Not enough stock for some items.",
+            "shortfalls": shortfalls,
+        },
+    )
+
+
+def _reserve_or_reject(db: Session, quantities: dict) -> Dict[int, int]:
+    """
+    Reserves stock, or rolls back and answers 409 with what is short.
+    Products on flash sale claim tokens; returns those claims, which the
+    caller must release if the transaction then fails.
+    """
+    store = get_flash_sale_store()
+    claimed, shortfalls = store.claim(quantities)
+    if shortfalls:
+        _reject(shortfalls)
+    try:
+        shortfalls = product_crud.reserve_stock(
+            db, {pid: units for pid, units in quantities.items() if pid not in claimed}
+        )
+    except BaseException:
+        # A database error (e.g. a lock timeout) must not strand the tokens.
+        db.rollback()
+        store.release(claimed)
+        raise
+    if shortfalls:
+        db.rollback()
+        store.release(claimed)
+        _reject(shortfalls)
+    return claimed
+
+
+def _release_stock(db: Session, quantities: dict) -> Dict[int, int]:
+    """
+    Puts stock back into the rows of products not on flash sale (does not
+    commit), and returns the units of those on sale, which the caller
+    releases to the token store once the transaction has committed.
+    """
+    on_sale = get_flash_sale_store().sales(quantities)
+    product_crud.release_stock(
+        db, {pid: units for pid, units in quantities.items() if pid not in on_sale}
+    )
+    return {pid: units for pid, units in quantities.items() if pid in on_sale}
+
+
+def _order_fields(order_id, total_amount, order_status, order_date, customer: User) -> dict:
+    return {
+        "id": order_id,
+        "total_amount": total_amount,
+        "status": order_status.value,
+        "order_date": to_jsonable_python(order_date),
+        "customer": UserResponse.model_validate(customer).model_dump(mode="json"),
+    }
 
-    return new_order
+
+def _render_order(fields: dict, items: List[dict], documents: Dict[int, str]) -> str:
+    """OrderResponse JSON with each item's product spliced in from its document."""
+    return embed_documents(
+        fields,
+        items=json_list(
+            embed_documents(
+                {
+                    "id": item["id"],
+                    "quantity": item["quantity"],
+                    "price_at_purchase": item["price_at_purchase"],
+                },
+                product=documents[item["product_id"]],
+            )
+            for item in items
+            if item["product_id"] in documents
+        ),
+    )
 
 
-def get_user_order_history(db: Session, current_user: User) -> List[Order]:
+def render_orders(db: Session, orders: List[Order]) -> List[str]:
     """
-    Service to get the order history for the current user.
+    Serializes orders as OrderResponse JSON. The orders must be loaded
+    without products; each item's product is spliced in from the product
+    document store, fetched for all the orders in one query.
+    """
+    documents = product_document_crud.get_product_documents(
+        db, [item.product_id for order in orders for item in order.items]
+    )
+    return [
+        _render_order(
+            _order_fields(
+                order.id, order.total_amount, order.status, order.order_date, order.customer
+            ),
+            [
+                {
+                    "id": item.id,
+                    "quantity": item.quantity,
+                    "price_at_purchase": item.price_at_purchase,
+                    "product_id": item.product_id,
+                }
+                for item in order.items
+            ],
+            documents,
+        )
+        for order in orders
+    ]
+
+
+def get_user_order_history(db: Session, current_user: User) -> str:
+    """
+    Service to get the order history for the current user, as JSON.
     """
-    # Simply calls the CRUD function to fetch the orders.
     # An empty list is a valid response if the user has no orders.
-    return order_crud.get_orders_by_user(db=db, user_id=current_user.id)
+    orders = order_crud.get_orders_by_user(
+        db=db, user_id=current_user.id, with_products=False
+    )
+    return json_list(render_orders(db, orders))
+
+
+def get_user_order_summaries(
+    db: Session, current_user: User, cursor: Optional[str] = None, limit: int = 20
+) -> str:
+    """
+    Service to get one page of the current user's order history as compact
+    OrderSummaryPage JSON: no customer, and only each item's product id,
+    name and first image. The page comes from a single projection query.
+    """
+    rows = order_crud.get_order_summary_rows(
+        db, current_user.id, after=_decode_order_cursor(cursor), limit=limit
+    )
+
+    # The rows are one per item, in page order; fold them into orders.
+    orders: Dict[int, dict] = {}
+    for row in rows:
+        order = orders.get(row.id)
+        if order is None:
+            order = orders[row.id] = {
+                "id": row.id,
+                "total_amount": row.total_amount,
+                "status": row.status.value,
+                "order_date": row.order_date,
+                "items": [],
+            }
+        if row.item_id is not None:
+            order["items"].append(
+                {
+                    "id": row.item_id,
+                    "product_id": row.product_id,
+                    "name": row.name,
+                    "image_url": row.image_url,
+                    "thumbnail_url": row.thumbnail_url,
+                    "quantity": row.quantity,
+                    "price_at_purchase": row.price_at_purchase,
+                }
+            )
+
+    page = list(orders.values())
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        next_cursor = _order_cursor(page[-1]["order_date"], page[-1]["id"])
+    return json.dumps(
+        to_jsonable_python({"items": page, "next_cursor": next_cursor}),
+        separators=(",", ":"),
+    )
 
 
-def get_all_orders_for_admin(db: Session, current_user: User) -> List[Order]:
-    """Service to get all orders. (Admin only)"""
+def get_all_orders_for_admin(
+    db: Session,
+    current_user: User,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    customer_email: Optional[str] = None,
+    **filters,
+) -> Tuple[str, Optional[str]]:
+    """
+    Service to get one page of orders, newest first, as JSON, plus the cursor
+    of the next page (None on the last one). (Admin only)
+    """
     if not current_user.is_admin:
         raise HTTPException(status_code=403, detail="Not authorized")
-    return order_crud.get_all_orders(db=db)
 
+    # 1. Decode the position the previous page ended at.
+    after = _decode_order_cursor(cursor)
+
+    # 2. A customer may be picked by email as well as by id.
+    if customer_email:
+        customer = user_crud.get_user_by_email(db, email=customer_email)
+        if customer is None or filters.get("user_id") not in (None, customer.id):
+            return "[]", None
+        filters["user_id"] = customer.id
+
+    # 3. Fetch the page (items and customers batch-loaded, products from the
+    # document store).
+    orders, has_more = order_crud.get_orders_keyset(
+        db, after=after, limit=limit, with_products=False, **filters
+    )
+    next_cursor = None
+    if has_more:
+        next_cursor = _order_cursor(orders[-1].order_date, orders[-1].id)
+    return json_list(render_orders(db, orders)), next_cursor
+
+
+def _decode_order_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+    """The (order_date, id) keyset in an order listing cursor (None for the first page)."""
+    if not cursor:
+        return None
+    try:
+        position = pagination.decode_cursor(cursor)
+        return position["order_date"], int(position["id"])
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor.",
+        )
+
+
+def _order_cursor(order_date: datetime, order_id: int) -> str:
+    """The cursor for the page after the order with this (order_date, id)."""
+    return pagination.encode_cursor({"order_date": order_date, "id": order_id})
 
-def get_order_by_id_for_admin(db: Session, order_id: int, current_user: User) -> Order:
-    """Service to get a single order by ID. (Admin only)"""
+
+def get_order_by_id_for_admin(db: Session, order_id: int, current_user: User) -> str:
+    """Service to get a single order by ID, as JSON. (Admin only)"""
     if not current_user.is_admin:
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    order = order_crud.get_order_by_id(db, order_id=order_id)
+    order = order_crud.get_order_by_id(db, order_id=order_id, with_products=False)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
-    return order
+    return render_orders(db, [order])[0]
 
 
 def update_order_status_for_admin(
@@ -87,10 +374,40 @@ def update_order_status_for_admin(
     if not order_to_update:
         raise HTTPException(status_code=404, detail="Order not found")
 
+    # Cancelling an order returns its stock and takes its items back out of
+    # the sales counters; reinstating one reserves the stock again (or fails
+    # with 409) and counts it again. All in the same transaction, except that
+    # units of products on flash sale go through the token store (and are
+    # counted when the reconciler writes them back).
+    was_cancelled = order_to_update.status.value == "cancelled"
+    is_cancelled = order_in.status.value == "cancelled"
+    quantities, claimed, returned = {}, {}, {}
+    if was_cancelled != is_cancelled:
+        quantities = _quantities_by_product(
+            (item.product_id, item.quantity) for item in order_to_update.items
+        )
+        if is_cancelled:
+            returned = _release_stock(db, quantities)
+        else:
+            claimed = _reserve_or_reject(db, quantities)
+        sales_crud.record_order_sales(
+            db,
+            order_to_update,
+            sign=-1 if is_cancelled else 1,
+            exclude=set(claimed) | set(returned),
+        )
+
     # We can reuse our generic user update logic from the User CRUD
     # or create a dedicated one for orders. For now, a direct update is fine.
     order_to_update.status = order_in.status
     db.add(order_to_update)
-    db.commit()
+    try:
+        db.commit()
+    except BaseException:
+        db.rollback()
+        get_flash_sale_store().release(claimed)
+        raise
+    get_flash_sale_store().release(returned)
+    invalidate_product_pages(set(quantities) - set(claimed) - set(returned))
     db.refresh(order_to_update)
     return order_to_update
@@ -0,0 +1,120 @@
+# app/services/product_export_services.py
+
+import csv
+import io
+from typing import Iterator
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.crud.loaders import product_relations
+from app.crud.product_document import render_product_document
+from app.db.session import SessionLocal
+from app.models.product_model import Product
+from app.models.user_model import User
+from app.services.product_import_services import LIST_SEPARATOR
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# Same columns as the bulk import accepts (plus id), so an export can be re-imported.
+CSV_COLUMNS = [
+    "id",
+    "name",
+    "description",
+    "price",
+    "discount_price",
+    "stock",
+    "brand",
+    "gender",
+    "status",
+    "category",
+    "sizes",
+    "colours",
+    "images",
+]
+
+
+def start_catalog_export(current_user: User, file_format: str) -> Iterator[str]:
+    """
+    Checks the request and returns the export stream for StreamingResponse.
+    Errors are raised here, before the response starts.
+    """
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to perform this action.",
+        )
+    if file_format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported export format '{file_format}'. Use 'ndjson' or 'csv'.",
+        )
+    return _stream_catalog(file_format, settings.PRODUCT_EXPORT_BATCH_SIZE)
+
+
+def _stream_catalog(file_format: str, batch_size: int) -> Iterator[str]:
+    """
+    Yields the whole catalog, one text chunk per `batch_size` products.
+
+    Products are read through a server-side cursor (yield_per), and each batch's
+    category, sizes, colours and images are loaded with one query per
+    relationship. Only one batch is held at a time, so memory stays flat
+    however large the catalog is. The stream uses its own session because
+    it outlives the request's.
+    """
+    db = SessionLocal()
+    try:
+        products = (
+            db.query(Product)
+            .options(*product_relations())
+            .order_by(Product.id)
+            .yield_per(batch_size)
+        )
+        if file_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(CSV_COLUMNS)
+            for count, product in enumerate(products, start=1):
+                writer.writerow(_csv_row(product))
+                if count % batch_size == 0:
+                    yield _drain(buffer)
+            yield _drain(buffer)
+        else:
+            lines = []
+            for product in products:
+                lines.append(render_product_document(product))
+                if len(lines) == batch_size:
+                    yield "\n".join(lines) + "\n"
+                    lines = []
+            if lines:
+                yield "\n".join(lines) + "\n"
+    finally:
+        db.close()
+
+
+def _drain(buffer: io.StringIO) -> str:
+    text = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return text
+
+
+def _csv_row(product: Product) -> list:
+    return [
+        product.id,
+        product.name,
+        product.description,
+        product.price,
+        product.discount_price if product.discount_price is not None else "",
+        product.stock,
+        product.brand or "",
+        product.gender.value,
+        product.status.value,
+        product.category.name if product.category else "",
+        LIST_SEPARATOR.join(size.name for size in product.sizes),
+        LIST_SEPARATOR.join(colour.name for colour in product.colours),
+        LIST_SEPARATOR.join(image.image_url for image in product.images),
+    ]
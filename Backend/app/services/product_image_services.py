@@ -0,0 +1,123 @@
+# app/services/product_image_services.py
+
+import os
+import shutil
+import uuid
+from typing import List
+
+from fastapi import HTTPException, UploadFile, status
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud import product as product_crud
+from app.models.product_model import Product
+from app.models.user_model import User
+from app.services.product_services import invalidate_product_caches
+from app.utils import images
+
+ALLOWED_EXTENSIONS = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/webp": ".webp",
+    "image/avif": ".avif",
+    "image/gif": ".gif",
+}
+
+
+def upload_product_images(
+    db: Session, product_id: int, uploads: List[UploadFile], current_user: User
+) -> Product:
+    """
+    Business logic for uploading product photos.
+
+    Originals are stored under MEDIA_ROOT/products/<product_id>/, their
+    thumbnail and responsive WebP/AVIF copies are rendered in the image
+    process pool, and one ProductImage per original records all the URLs.
+    """
+    # 1. Authorization check
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to perform this action.",
+        )
+
+    # 2. Validate the request before touching the disk.
+    product = product_crud.get_product(db, product_id=product_id)
+    if not product:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Product with ID {product_id} not found.",
+        )
+    if not images.is_available():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Image processing is not available on this server.",
+        )
+    if not uploads or len(uploads) > settings.IMAGE_UPLOAD_MAX_FILES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Upload between 1 and {settings.IMAGE_UPLOAD_MAX_FILES} images.",
+        )
+    for upload in uploads:
+        if upload.content_type not in ALLOWED_EXTENSIONS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"'{upload.filename}' is not a JPEG, PNG, WebP, AVIF or GIF image.",
+            )
+
+    # 3. Store the originals.
+    relative_dir = os.path.join("products", str(product_id))
+    output_dir = os.path.join(settings.MEDIA_ROOT, relative_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    originals = []
+    written = []
+    for upload in uploads:
+        stem = uuid.uuid4().hex
+        path = os.path.join(output_dir, stem + ALLOWED_EXTENSIONS[upload.content_type])
+        with open(path, "wb") as out:
+            shutil.copyfileobj(upload.file, out)
+        originals.append((path, output_dir, stem))
+        written.append(path)
+
+    # 4. Render every derivative in parallel; a file Pillow can't read fails
+    # the whole upload and nothing is kept.
+    try:
+        rendered = images.generate_derivatives(originals)
+    except Exception as e:
+        for path in written:
+            _remove_with_derivatives(path)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Could not process the images: {e.__class__.__name__}",
+        )
+
+    def url(file_name: str) -> str:
+        return "/".join([settings.MEDIA_URL.rstrip("/"), "products", str(product_id), file_name])
+
+    # 5. Record them and refresh everything that shows the product.
+    product = product_crud.add_product_images(
+        db,
+        db_obj=product,
+        images=[
+            {
+                "image_url": url(os.path.basename(path)),
+                "thumbnail_url": url(result["thumbnail"]) if result["thumbnail"] else None,
+                "variants": [
+                    {"width": v["width"], "format": v["format"], "url": url(v["file"])}
+                    for v in result["variants"]
+                ],
+            }
+            for (path, _, _), result in zip(originals, rendered)
+        ],
+    )
+    invalidate_product_caches([product.id], [product.category_id])
+    return product
+
+
+def _remove_with_derivatives(original_path: str) -> None:
+    """Deletes an original and any derivatives already written beside it."""
+    directory, file_name = os.path.split(original_path)
+    stem = os.path.splitext(file_name)[0]
+    for name in os.listdir(directory):
+        if name == file_name or name.startswith(stem + "-"):
+            os.remove(os.path.join(directory, name))
@@ -0,0 +1,212 @@
+# app/services/product_import_services.py
+
+import csv
+import io
+import json
+from itertools import islice
+from typing import Any, Dict, IO, Iterator, List, Optional, Tuple
+
+from fastapi import HTTPException, UploadFile, status
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.product_index import product_index
+from app.core.reference_data import reference_data
+from app.core.suggest_index import suggest_index
+from app.crud import product as product_crud
+from app.models.user_model import User
+from app.schemas.product_schema import ProductImportRow
+from app.services.product_services import invalidate_product_caches
+
+# CSV cells holding several values (sizes, colours, images) separate them with "|".
+LIST_SEPARATOR = "|"
+LIST_FIELDS = ("sizes", "colours", "images")
+
+
+def import_products(db: Session, upload: UploadFile, current_user: User) -> dict:
+    """
+    Business logic for the bulk product import.
+
+    The upload (CSV with a header row, or JSON Lines) is read as a stream and
+    handled PRODUCT_IMPORT_CHUNK_SIZE rows at a time: rows are validated,
+    their category/size/colour names resolved from maps loaded once up
+    front, and the valid ones inserted with one multi-row INSERT per table
+    and committed. Invalid rows are skipped and reported by line number.
+    """
+    # 1. Authorization check
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to perform this action.",
+        )
+
+    # 2. Pick a reader for the file type.
+    file_format = _detect_format(upload)
+    if file_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Upload a .csv or .jsonl file.",
+        )
+    text = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+    rows = _read_csv(text) if file_format == "csv" else _read_jsonl(text)
+
+    # 3. Name -> id maps for everything rows may refer to.
+    lookups = {
+        "category": _name_map(db, "categories"),
+        "sizes": _name_map(db, "sizes"),
+        "colours": _name_map(db, "colours"),
+    }
+
+    report = {"created": 0, "failed": 0, "errors": []}
+    category_ids = set()
+    while True:
+        chunk = list(islice(rows, settings.PRODUCT_IMPORT_CHUNK_SIZE))
+        if not chunk:
+            break
+
+        # 4. Validate and resolve the chunk.
+        valid: List[Tuple[int, Dict[str, Any]]] = []
+        for line_number, raw in chunk:
+            product, errors = _resolve_row(raw, lookups)
+            if errors:
+                report["failed"] += 1
+                report["errors"].append({"row": line_number, "errors": errors})
+            else:
+                valid.append((line_number, product))
+        if not valid:
+            continue
+
+        # 5. Insert the valid rows together; a database error fails the chunk.
+        try:
+            product_crud.bulk_create_products(db, [product for _, product in valid])
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            message = f"Chunk could not be saved: {e.__class__.__name__}"
+            report["failed"] += len(valid)
+            report["errors"].extend(
+                {"row": line_number, "errors": [message]} for line_number, _ in valid
+            )
+            continue
+        report["created"] += len(valid)
+        category_ids.update(product["category_id"] for _, product in valid)
+
+    # 6. New products change listings, facet counts and suggestions. The
+    # in-process indexes are rebuilt once rather than per product.
+    if report["created"]:
+        product_index.invalidate()
+        suggest_index.invalidate()
+        invalidate_product_caches([], category_ids)
+
+    report["errors"].sort(key=lambda error: error["row"])
+    return report
+
+
+def _detect_format(upload: UploadFile) -> Optional[str]:
+    filename = (upload.filename or "").lower()
+    content_type = (upload.content_type or "").lower()
+    if filename.endswith(".csv") or content_type == "text/csv":
+        return "csv"
+    if filename.endswith((".jsonl", ".ndjson")) or content_type in (
+        "application/jsonl",
+        "application/x-ndjson",
+    ):
+        return "jsonl"
+    return None
+
+
+def _read_csv(text: IO[str]) -> Iterator[Tuple[int, Any]]:
+    """Yields (line number, row) pairs; list cells are split on LIST_SEPARATOR."""
+    reader = csv.DictReader(text)
+    try:
+        for raw in reader:
+            row = {
+                key.strip(): value.strip()
+                for key, value in raw.items()
+                # Blank cells mean "not given"; extra cells have no header (None key).
+                if key is not None and isinstance(value, str) and value.strip()
+            }
+            for field in LIST_FIELDS:
+                if field in row:
+                    row[field] = [v.strip() for v in row[field].split(LIST_SEPARATOR) if v.strip()]
+            yield reader.line_num, row
+    except (csv.Error, UnicodeDecodeError) as e:
+        yield reader.line_num, ValueError(f"Unreadable CSV: {e}")
+
+
+def _read_jsonl(text: IO[str]) -> Iterator[Tuple[int, Any]]:
+    """Yields (line number, object) pairs, skipping blank lines."""
+    line_number = 0
+    try:
+        for line_number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, ValueError(f"Invalid JSON: {e.msg}")
+    except UnicodeDecodeError as e:
+        yield line_number + 1, ValueError(f"Unreadable file: {e}")
+
+
+def _name_map(db: Session, kind: str) -> Dict[str, int]:
+    return {row.name.lower(): row.id for row in reference_data.all(db, kind)}
+
+
+def _resolve_row(
+    raw: Any, lookups: Dict[str, Dict[str, int]]
+) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+    """
+    Validates one row and swaps its names for ids.
+    Returns (insertable product dict, []) or (None, list of error messages).
+    """
+    if isinstance(raw, ValueError):
+        return None, [str(raw)]
+    if not isinstance(raw, dict):
+        return None, ["Each line must be a JSON object."]
+
+    # JSON Lines may also give list fields as "a|b" strings.
+    for field in LIST_FIELDS:
+        if isinstance(raw.get(field), str):
+            raw[field] = [v.strip() for v in raw[field].split(LIST_SEPARATOR) if v.strip()]
+
+    try:
+        row = ProductImportRow.model_validate(raw)
+    except ValidationError as e:
+        return None, [
+            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+            for error in e.errors()
+        ]
+
+    errors = []
+    category_id = lookups["category"].get(row.category.strip().lower())
+    if category_id is None:
+        errors.append(f"category: unknown category '{row.category}'")
+
+    def resolve(field: str, names: List[str]) -> List[int]:
+        ids = []
+        for name in names:
+            found = lookups[field].get(name.strip().lower())
+            if found is None:
+                errors.append(f"{field}: unknown value '{name}'")
+            else:
+                ids.append(found)
+        return ids
+
+    size_ids = resolve("sizes", row.sizes)
+    colour_ids = resolve("colours", row.colours)
+    if errors:
+        return None, errors
+
+    product = row.model_dump(exclude={"category", "sizes", "colours", "images"})
+    product["gender"] = row.gender.value
+    product["status"] = row.status.value
+    product.update(
+        category_id=category_id,
+        size_ids=size_ids,
+        colour_ids=colour_ids,
+        image_urls=row.images,
+    )
+    return product, []
@@ -1,10 +1,26 @@
-from app.schemas.product_schema import ProductCreate, ProductUpdate, ProductStatus
+from app.schemas.product_schema import (
+    ProductCreate,
+    ProductUpdate,
+    ProductStatus,
+    ProductPageResponse,
+    ProductCursorPageResponse,
+    ProductBulkPatch,
+)
 from sqlalchemy.orm import Session
-from app.models.product_model import Product, Category, Size, Colour, ProductGender
+from app.models.product_model import Product, ProductGender
 from app.crud import product as product_crud
+from app.crud import product_document as product_document_crud
 from app.models.user_model import User
 from fastapi import HTTPException, status
-from typing import List, Optional
+from typing import Iterable, List, Optional
+from app.utils import pagination
+from app.utils.http_cache import make_etag
+from app.utils.documents import embed_documents, json_list
+from app.core.config import settings
+from app.core.product_index import product_index
+from app.core.reference_data import reference_data
+from app.core.suggest_index import suggest_index
+from app.core.cache import get_cache, make_cache_key
 
 
 def create_new_product(
@@ -20,10 +36,13 @@ def create_new_product(
         )
 
     try:
-        return product_crud.create_product(db=db, product_in=product_in)
+        product = product_crud.create_product(db=db, product_in=product_in)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
+    invalidate_product_caches([product.id], [product.category_id])
+    return product
+
 
 def update_existing_product(
     db: Session, product_id: int, product_in: ProductUpdate, current_user: User
@@ -48,25 +67,29 @@ def update_existing_product(
 
     # 3. Get the update data from the Pydantic model
     update_data = product_in.model_dump(exclude_unset=True)
+    previous_category_id = product_to_update.category_id
 
     # 4. Handle relationship updates (the complex part)
     if "category_id" in update_data:
-        category = (
-            db.query(Category).filter(Category.id == update_data["category_id"]).first()
-        )
-        if not category:
+        if reference_data.get(db, "categories", update_data["category_id"]) is None:
             raise HTTPException(status_code=404, detail="Category not found")
-        product_to_update.category = category
+        product_to_update.category = reference_data.attach(
+            db, "categories", [update_data["category_id"]]
+        )[0]
 
     if "size_ids" in update_data:
-        sizes = db.query(Size).filter(Size.id.in_(update_data["size_ids"])).all()
-        product_to_update.sizes = sizes
+        if reference_data.missing(db, "sizes", update_data["size_ids"]):
+            raise HTTPException(status_code=404, detail="One or more size IDs are invalid.")
+        product_to_update.sizes = reference_data.attach(db, "sizes", update_data["size_ids"])
 
     if "colour_ids" in update_data:
-        colours = (
-            db.query(Colour).filter(Colour.id.in_(update_data["colour_ids"])).all()
+        if reference_data.missing(db, "colours", update_data["colour_ids"]):
+            raise HTTPException(
+                status_code=404, detail="One or more colour IDs are invalid."
+            )
+        product_to_update.colours = reference_data.attach(
+            db, "colours", update_data["colour_ids"]
         )
-        product_to_update.colours = colours
 
     # 5. Call the simple CRUD function to update the basic fields
     # We pass the existing product object and the dictionary of simple fields
@@ -76,9 +99,67 @@ def update_existing_product(
         if k not in ["category_id", "size_ids", "colour_ids"]
     }
 
-    return product_crud.update_product(
+    product = product_crud.update_product(
         db=db, db_obj=product_to_update, obj_in=simple_update_data
     )
+    invalidate_product_caches([product.id], [previous_category_id, product.category_id])
+    return product
+
+
+def bulk_update_products(
+    db: Session, patches: List[ProductBulkPatch], current_user: User
+) -> dict:
+    """
+    Business logic for bulk price/stock/status changes: every patch is applied
+    in one transaction, and caches and indexes are refreshed once at the end.
+    """
+    # 1. Authorization check
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to perform this action.",
+        )
+    if len(patches) > settings.PRODUCT_BULK_UPDATE_MAX:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.PRODUCT_BULK_UPDATE_MAX} products per request.",
+        )
+
+    # 2. Merge patches per product (a later patch for the same id wins) and
+    # keep only the fields that were actually sent.
+    changes = {}
+    for patch in patches:
+        fields = patch.model_dump(exclude_unset=True, exclude={"id"})
+        if "status" in fields and fields["status"] is not None:
+            fields["status"] = ProductStatus(fields["status"]).value
+        changes.setdefault(patch.id, {}).update(fields)
+
+    # 3. One query tells us which products exist and which categories they're in.
+    existing = dict(
+        db.query(Product.id, Product.category_id).filter(Product.id.in_(changes))
+    )
+    not_found = sorted(product_id for product_id in changes if product_id not in existing)
+    updates = [
+        {"id": product_id, **fields}
+        for product_id, fields in changes.items()
+        if product_id in existing and fields
+    ]
+
+    # 4. Apply everything in a single transaction.
+    product_crud.bulk_update_products(db=db, patches=updates)
+    db.commit()
+
+    # 5. Refresh derived state once, not once per product.
+    if updates:
+        product_index.invalidate()
+        if any("status" in patch for patch in updates):
+            suggest_index.invalidate()
+        invalidate_product_caches(
+            [patch["id"] for patch in updates],
+            {existing[patch["id"]] for patch in updates},
+        )
+
+    return {"updated": len(updates), "not_found": not_found}
 
 
 def get_product_by_id(db: Session, product_id: int) -> Product:
@@ -93,6 +174,54 @@ def get_product_by_id(db: Session, product_id: int) -> Product:
     return product
 
 
+def get_product_document_by_id(db: Session, product_id: int) -> str:
+    """
+    Returns the product's stored ProductResponse JSON, so the detail page needs
+    neither the relationship joins nor a Pydantic round-trip.
+    """
+    document = product_document_crud.get_product_document(db, product_id)
+    if document is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No Product found for id {product_id}",
+        )
+    return document
+
+
+def get_product_documents_by_ids(db: Session, product_ids: List[int]) -> str:
+    """
+    Returns {"items": [...], "missing": [...]} as JSON for a set of product ids.
+    Items keep the request order (repeated ids appear once) and come from the
+    stored documents, so any number of ids costs the same few queries.
+    """
+    product_ids = list(dict.fromkeys(product_ids))
+    if len(product_ids) > settings.PRODUCT_BATCH_MAX:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.PRODUCT_BATCH_MAX} ids per request.",
+        )
+
+    documents = product_document_crud.get_product_documents(db, product_ids)
+    found = [documents[product_id] for product_id in product_ids if product_id in documents]
+    missing = [product_id for product_id in product_ids if product_id not in documents]
+    return embed_documents({"missing": missing}, items=json_list(found))
+
+
+def get_product_etag(db: Session, product_id: int) -> str:
+    """
+    Returns the product's current ETag, read from its timestamps only, so a
+    conditional request can be answered before the product is loaded.
+    """
+    version = product_crud.get_product_version(db=db, product_id=product_id)
+    if not version:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No Product found for id {product_id}",
+        )
+    updated_at, created_at = version
+    return make_etag("product", product_id, updated_at or created_at)
+
+
 def soft_delete_product_by_id(
     db: Session, product_id: int, current_user: User
 ) -> Product:
@@ -126,9 +255,11 @@ def soft_delete_product_by_id(
 
     # 5. Call our existing, simple update_product CRUD function!
     # This is perfect code reuse.
-    return product_crud.update_product(
+    product = product_crud.update_product(
         db=db, db_obj=product_to_delete, obj_in=update_data
     )
+    invalidate_product_caches([product.id], [product.category_id])
+    return product
 
 # def get_all_public_or_admin_products(
 #     db: Session, 
@@ -224,6 +355,9 @@ def get_all_public_or_admin_products(
     # current_user: Optional[User],  # This can be None for logged out users
     page: int, 
     limit: int,
+    cursor: Optional[str] = None,
+    approximate_count: bool = False,
+    fuzzy: bool = False,
     **filters: dict
 ) -> dict:
     """
@@ -256,7 +390,113 @@ def get_all_public_or_admin_products(
         except ValueError:
             raise HTTPException(status_code=400, detail=f"Invalid gender value: {gender_filter}")
 
+    # Serve repeated filter combinations from the catalog cache. Entries hold
+    # the serialized page, so a hit skips the database and the ORM entirely.
+    cache = get_cache()
+    cache_key = make_cache_key(
+        "products",
+        {
+            "mode": "cursor" if cursor is not None else "page",
+            "page": page,
+            "limit": limit,
+            "cursor": cursor,
+            "approximate_count": approximate_count,
+            "fuzzy": fuzzy,
+            **filters,
+        },
+    )
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    search = filters.get("search")
+    products_page, response = _get_products_page(
+        db, page, limit, cursor, approximate_count, filters
+    )
+
+    # "Did you mean": offer a corrected query when the search found nothing.
+    # The vocabulary only holds names, brands and categories (not every word
+    # the search matches), so a search is never corrected while it has results.
+    suggestion = None
+    if search and not products_page["items"]:
+        suggest_index.ensure_built(db)
+        suggestion = suggest_index.correct_query(search)
+        # Typo tolerance: in fuzzy mode, search the corrected query instead.
+        if suggestion and fuzzy:
+            products_page, response = _get_products_page(
+                db, page, limit, cursor, approximate_count, {**filters, "search": suggestion}
+            )
+    response.suggestion = suggestion
+
+    serialized = response.model_dump(mode="json")
+    cache.set(
+        cache_key,
+        serialized,
+        tags=_listing_cache_tags(
+            [product.id for product in products_page["items"]],
+            filters.get("category_ids"),
+        ),
+    )
+    return serialized
+
+
+def _get_products_page(
+    db: Session,
+    page: int,
+    limit: int,
+    cursor: Optional[str],
+    approximate_count: bool,
+    filters: dict,
+):
+    """Fetches one listing page in either mode, with its response model."""
+    if cursor is not None:
+        # Cursor mode: keyset pagination instead of OFFSET.
+        products_page = get_products_page_by_cursor(
+            db=db, cursor=cursor, limit=limit, **filters
+        )
+        return products_page, ProductCursorPageResponse.model_validate(products_page)
+    products_page = _get_products_page_by_offset(
+        db=db,
+        page=page,
+        limit=limit,
+        approximate_count=approximate_count,
+        **filters
+    )
+    return products_page, ProductPageResponse.model_validate(products_page)
+
+
+def _get_products_page_by_offset(
+    db: Session, page: int, limit: int, approximate_count: bool = False, **filters
+) -> dict:
+    """Fetches one page-numbered listing page (from the index or SQL)."""
     skip = (page - 1) * limit
+
+    # Facet-only listings can be answered from the in-process bitmap index;
+    # only the ids on the requested page are then loaded from the database.
+    # (The index has no sales counters, so best-seller sorts go to SQL.)
+    if (
+        settings.PRODUCT_FILTER_INDEX
+        and not filters.get("search")
+        and filters.get("sort_by") != "popular"
+    ):
+        # An empty `?search=` still arrives as a key; the index has no text search.
+        index_filters = {k: v for k, v in filters.items() if k != "search"}
+        product_index.ensure_built(db)
+        ids, total = product_index.find(skip=skip, limit=limit, **index_filters)
+        products = product_crud.get_products_by_ids(db=db, product_ids=ids)
+        return {"items": products, "total": total}
+
+    # For very large result sets an exact total is often not worth its cost.
+    # Small result sets are still counted exactly (the window count is cheap there).
+    if approximate_count:
+        # The estimate only depends on what is filtered, not on the ordering.
+        count_filters = {k: v for k, v in filters.items() if k != "sort_by"}
+        estimate = product_crud.estimate_product_count(db=db, **count_filters)
+        if estimate is not None and estimate >= settings.APPROXIMATE_COUNT_THRESHOLD:
+            products, _ = product_crud.get_all_products(
+                db=db, skip=skip, limit=limit, count_total=False, **filters
+            )
+            return {"items": products, "total": estimate, "total_is_estimate": True}
     
     products, total = product_crud.get_all_products(
         db=db, 
@@ -266,4 +506,175 @@ def get_all_public_or_admin_products(
         **filters
     )
 
-    return {"items": products, "total": total}
\ No newline at end of file
+    return {"items": products, "total": total}
+
+
+def get_products_page_by_cursor(
+    db: Session, cursor: str, limit: int, **filters
+) -> dict:
+    """
+    Service logic for keyset ("cursor") pagination of the catalog.
+
+    An empty cursor starts from the first page. Each response carries an
+    opaque next_cursor/prev_cursor that encodes the sort key, the boundary
+    row's sort value and its id, so every page costs the same regardless
+    of how deep into the catalog it is.
+    """
+    sort_by = product_crud.resolve_product_sort(filters.pop("sort_by", None))
+
+    after = None
+    backwards = False
+    if cursor:
+        try:
+            position = pagination.decode_cursor(cursor)
+            after = (position["value"], int(position["id"]))
+            backwards = position.get("direction") == "prev"
+        except (ValueError, KeyError, TypeError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor.",
+            )
+        if position.get("sort") != sort_by:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor does not match the requested sort order.",
+            )
+
+    products, has_more = product_crud.get_products_keyset(
+        db=db,
+        sort_by=sort_by,
+        after=after,
+        backwards=backwards,
+        limit=limit,
+        **filters
+    )
+
+    def make_cursor(product: Product, direction: str) -> str:
+        return pagination.encode_cursor(
+            {
+                "sort": sort_by,
+                "value": product_crud.get_product_sort_value(product, sort_by),
+                "id": product.id,
+                "direction": direction,
+            }
+        )
+
+    next_cursor = None
+    prev_cursor = None
+    if products:
+        # Moving forward, a previous page exists whenever we started from a cursor.
+        # Moving backward, a next page always exists (the one we came from).
+        if has_more or backwards:
+            next_cursor = make_cursor(products[-1], "next")
+        if (cursor and not backwards) or (backwards and has_more):
+            prev_cursor = make_cursor(products[0], "prev")
+
+    return {"items": products, "next_cursor": next_cursor, "prev_cursor": prev_cursor}
+
+
+def get_product_facets(db: Session, **filters) -> dict:
+    """
+    Service logic for the filter sidebar counts.
+    Accepts the same filters as the product listing.
+    """
+    gender_filter = filters.get("gender")
+    if gender_filter:
+        try:
+            filters["gender"] = ProductGender(gender_filter.lower())
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid gender value: {gender_filter}")
+
+    cache = get_cache()
+    cache_key = make_cache_key("facets", filters)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    edges = product_crud.PRICE_BUCKET_EDGES
+    if settings.PRODUCT_FILTER_INDEX and not filters.get("search"):
+        # An empty `?search=` still arrives as a key; the index has no text search.
+        index_filters = {k: v for k, v in filters.items() if k != "search"}
+        product_index.ensure_built(db)
+        counts = product_index.facet_counts(price_edges=edges, **index_filters)
+    else:
+        counts = product_crud.get_product_facet_counts(db=db, **filters)
+
+    facets = {
+        "genders": [
+            {"value": value, "count": count}
+            for value, count in sorted(counts["gender"].items())
+        ],
+        "categories": [
+            {"id": value, "count": count}
+            for value, count in sorted(counts["category_id"].items())
+        ],
+        "sizes": [
+            {"id": value, "count": count}
+            for value, count in sorted(counts["size_id"].items())
+        ],
+        "colours": [
+            {"id": value, "count": count}
+            for value, count in sorted(counts["colour_id"].items())
+        ],
+        "price_ranges": [
+            {
+                "min_price": edges[bucket],
+                "max_price": edges[bucket + 1] if bucket + 1 < len(edges) else None,
+                "count": count,
+            }
+            for bucket, count in sorted(counts["price"].items())
+        ],
+    }
+    # Facet counts depend on every product, so any product write evicts them.
+    cache.set(cache_key, facets, tags=["facets"])
+    return facets
+
+
+def get_product_suggestions(db: Session, query: str, limit: int) -> List[dict]:
+    """
+    Typeahead suggestions for the search box, answered from the in-process
+    suggest index (no query per keystroke once it is built).
+    """
+    limit = max(1, min(limit, settings.SUGGEST_MAX_LIMIT))
+    suggest_index.ensure_built(db)
+    return suggest_index.suggest(query, limit=limit)
+
+
+# --- Catalog cache tagging ---
+# Cached listings are tagged with every product on the page and with the
+# categories they are filtered to ("category:*" when unfiltered). A product
+# write therefore evicts only listings that show it or that it could enter.
+
+
+def _listing_cache_tags(
+    product_ids: Iterable[int], category_ids: Optional[List[int]]
+) -> List[str]:
+    tags = [f"product:{product_id}" for product_id in product_ids]
+    if category_ids:
+        tags.extend(f"category:{category_id}" for category_id in category_ids)
+    else:
+        tags.append("category:*")
+    return tags
+
+
+def invalidate_product_pages(product_ids: Iterable[int]) -> None:
+    """
+    Evicts the cached listing pages showing these products, for changes (such
+    as stock) that don't move products between listings or facet counts.
+    """
+    get_cache().invalidate_tags({f"product:{product_id}" for product_id in product_ids})
+
+
+def invalidate_product_caches(
+    product_ids: Iterable[int], category_ids: Iterable[Optional[int]]
+) -> None:
+    """
+    Evicts every cached listing and facet count that a write to the given
+    products (in the given categories, before and after the write) can affect.
+    """
+    tags = {"facets", "category:*"}
+    tags.update(f"product:{product_id}" for product_id in product_ids)
+    tags.update(
+        f"category:{category_id}" for category_id in category_ids if category_id is not None
+    )
+    get_cache().invalidate_tags(tags)
@@ -8,6 +8,9 @@ from app.models.product_model import Size
 from app.schemas.product_schema import SizeCreate
 from app.models.user_model import User
 from app.crud import size as size_crud
+from app.core.reference_data import reference_data
+from app.services.product_services import invalidate_product_caches
+from app.utils.http_cache import make_etag
 
 
 def create_new_size(db: Session, current_user: User, size_in: SizeCreate) -> Size:
@@ -18,7 +21,7 @@ def create_new_size(db: Session, current_user: User, size_in: SizeCreate) -> Siz
             detail="Not authorized to perform this action.",
         )
 
-    existing_size = db.query(Size).filter(Size.name == size_in.name).first()
+    existing_size = reference_data.find(db, "sizes", name=size_in.name)
     if existing_size:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -44,9 +47,16 @@ def delete_size_by_id(db: Session, current_user: User, size_id: int) -> None:
             status_code=status.HTTP_404_NOT_FOUND, detail="Size not found"
         )
 
-    return size_crud.delete_size(db=db, db_obj=size_to_delete)
+    product_ids = size_crud.delete_size(db=db, db_obj=size_to_delete)
+    # Evict the listings and facet counts that showed the size.
+    invalidate_product_caches(product_ids, [])
 
 
 def get_all_sizes(db: Session) -> List[Size]:
-    """Service to get all sizes."""
-    return size_crud.get_all_sizes(db=db)
+    """Service to get all sizes, served from the in-process reference data."""
+    return reference_data.all(db, "sizes")
+
+
+def get_sizes_etag(db: Session) -> str:
+    """ETag for the size list; changes with the reference data version."""
+    return make_etag("sizes", reference_data.version(db))
@@ -1,7 +1,6 @@
 # app/services/wishlist_service.py
 
 from sqlalchemy.orm import Session
-from typing import List
 from fastapi import HTTPException, status
 
 from app.models.wishlist_model import WishlistItem
@@ -9,6 +8,8 @@ from app.schemas.wishlist_schema import WishlistItemCreate
 from app.models.user_model import User
 from app.crud import wishlist as wishlist_crud
 from app.crud import product as product_crud # We need this to check if product exists
+from app.crud import product_document as product_document_crud
+from app.utils.documents import embed_documents, json_list
 
 def add_item_to_wishlist(
     db: Session, wishlist_in: WishlistItemCreate, current_user: User
@@ -55,6 +56,19 @@ def delete_item_from_wishlist(
 
     return wishlist_crud.delete_wishlist_item(db=db, db_obj=item_to_delete)
 
-def get_user_wishlist(db: Session, current_user: User) -> List[WishlistItem]:
-    """Service to get all of a user's wishlist items."""
-    return wishlist_crud.get_all_wishlist_items_for_user(db=db, user_id=current_user.id)
+def get_user_wishlist(db: Session, current_user: User) -> str:
+    """
+    Service to get all of a user's wishlist items, as WishlistItemResponse
+    JSON built from the product document store.
+    """
+    items = wishlist_crud.get_all_wishlist_items_for_user(
+        db=db, user_id=current_user.id, with_products=False
+    )
+    documents = product_document_crud.get_product_documents(
+        db, [item.product_id for item in items]
+    )
+    return json_list(
+        embed_documents({"id": item.id}, product=documents[item.product_id])
+        for item in items
+        if item.product_id in documents
+    )
@@ -0,0 +1,29 @@
+import json
+from typing import Any, Dict, Iterable, Optional
+from fastapi import Response
+
+
+def embed_documents(obj: Dict[str, Any], **documents: str) -> str:
+    """
+    Serializes `obj` with already-serialized JSON documents spliced in as
+    extra keys, so stored product documents are never parsed or re-validated.
+    """
+    fields = [json.dumps(obj, separators=(",", ":"))[1:-1]] if obj else []
+    fields += [f"{json.dumps(key)}:{document}" for key, document in documents.items()]
+    return "{" + ",".join(fields) + "}"
+
+
+def json_list(documents: Iterable[str]) -> str:
+    return "[" + ",".join(documents) + "]"
+
+
+def json_response(
+    content: str, status_code: int = 200, headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """Returns pre-serialized JSON as-is, skipping response_model validation."""
+    return Response(
+        content=content,
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
@@ -0,0 +1,41 @@
+import hashlib
+from typing import Optional
+from fastapi import Request, Response, status
+
+
+def make_etag(*parts) -> str:
+    """
+    Builds a strong ETag from the values that identify a resource version.
+    """
+    digest = hashlib.sha1(":".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:24]}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """
+    Checks the request's If-None-Match header against the current ETag.
+    (If-None-Match uses weak comparison, so a W/ prefix is ignored.)
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates
+
+
+def not_modified_response(etag: str, cache_control: Optional[str] = None) -> Response:
+    """A bodyless 304 response carrying the validators the client should keep."""
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_cache_headers(response, etag=etag, cache_control=cache_control)
+    return response
+
+
+def set_cache_headers(
+    response: Response, etag: Optional[str] = None, cache_control: Optional[str] = None
+) -> None:
+    if etag:
+        response.headers["ETag"] = etag
+    if cache_control:
+        response.headers["Cache-Control"] = cache_control
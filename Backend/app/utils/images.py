@@ -0,0 +1,160 @@
+# app/utils/images.py
+
+"""
+Derivative images for product photos.
+
+Each uploaded original gets a square thumbnail and a set of responsive
+widths, encoded as WebP and AVIF. Encoding (AVIF above all) is CPU-bound,
+so it runs in a process pool with one task per (image, format). That keeps
+every core busy even for a single upload, and never blocks the API
+process's GIL.
+
+Pillow is an optional dependency: it's imported inside the worker function,
+and is_available() lets callers refuse uploads cleanly without it.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait
+from typing import List, Optional, Sequence
+
+from app.core.config import settings
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+QUALITY = {"webp": 80, "avif": 60}
+
+
+def is_available() -> bool:
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def supported_formats() -> List[str]:
+    """The configured IMAGE_FORMATS this Pillow build can encode."""
+    from PIL import features
+
+    return [fmt for fmt in settings.IMAGE_FORMATS if features.check(fmt)]
+
+
+def get_image_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # "spawn": forking a process that runs request threads can
+            # copy a held lock into the child.
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.IMAGE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def shutdown_image_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+            _pool = None
+
+
+def render_derivatives(
+    original_path: str,
+    output_dir: str,
+    stem: str,
+    image_format: str,
+    widths: Sequence[int],
+    thumbnail_size: Optional[int] = None,
+) -> dict:
+    """
+    Worker-process task: writes `stem-<width>.<format>` for each width below
+    the original's (the original's own width if it is smaller than all of
+    them), plus `stem-thumb.<format>` when thumbnail_size is given.
+    Returns {"variants": [{"width", "format", "file"}], "thumbnail": file or None},
+    with file names relative to output_dir.
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(original_path) as opened:
+        # Apply the camera's orientation, and normalise palette/CMYK/etc.
+        # modes to RGB, keeping transparency where there is any.
+        image = ImageOps.exif_transpose(opened)
+        if image.mode not in ("RGB", "RGBA"):
+            has_alpha = image.mode in ("LA", "PA") or "transparency" in image.info
+            image = image.convert("RGBA" if has_alpha else "RGB")
+
+        targets = sorted({width for width in widths if width < image.width})
+        if not targets:
+            targets = [image.width]
+
+        variants = []
+        for width in targets:
+            height = max(1, round(image.height * width / image.width))
+            file_name = f"{stem}-{width}.{image_format}"
+            image.resize((width, height), Image.Resampling.LANCZOS).save(
+                os.path.join(output_dir, file_name), quality=QUALITY.get(image_format, 80)
+            )
+            variants.append({"width": width, "format": image_format, "file": file_name})
+
+        thumbnail = None
+        if thumbnail_size:
+            thumbnail = f"{stem}-thumb.{image_format}"
+            ImageOps.fit(
+                image, (thumbnail_size, thumbnail_size), Image.Resampling.LANCZOS
+            ).save(
+                os.path.join(output_dir, thumbnail), quality=QUALITY.get(image_format, 80)
+            )
+
+    return {"variants": variants, "thumbnail": thumbnail}
+
+
+def generate_derivatives(originals: Sequence[tuple]) -> List[dict]:
+    """
+    Renders every (original path, output dir, stem) in parallel.
+    Returns one {"variants": [...], "thumbnail": file} per original, in order.
+    The thumbnail is in the first supported format. Raises whatever a worker
+    raised (e.g. PIL.UnidentifiedImageError for a file that isn't an image),
+    but only once no other task is still running, so the caller can clean up
+    the output without a worker writing into it afterwards.
+    """
+    formats = supported_formats()
+    pool = get_image_pool()
+    futures = [
+        [
+            pool.submit(
+                render_derivatives,
+                path,
+                output_dir,
+                stem,
+                image_format,
+                settings.IMAGE_VARIANT_WIDTHS,
+                settings.IMAGE_THUMBNAIL_SIZE if index == 0 else None,
+            )
+            for index, image_format in enumerate(formats)
+        ]
+        for path, output_dir, stem in originals
+    ]
+
+    results = []
+    try:
+        for per_format in futures:
+            rendered = [future.result() for future in per_format]
+            results.append(
+                {
+                    "variants": [v for result in rendered for v in result["variants"]],
+                    "thumbnail": rendered[0]["thumbnail"] if rendered else None,
+                }
+            )
+    except BaseException:
+        # Drop the tasks that haven't started and let the running ones finish.
+        flat = [future for per_format in futures for future in per_format]
+        for future in flat:
+            future.cancel()
+        wait(flat)
+        raise
+    return results
@@ -0,0 +1,41 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict
+
+
+def encode_cursor(payload: Dict[str, Any]) -> str:
+    """
+    Encodes a keyset position into an opaque, URL-safe cursor string.
+    Datetimes are stored as ISO strings and restored by decode_cursor.
+    """
+    data = {
+        key: ({"__dt__": value.isoformat()} if isinstance(value, datetime) else value)
+        for key, value in payload.items()
+    }
+    raw = json.dumps(data, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """
+    Decodes a cursor produced by encode_cursor.
+    Raises ValueError if the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid pagination cursor.") from e
+
+    if not isinstance(data, dict):
+        raise ValueError("Invalid pagination cursor.")
+
+    return {
+        key: (
+            datetime.fromisoformat(value["__dt__"])
+            if isinstance(value, dict) and "__dt__" in value
+            else value
+        )
+        for key, value in data.items()
+    }
@@ -0,0 +1,196 @@
+# benchmarks/bench_product_filters.py
+"""
+Compares the two size/colour filtering strategies for the product listing:
+
+- "join+distinct": the previous implementation, which joined Product.sizes and
+  Product.colours and de-duplicated full product rows with DISTINCT (plus a
+  separate DISTINCT count).
+- "semi-join": the current crud.product.get_all_products, which filters with
+  EXISTS against product_sizes / product_colours and returns the total in
+  the same round trip as the page.
+
+Both sides do the same work per call: count the matches, fetch one page and
+batch-load the page's relationships, so the timings differ only by the
+filtering strategy.
+
+Usage (from the Backend directory):
+
+    python -m benchmarks.bench_product_filters [--products 100000] [--url URL]
+
+Without --url a throwaway SQLite database is created in a temp directory.
+Pointing --url at an empty Postgres database gives production-like numbers;
+the tables are created (and dropped afterwards) by the script, which refuses
+to run against a database that already has tables.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, insert, inspect  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.db.base import Base  # noqa: E402
+from app.models.product_model import (  # noqa: E402
+    Category,
+    Colour,
+    Product,
+    ProductGender,
+    ProductStatus,
+    Size,
+    product_colours_table,
+    product_sizes_table,
+)
+from app.crud import product as product_crud  # noqa: E402
+from app.crud.loaders import product_relations  # noqa: E402
+
+CASES = {
+    "size": {"size_ids": [2]},
+    "colour": {"colour_ids": [1, 3]},
+    "size+colour": {"size_ids": [1, 2, 3], "colour_ids": [1, 2]},
+    "size+colour+category": {"size_ids": [2, 4], "colour_ids": [3], "category_ids": [1, 2]},
+    "size+colour+price": {"size_ids": [1, 5], "colour_ids": [2, 4], "min_price": 100, "max_price": 400},
+}
+
+
+def seed(engine, count: int) -> None:
+    random.seed(42)
+    with engine.begin() as conn:
+        conn.execute(insert(Category), [{"id": i, "name": f"Category {i}"} for i in range(1, 9)])
+        conn.execute(insert(Size), [{"id": i, "name": f"S{i}"} for i in range(1, 7)])
+        conn.execute(
+            insert(Colour),
+            [{"id": i, "name": f"Colour {i}", "hex_code": "#000000"} for i in range(1, 9)],
+        )
+        batch = 5000
+        for start in range(1, count + 1, batch):
+            ids = range(start, min(start + batch, count + 1))
+            conn.execute(
+                insert(Product),
+                [
+                    {
+                        "id": i,
+                        "name": f"Product {i}",
+                        # Wide rows are what made DISTINCT expensive.
+                        "description": "Premium heavyweight cotton. " * 20,
+                        "price": round(random.uniform(10, 900), 2),
+                        "stock": 10,
+                        "brand": random.choice(["Nike", "Adidas", "Gucci", "Prada"]),
+                        "gender": random.choice(list(ProductGender)),
+                        "status": ProductStatus.active,
+                        "category_id": random.randint(1, 8),
+                    }
+                    for i in ids
+                ],
+            )
+            conn.execute(
+                insert(product_sizes_table),
+                [
+                    {"product_id": i, "size_id": size_id}
+                    for i in ids
+                    for size_id in random.sample(range(1, 7), 3)
+                ],
+            )
+            conn.execute(
+                insert(product_colours_table),
+                [
+                    {"product_id": i, "colour_id": colour_id}
+                    for i in ids
+                    for colour_id in random.sample(range(1, 9), 2)
+                ],
+            )
+
+
+def join_distinct_listing(db: Session, *, skip=0, limit=20, **filters):
+    """
+    The pre-semi-join implementation, kept here only for comparison. It loads
+    the page's relationships the way get_all_products does.
+    """
+    query = db.query(Product)
+    if filters.get("min_price") is not None:
+        query = query.filter(Product.price >= filters["min_price"])
+    if filters.get("max_price") is not None:
+        query = query.filter(Product.price <= filters["max_price"])
+    if filters.get("category_ids"):
+        query = query.filter(Product.category_id.in_(filters["category_ids"]))
+    if filters.get("size_ids"):
+        query = query.join(Product.sizes).filter(Size.id.in_(filters["size_ids"]))
+    if filters.get("colour_ids"):
+        query = query.join(Product.colours).filter(Colour.id.in_(filters["colour_ids"]))
+    total = query.distinct().count()
+    items = (
+        query.order_by(Product.created_at.desc(), Product.id.desc())
+        .distinct()
+        .options(*product_relations())
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+    return items, total
+
+
+def semi_join_listing(db: Session, *, skip=0, limit=20, **filters):
+    return product_crud.get_all_products(db=db, skip=skip, limit=limit, **filters)
+
+
+def timed(engine, fn, filters, repeat: int) -> tuple:
+    samples = []
+    result = None
+    for _ in range(repeat):
+        with Session(engine) as db:
+            start = time.perf_counter()
+            items, total = fn(db, skip=40, limit=20, **filters)
+            samples.append((time.perf_counter() - start) * 1000)
+            result = ([p.id for p in items], total)
+    return statistics.median(samples), result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--products", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--url", default=None)
+    args = parser.parse_args()
+
+    tmpdir = None
+    url = args.url
+    if url is None:
+        tmpdir = tempfile.TemporaryDirectory()
+        url = f"sqlite:///{tmpdir.name}/bench.db"
+
+    engine = create_engine(url)
+    # Everything is dropped afterwards, so never touch a database in use.
+    existing = inspect(engine).get_table_names()
+    if existing:
+        engine.dispose()
+        raise SystemExit(
+            f"Refusing to run against {engine.url!r}: it already has tables "
+            f"({', '.join(sorted(existing))}). Pass an empty database with --url."
+        )
+    Base.metadata.create_all(engine)
+    try:
+        print(f"Seeding {args.products} products on {engine.dialect.name}...")
+        seed(engine, args.products)
+
+        print(f"{'case':<24}{'join+distinct ms':>18}{'semi-join ms':>15}{'speedup':>10}")
+        for name, filters in CASES.items():
+            old_ms, old_result = timed(engine, join_distinct_listing, filters, args.repeat)
+            new_ms, new_result = timed(engine, semi_join_listing, filters, args.repeat)
+            assert old_result == new_result, f"strategies disagree for {name}"
+            print(f"{name:<24}{old_ms:>18.1f}{new_ms:>15.1f}{old_ms / new_ms:>9.1f}x")
+    finally:
+        Base.metadata.drop_all(engine)
+        engine.dispose()
+        if tmpdir is not None:
+            tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
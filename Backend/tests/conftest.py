@@ -0,0 +1,148 @@
+# tests/conftest.py
+
+"""
+Shared fixtures. Every test runs against a fresh SQLite database (the same
+schema create_all builds, FTS5 table included) seeded by init_db, and with
+the in-process caches and indexes emptied.
+
+Run from the Backend directory: `python -m pytest -q`.
+"""
+
+import os
+import sys
+import tempfile
+
+_TMP = tempfile.mkdtemp(prefix="backend-tests-")
+# Settings are read at import time, so these must be set before `app` is imported.
+os.environ["DATABASE_URL"] = f"sqlite:///{_TMP}/test.db"
+os.environ["MEDIA_ROOT"] = os.path.join(_TMP, "media")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app.core import flash_sale  # noqa: E402
+from app.core.cache import get_cache  # noqa: E402
+from app.core.product_index import product_index  # noqa: E402
+from app.core.reference_data import reference_data  # noqa: E402
+from app.core.suggest_index import suggest_index  # noqa: E402
+from app.db.__init__db import FIRST_SUPERUSER_EMAIL, FIRST_SUPERUSER_PASSWORD, init_db  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+class QueryCounter:
+    """
+    Counts the SQL statements sent through the app's engine while active.
+    `executemany` lists those sent with several parameter sets, which some
+    drivers (psycopg2 for UPDATE and DELETE) send as one round trip per set.
+    """
+
+    def __init__(self):
+        self.statements = []
+        self.executemany = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+        if executemany:
+            self.executemany.append(statement)
+
+    def __enter__(self):
+        event.listen(engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(engine, "before_cursor_execute", self._record)
+
+
+@pytest.fixture(autouse=True)
+def database():
+    """A freshly created and seeded database, and empty in-process state."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        init_db(db)
+    get_cache().clear()
+    reference_data.invalidate()
+    product_index.invalidate()
+    suggest_index.invalidate()
+    flash_sale._store = None
+    yield
+    engine.dispose()
+
+
+@pytest.fixture
+def db():
+    with SessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture
+def admin_headers(client):
+    response = client.post(
+        "/api/v1/auth/token",
+        data={"username": FIRST_SUPERUSER_EMAIL, "password": FIRST_SUPERUSER_PASSWORD},
+    )
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def make_products(client, admin_headers):
+    """Creates `count` products through the API and returns their ids."""
+
+    def make(count: int, stock: int = 1000, **overrides):
+        ids = []
+        for i in range(count):
+            payload = {
+                "name": f"Product {i} {'Hoodie' if i % 2 else 'Sneaker'}",
+                "description": f"Item number {i} in cotton",
+                "price": float(10 + (i * 7) % 90),
+                "stock": stock,
+                "brand": ["Nike", "Adidas", "Gucci"][i % 3],
+                "gender": ["men", "women", "unisex"][i % 3],
+                "category_id": 1 + i % 5,
+                "size_ids": [1 + i % 5, 1 + (i + 1) % 5],
+                "colour_ids": [1 + i % 4],
+                "images": [{"image_url": f"http://img.test/{i}.jpg"}],
+                **overrides,
+            }
+            response = client.post("/api/v1/product/create", headers=admin_headers, json=payload)
+            assert response.status_code == 201, response.text
+            ids.append(response.json()["id"])
+        return ids
+
+    return make
+
+
+@pytest.fixture
+def place_order(client, admin_headers):
+    """Fills the admin's cart with {product_id: quantity} and checks it out."""
+
+    def place(quantities: dict):
+        for product_id, quantity in quantities.items():
+            response = client.post(
+                "/api/v1/cart/items",
+                headers=admin_headers,
+                json={"product_id": product_id, "size_id": 1, "colour_id": 1, "quantity": quantity},
+            )
+            assert response.status_code == 201, response.text
+        return client.post("/api/v1/order/", headers=admin_headers)
+
+    return place
+
+
+@pytest.fixture
+def count_queries():
+    return QueryCounter
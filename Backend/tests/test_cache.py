@@ -0,0 +1,25 @@
+# tests/test_cache.py
+
+import pytest
+
+from app.core.cache import CacheBackend, MemoryCache
+
+
+def test_a_backend_must_implement_the_whole_interface():
+    class GetOnlyCache(CacheBackend):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        GetOnlyCache()
+
+
+def test_invalidating_a_tag_drops_only_its_entries():
+    cache = MemoryCache(max_entries=10, ttl=60)
+    cache.set("list", [1, 2], tags=["products"])
+    cache.set("facets", {"sizes": []}, tags=["facets"])
+
+    cache.invalidate_tags(["products"])
+
+    assert cache.get("list") is None
+    assert cache.get("facets") == {"sizes": []}
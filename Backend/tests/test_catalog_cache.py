@@ -0,0 +1,28 @@
+# tests/test_catalog_cache.py
+
+import pytest
+
+
+@pytest.mark.parametrize(
+    "kind, param, facet, facet_id",
+    [
+        ("category", "category_ids", "categories", 2),
+        ("size", "size_ids", "sizes", 3),
+        ("colour", "colour_ids", "colours", 2),
+    ],
+)
+def test_deleting_a_facet_value_evicts_the_cached_catalog(
+    client, admin_headers, make_products, kind, param, facet, facet_id
+):
+    make_products(10)
+    # Fill the cache.
+    assert client.get("/api/v1/product/", params={param: [facet_id]}).json()["total"] > 0
+    facets = client.get("/api/v1/product/facets").json()
+    assert facet_id in [entry["id"] for entry in facets[facet]]
+
+    response = client.delete(f"/api/v1/{kind}/{facet_id}", headers=admin_headers)
+    assert response.status_code == 200, response.text
+
+    assert client.get("/api/v1/product/", params={param: [facet_id]}).json()["total"] == 0
+    facets = client.get("/api/v1/product/facets").json()
+    assert facet_id not in [entry["id"] for entry in facets[facet]]
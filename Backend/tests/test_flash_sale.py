@@ -0,0 +1,86 @@
+# tests/test_flash_sale.py
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.core.flash_sale import FlashSaleStore, MemoryFlashSaleStore, get_flash_sale_store
+from app.crud import product as product_crud
+from app.models.product_model import Product
+from app.models.sales_model import ProductSales
+from app.services.flash_sale_services import reconcile_flash_sales
+
+
+def test_a_store_must_implement_the_whole_interface():
+    class StartOnlyStore(FlashSaleStore):
+        def start(self, product_id, units, price):
+            return True
+
+    with pytest.raises(TypeError):
+        StartOnlyStore()
+
+
+def test_claims_are_all_or_nothing():
+    store = MemoryFlashSaleStore()
+    store.start(1, units=5, price=9.0)
+    store.start(2, units=1, price=4.0)
+
+    claimed, shortfalls = store.claim({1: 2, 2: 3})
+
+    assert claimed == {}
+    assert shortfalls == [{"product_id": 2, "requested": 3, "available": 1}]
+    assert store.sales()[1].remaining == 5
+    assert store.take_pending() == {}
+
+
+def test_flash_sale_order_leaves_the_product_row_to_the_reconciler(
+    client, admin_headers, make_products, count_queries, db
+):
+    product_id = make_products(1, stock=50)[0]
+    response = client.put(
+        f"/api/v1/product/{product_id}/flash-sale", headers=admin_headers, json={"units": 10}
+    )
+    assert response.status_code == 200, response.text
+
+    with count_queries() as counter:
+        response = client.post(
+            f"/api/v1/order/flash-sale/{product_id}", headers=admin_headers, params={"quantity": 3}
+        )
+    assert response.status_code == 201, response.text
+    assert get_flash_sale_store().sales([product_id])[product_id].remaining == 7
+    writes = [
+        statement
+        for statement in counter.statements
+        if statement.lstrip().upper().startswith(("UPDATE", "INSERT", "DELETE"))
+    ]
+    assert not [s for s in writes if "products" in s or "product_sales" in s], writes
+
+    assert reconcile_flash_sales() == {product_id: 3}
+
+    product = db.get(Product, product_id)
+    sales = db.get(ProductSales, product_id)
+    assert (product.stock, product.popularity) == (47, 3)
+    assert (sales.units_total, sales.revenue_total) == (3, 30.0)
+
+
+def test_tokens_are_released_when_reserving_the_other_lines_fails(
+    client, admin_headers, make_products, monkeypatch
+):
+    on_sale, regular = make_products(2, stock=20)
+    client.put(f"/api/v1/product/{on_sale}/flash-sale", headers=admin_headers, json={"units": 5})
+    for product_id in (on_sale, regular):
+        response = client.post(
+            "/api/v1/cart/items",
+            headers=admin_headers,
+            json={"product_id": product_id, "size_id": 1, "colour_id": 1, "quantity": 2},
+        )
+        assert response.status_code == 201, response.text
+
+    def lock_timeout(db, quantities):
+        raise OperationalError("SELECT ... FOR UPDATE", {}, Exception("lock timeout"))
+
+    monkeypatch.setattr(product_crud, "reserve_stock", lock_timeout)
+    with pytest.raises(OperationalError):
+        client.post("/api/v1/order/", headers=admin_headers)
+
+    assert get_flash_sale_store().sales([on_sale])[on_sale].remaining == 5
+    assert get_flash_sale_store().take_pending() == {}
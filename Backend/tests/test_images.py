@@ -0,0 +1,43 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.utils import images
+
+
+def test_failed_render_waits_for_running_tasks_and_cancels_the_rest(monkeypatch):
+    """Nothing may still be writing derivatives once the caller sees the error."""
+    started = []
+    finished = []
+    release = threading.Event()
+
+    def render(path, output_dir, stem, image_format, widths, thumbnail_size=None):
+        started.append(path)
+        if path == "bad":
+            release.wait(5)
+            raise ValueError("not an image")
+        release.set()
+        time.sleep(0.2)
+        finished.append(path)
+        return {"variants": [], "thumbnail": None}
+
+    pool = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(images, "supported_formats", lambda: ["webp"])
+    monkeypatch.setattr(images, "get_image_pool", lambda: pool)
+    monkeypatch.setattr(images, "render_derivatives", render)
+
+    originals = [("bad", "out", "a"), ("slow", "out", "b")] + [
+        (f"queued-{i}", "out", f"c{i}") for i in range(5)
+    ]
+    try:
+        with pytest.raises(ValueError):
+            images.generate_derivatives(originals)
+        # Every task that had started had finished by then...
+        assert "slow" in finished
+        assert sorted(finished) == sorted(path for path in started if path != "bad")
+    finally:
+        pool.shutdown(wait=True)
+    # ...and the queued ones were dropped rather than run.
+    assert len(started) < len(originals)
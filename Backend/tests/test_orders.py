@@ -0,0 +1,114 @@
+# tests/test_orders.py
+
+import pytest
+
+
+@pytest.fixture
+def place_orders(make_products, place_order):
+    """Places `count` single-item orders as the admin and returns their ids."""
+    product_ids = make_products(3)
+
+    def place(count: int):
+        ids = []
+        for n in range(count):
+            response = place_order({product_ids[n % 3]: 1})
+            assert response.status_code == 201, response.text
+            ids.append(response.json()["id"])
+        return ids
+
+    return place
+
+
+def test_admin_listing_pages_through_every_order_once(client, admin_headers, place_orders):
+    ids = place_orders(5)
+    seen = []
+    params = {"limit": 2}
+
+    for _ in range(len(ids)):
+        response = client.get("/api/v1/order/admin/", headers=admin_headers, params=params)
+        assert response.status_code == 200, response.text
+        seen.extend(order["id"] for order in response.json())
+        next_cursor = response.headers.get("X-Next-Cursor")
+        if not next_cursor:
+            break
+        params["cursor"] = next_cursor
+
+    assert next_cursor is None
+    assert seen == sorted(ids, reverse=True)
+
+
+def test_order_summaries_page_through_every_order_once(client, admin_headers, place_orders):
+    ids = place_orders(7)
+    seen = []
+    params = {"limit": 3}
+
+    for _ in range(len(ids)):
+        response = client.get("/api/v1/order/me/summary", headers=admin_headers, params=params)
+        assert response.status_code == 200, response.text
+        page = response.json()
+        seen.extend(order["id"] for order in page["items"])
+        if not page["next_cursor"]:
+            break
+        params["cursor"] = page["next_cursor"]
+
+    assert page["next_cursor"] is None
+    assert seen == sorted(ids, reverse=True)
+
+
+def stock_of(client, product_ids):
+    return [client.get(f"/api/v1/product/{product_id}").json()["stock"] for product_id in product_ids]
+
+
+def test_checkout_reserves_the_stock_of_every_line(client, make_products, place_order):
+    ids = make_products(2, stock=10)
+
+    response = place_order({ids[0]: 3, ids[1]: 10})
+
+    assert response.status_code == 201, response.text
+    assert stock_of(client, ids) == [7, 0]
+
+
+def test_short_checkout_reports_every_short_line_and_reserves_nothing(
+    client, admin_headers, make_products, place_order
+):
+    plenty = make_products(1, stock=10)[0]
+    few, fewer = make_products(2, stock=2)
+
+    response = place_order({fewer: 3, plenty: 4, few: 5})
+
+    assert response.status_code == 409
+    assert response.json()["detail"]["shortfalls"] == [
+        {"product_id": few, "requested": 5, "available": 2},
+        {"product_id": fewer, "requested": 3, "available": 2},
+    ]
+    assert stock_of(client, [plenty, few, fewer]) == [10, 2, 2]
+    assert client.get("/api/v1/order/me", headers=admin_headers).json() == []
+
+
+def test_cancelling_returns_stock_and_reinstating_reserves_it_again(
+    client, admin_headers, make_products, place_order
+):
+    product_id = make_products(1, stock=5)[0]
+    order_id = place_order({product_id: 4}).json()["id"]
+
+    def set_status(value):
+        return client.patch(
+            f"/api/v1/order/admin/{order_id}", headers=admin_headers, json={"status": value}
+        )
+
+    assert set_status("cancelled").status_code == 200
+    assert stock_of(client, [product_id]) == [5]
+    assert set_status("processing").status_code == 200
+    assert stock_of(client, [product_id]) == [1]
+
+    # Once the stock has been sold to someone else, reinstating is refused.
+    assert set_status("cancelled").status_code == 200
+    assert place_order({product_id: 3}).status_code == 201
+    response = set_status("processing")
+    assert response.status_code == 409
+    assert response.json()["detail"]["shortfalls"] == [
+        {"product_id": product_id, "requested": 4, "available": 2}
+    ]
+    assert stock_of(client, [product_id]) == [2]
+    order = client.get(f"/api/v1/order/admin/{order_id}", headers=admin_headers).json()
+    assert order["status"] == "cancelled"
@@ -0,0 +1,32 @@
+# tests/test_product_bulk_update.py
+
+import pytest
+
+
+@pytest.mark.parametrize("field", ["price", "stock", "status"])
+def test_null_is_rejected_for_required_columns(client, admin_headers, make_products, field):
+    product_id = make_products(1)[0]
+
+    response = client.patch(
+        "/api/v1/product/bulk", headers=admin_headers, json=[{"id": product_id, field: None}]
+    )
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"][-1] == field
+
+
+def test_omitted_fields_and_null_discount_are_accepted(client, admin_headers, make_products):
+    product_id = make_products(1, discount_price=5.0)[0]
+
+    response = client.patch(
+        "/api/v1/product/bulk",
+        headers=admin_headers,
+        json=[{"id": product_id, "stock": 3, "discount_price": None}],
+    )
+
+    assert response.status_code == 200, response.text
+    assert response.json() == {"updated": 1, "not_found": []}
+    product = client.get(f"/api/v1/product/{product_id}").json()
+    assert product["stock"] == 3
+    assert product["discount_price"] is None
+    assert product["price"] == 10.0
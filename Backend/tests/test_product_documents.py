@@ -0,0 +1,54 @@
+# tests/test_product_documents.py
+
+import json
+
+from app.crud import product_document as product_document_crud
+from app.models.product_model import ProductDocument
+
+
+def drop_document(db, product_id):
+    product_document_crud.delete_product_documents(db, [product_id])
+    db.commit()
+
+
+def test_a_missing_document_is_backfilled_without_committing_the_reader(db, make_products, monkeypatch):
+    product_id = make_products(1)[0]
+    drop_document(db, product_id)
+
+    def no_commit():
+        raise AssertionError("a read must not commit the caller's session")
+
+    monkeypatch.setattr(db, "commit", no_commit)
+    documents = product_document_crud.get_product_documents(db, [product_id, 999])
+
+    assert list(documents) == [product_id]
+    assert json.loads(documents[product_id])["id"] == product_id
+    assert db.get(ProductDocument, product_id).document == documents[product_id]
+
+
+def test_backfilling_a_document_someone_else_just_wrote_is_harmless(client, db, make_products):
+    product_id = make_products(1)[0]
+    drop_document(db, product_id)
+
+    # Two readers that both saw the document missing write it in turn.
+    first = product_document_crud._backfill_product_documents(db, [product_id])
+    second = product_document_crud._backfill_product_documents(db, [product_id])
+
+    assert first == second
+    response = client.get(f"/api/v1/product/{product_id}")
+    assert response.status_code == 200
+    assert response.json()["id"] == product_id
+
+
+def test_batch_keeps_request_order_and_lists_missing_ids_once(client, make_products):
+    first, second, third = make_products(3)
+
+    response = client.get(
+        "/api/v1/product/batch", params={"ids": [third, 999, first, third, 998, 999]}
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["id"] for item in body["items"]] == [third, first]
+    assert body["missing"] == [999, 998]
+    assert second not in [item["id"] for item in body["items"]]
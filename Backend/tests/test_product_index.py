@@ -0,0 +1,55 @@
+# tests/test_product_index.py
+
+import pytest
+
+from app.core.cache import get_cache
+from app.core.config import settings
+from app.core.product_index import product_index
+
+
+def listing(client, **params):
+    get_cache().clear()
+    response = client.get("/api/v1/product/", params=params)
+    assert response.status_code == 200, response.text
+    body = response.json()
+    return [item["id"] for item in body["items"]], body["total"]
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {},
+        {"page": 3, "limit": 4},
+        {"sort_by": "price-low", "page": 2, "limit": 5},
+        {"sort_by": "price-high", "min_price": 20, "max_price": 70},
+        {"category_ids": [1, 3], "page": 2, "limit": 3},
+        {"size_ids": [2], "colour_ids": [1, 2], "sort_by": "price-low"},
+        {"min_price": 30, "limit": 4},
+        {"category_ids": [2], "page": 9},
+    ],
+)
+def test_index_answers_like_sql(client, make_products, monkeypatch, params):
+    make_products(30)
+    expected = listing(client, **params)
+
+    monkeypatch.setattr(settings, "PRODUCT_FILTER_INDEX", True)
+    assert listing(client, **params) == expected
+
+
+@pytest.mark.parametrize(
+    "kind, param, facet_id",
+    [("category", "category_ids", 2), ("size", "size_ids", 3), ("colour", "colour_ids", 2)],
+)
+def test_deleted_values_leave_the_index(
+    client, admin_headers, make_products, monkeypatch, kind, param, facet_id
+):
+    make_products(10)
+    monkeypatch.setattr(settings, "PRODUCT_FILTER_INDEX", True)
+    assert listing(client, **{param: [facet_id]})[1] > 0
+    assert product_index.is_built
+
+    response = client.delete(f"/api/v1/{kind}/{facet_id}", headers=admin_headers)
+    assert response.status_code == 200, response.text
+
+    assert product_index.is_built
+    assert listing(client, **{param: [facet_id]}) == ([], 0)
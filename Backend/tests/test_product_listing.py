@@ -0,0 +1,146 @@
+# tests/test_product_listing.py
+
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from app.core.config import settings
+from app.crud import product as product_crud
+from app.crud import search as search_crud
+
+
+class PostgresPlanner:
+    """
+    Stands in for a Postgres session inside estimate_product_count: queries
+    are built on the real session, and EXPLAIN is answered with a canned plan.
+    """
+
+    def __init__(self, db, plan_rows: int):
+        self._db = db
+        self.plan_rows = plan_rows
+        self.explained = []
+
+    def query(self, *entities):
+        return self._db.query(*entities)
+
+    def get_bind(self):
+        return SimpleNamespace(dialect=postgresql.dialect())
+
+    def connection(self):
+        return self
+
+    def exec_driver_sql(self, statement, parameters):
+        self.explained.append(statement)
+        plan = [{"Plan": {"Plan Rows": self.plan_rows}}]
+        return SimpleNamespace(scalar=lambda: plan)
+
+
+def test_approximate_count_uses_the_planner_estimate(client, make_products, monkeypatch):
+    make_products(3)
+    estimate = product_crud.estimate_product_count
+    planners = []
+
+    def estimate_on_postgres(db, **filters):
+        planners.append(PostgresPlanner(db, settings.APPROXIMATE_COUNT_THRESHOLD * 5))
+        return estimate(planners[-1], **filters)
+
+    monkeypatch.setattr(product_crud, "estimate_product_count", estimate_on_postgres)
+
+    response = client.get(
+        "/api/v1/product/",
+        params={"approximate_count": True, "sort_by": "price-low", "min_price": 5},
+    )
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["total"] == settings.APPROXIMATE_COUNT_THRESHOLD * 5
+    assert body["total_is_estimate"] is True
+    assert len(body["items"]) == 3
+    assert planners[0].explained[0].startswith("EXPLAIN (FORMAT JSON) SELECT")
+
+
+def test_approximate_count_is_none_off_postgres(db, make_products):
+    make_products(2)
+    assert product_crud.estimate_product_count(db, min_price=5) is None
+
+
+def make_leather_goods(make_products):
+    make_products(3, description="Soft leather upper")
+    make_products(1, name="Feather Cap", description="Light and warm")
+
+
+def test_fuzzy_search_keeps_words_that_match(client, make_products):
+    make_leather_goods(make_products)
+
+    plain = client.get("/api/v1/product/", params={"search": "leather"}).json()
+    fuzzy = client.get("/api/v1/product/", params={"search": "leather", "fuzzy": True}).json()
+
+    assert plain["total"] == fuzzy["total"] == 3
+    assert fuzzy["suggestion"] is None
+
+
+def test_fuzzy_search_corrects_a_search_that_found_nothing(client, make_products):
+    make_leather_goods(make_products)
+
+    plain = client.get("/api/v1/product/", params={"search": "feathr"}).json()
+    fuzzy = client.get("/api/v1/product/", params={"search": "feathr", "fuzzy": True}).json()
+
+    assert plain["total"] == 0 and plain["suggestion"] == "feather"
+    assert fuzzy["suggestion"] == "feather"
+    assert [item["name"] for item in fuzzy["items"]] == ["Feather Cap"]
+
+
+def test_filter_index_ignores_an_empty_search(client, make_products, monkeypatch):
+    make_products(4)
+    monkeypatch.setattr(settings, "PRODUCT_FILTER_INDEX", True)
+
+    response = client.get("/api/v1/product/", params={"search": "", "category_ids": [1, 2]})
+
+    assert response.status_code == 200, response.text
+    assert response.json()["total"] == 2
+
+
+def test_filter_index_facets_ignore_an_empty_search(client, make_products, monkeypatch):
+    make_products(4)
+    monkeypatch.setattr(settings, "PRODUCT_FILTER_INDEX", True)
+
+    response = client.get("/api/v1/product/facets", params={"search": ""})
+
+    assert response.status_code == 200, response.text
+    assert sum(item["count"] for item in response.json()["categories"]) == 4
+
+
+def test_cursor_paging_by_newest_visits_every_product_once(client, make_products):
+    ids = make_products(7)
+    seen = []
+    params = {"cursor": "", "limit": 2}
+
+    for _ in range(len(ids)):
+        page = client.get("/api/v1/product/", params=params).json()
+        seen.extend(item["id"] for item in page["items"])
+        if not page["next_cursor"]:
+            break
+        params["cursor"] = page["next_cursor"]
+
+    assert page["next_cursor"] is None
+    assert sorted(seen) == sorted(ids) and len(seen) == len(ids)
+
+
+def search(client, term):
+    response = client.get("/api/v1/product/", params={"search": term})
+    assert response.status_code == 200, response.text
+    return response.json()["total"]
+
+
+def test_search_without_words_matches_nothing(client, make_products):
+    make_products(3)
+    assert search(client, "!!!") == 0
+    assert search(client, "cotton") == 3
+
+
+def test_search_matches_word_prefixes_on_every_backend(client, make_products):
+    make_leather_goods(make_products)
+    assert search(client, "leath") == 3
+    assert search(client, "leath upp") == 3
+    assert search(client, "leath warm") == 0
+    assert search_crud._tsquery(search_crud._search_words("Leath, up_per!")) == "Leath:* & up:* & per:*"
@@ -0,0 +1,107 @@
+# tests/test_query_counts.py
+
+"""
+The read paths batch-load their relationships (app/crud/loaders.py), so the
+number of statements per request must not grow with the number of rows.
+"""
+
+import pytest
+
+from app.core.cache import get_cache
+
+
+def statements_for(client, count_queries, *args, **kwargs) -> int:
+    # Catalog pages are cached; measure the database path every time.
+    get_cache().clear()
+    with count_queries() as counter:
+        response = client.get(*args, **kwargs)
+    assert response.status_code == 200, response.text
+    return counter.count
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {},
+        {"sort_by": "price-low"},
+        {"search": "hoodie"},
+        {"cursor": ""},
+        {"size_ids": [1, 2], "colour_ids": [1]},
+    ],
+)
+def test_product_listing_is_flat(client, make_products, count_queries, params):
+    make_products(24)
+    small = statements_for(client, count_queries, "/api/v1/product/", params={**params, "limit": 2})
+    large = statements_for(client, count_queries, "/api/v1/product/", params={**params, "limit": 20})
+    assert 0 < small == large
+
+
+def add_to_cart(client, headers, product_ids):
+    for product_id in product_ids:
+        response = client.post(
+            "/api/v1/cart/items",
+            headers=headers,
+            json={"product_id": product_id, "size_id": 1, "colour_id": 1, "quantity": 1},
+        )
+        assert response.status_code == 201, response.text
+
+
+def test_cart_is_flat(client, admin_headers, make_products, count_queries):
+    ids = make_products(10)
+    add_to_cart(client, admin_headers, ids[:2])
+    small = statements_for(client, count_queries, "/api/v1/cart/", headers=admin_headers)
+    add_to_cart(client, admin_headers, ids[2:])
+    large = statements_for(client, count_queries, "/api/v1/cart/", headers=admin_headers)
+    assert 0 < small == large
+
+
+def test_wishlist_is_flat(client, admin_headers, make_products, count_queries):
+    ids = make_products(10)
+
+    def add(product_ids):
+        for product_id in product_ids:
+            response = client.post(
+                "/api/v1/wishlist/", headers=admin_headers, json={"product_id": product_id}
+            )
+            assert response.status_code == 201, response.text
+
+    add(ids[:2])
+    small = statements_for(client, count_queries, "/api/v1/wishlist/", headers=admin_headers)
+    add(ids[2:])
+    large = statements_for(client, count_queries, "/api/v1/wishlist/", headers=admin_headers)
+    assert 0 < small == large
+
+
+@pytest.mark.parametrize("path", ["/api/v1/order/me", "/api/v1/order/admin/", "/api/v1/order/me/summary"])
+def test_order_reads_are_flat(client, admin_headers, make_products, count_queries, path):
+    ids = make_products(6)
+
+    def place_orders(count):
+        for n in range(count):
+            add_to_cart(client, admin_headers, ids[n % 3 : n % 3 + 3])
+            response = client.post("/api/v1/order/", headers=admin_headers)
+            assert response.status_code == 201, response.text
+
+    place_orders(1)
+    small = statements_for(client, count_queries, path, headers=admin_headers)
+    place_orders(5)
+    large = statements_for(client, count_queries, path, headers=admin_headers)
+    assert 0 < small == large
+
+
+def test_checkout_is_flat(client, admin_headers, make_products, count_queries):
+    ids = make_products(100)
+    counts = []
+    for size in (1, 10, 100):
+        add_to_cart(client, admin_headers, ids[:size])
+        with count_queries() as counter:
+            response = client.post("/api/v1/order/", headers=admin_headers)
+        assert response.status_code == 201, response.text
+        # psycopg2 sends an executemany UPDATE/DELETE as one round trip per row.
+        assert not [
+            statement
+            for statement in counter.executemany
+            if not statement.lstrip().upper().startswith("INSERT")
+        ], counter.executemany
+        counts.append(counter.count)
+    assert 0 < counts[0] == counts[1] == counts[2]
@@ -0,0 +1,89 @@
+# tests/test_query_plans.py
+
+"""
+Every catalog listing sort must be answered from an index.
+
+For each sort_by branch (and a few common filter combinations) the SQL sent
+by crud.product.get_all_products and crud.product.get_products_keyset is
+checked with EXPLAIN QUERY PLAN: the plan may neither sort the products rows
+itself nor read them with a full scan instead of walking a listing index.
+"""
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session
+
+from app.crud import product as product_crud
+from app.db.base import Base
+from app.models.product_model import ProductGender, ProductStatus
+from benchmarks.bench_product_filters import seed
+
+CASES = [
+    ("created_at", {}),
+    ("price-low", {}),
+    ("price-high", {}),
+    ("created_at", {"status": ProductStatus.active}),
+    ("price-low", {"status": ProductStatus.active}),
+    ("popular", {}),
+    ("popular", {"status": ProductStatus.active}),
+    ("created_at", {"status": ProductStatus.active, "gender": ProductGender.women}),
+    ("price-low", {"category_ids": [3]}),
+    ("price-high", {"category_ids": [3], "min_price": 100, "max_price": 400}),
+]
+
+QUERIES = {
+    # The page query, with its exact total.
+    "offset": lambda db, sort_by, filters: product_crud.get_all_products(
+        db=db, sort_by=sort_by, skip=40, limit=20, **filters
+    ),
+    # Cursor pagination (and approximate_count) fetch no total.
+    "keyset": lambda db, sort_by, filters: product_crud.get_products_keyset(
+        db=db, sort_by=sort_by, limit=20, **filters
+    ),
+}
+
+
+@pytest.fixture(scope="module")
+def catalog_engine(tmp_path_factory):
+    """A separate, analyzed SQLite catalog big enough for the planner to prefer indexes."""
+    engine = create_engine(f"sqlite:///{tmp_path_factory.mktemp('plans')}/catalog.db")
+    Base.metadata.create_all(engine)
+    seed(engine, 5000)
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+    yield engine
+    engine.dispose()
+
+
+def first_statement(engine, run):
+    """Runs run() and returns the first (statement, parameters) it executed."""
+    captured = []
+
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        run()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    return captured[0]
+
+
+@pytest.mark.parametrize("mode", QUERIES)
+@pytest.mark.parametrize("sort_by, filters", CASES)
+def test_listing_is_read_in_index_order(catalog_engine, mode, sort_by, filters):
+    with Session(catalog_engine) as db:
+        statement, parameters = first_statement(
+            catalog_engine, lambda: QUERIES[mode](db, sort_by, filters)
+        )
+    with catalog_engine.connect() as conn:
+        plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+
+    details = [row[-1] for row in plan]
+    assert not [
+        detail
+        for detail in details
+        if "TEMP B-TREE FOR ORDER BY" in detail
+        or detail.strip() in ("SCAN products", "SCAN TABLE products")
+    ], details
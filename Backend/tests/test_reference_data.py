@@ -0,0 +1,38 @@
+# tests/test_reference_data.py
+
+from app.core import reference_data as reference_data_module
+from app.core.cache import NullCache
+from app.core.reference_data import ReferenceData, reference_data
+from app.models.product_model import Category, Colour
+
+
+def add_behind_its_back(db, row):
+    """Commits a row the way another worker would without a shared cache: unannounced."""
+    db.add(row)
+    db.commit()
+    return row.id
+
+
+def test_unknown_ids_are_looked_up_before_being_rejected(db, make_products):
+    reference_data.all(db, "categories")
+    category_id = add_behind_its_back(db, Category(name="Outerwear"))
+    colour_id = add_behind_its_back(db, Colour(name="Teal", hex_code="#008080"))
+
+    assert reference_data.get(db, "categories", category_id).name == "Outerwear"
+    assert reference_data.missing(db, "colours", [1, colour_id, 999]) == [999]
+    make_products(1, category_id=category_id, colour_ids=[colour_id])
+
+
+def test_version_is_the_same_in_every_worker(db, monkeypatch):
+    # Without a shared cache there is no common token to fall back on.
+    monkeypatch.setattr(reference_data_module, "get_cache", NullCache)
+    first, second = ReferenceData(), ReferenceData()
+    before = first.version(db)
+    assert before == second.version(db)
+
+    add_behind_its_back(db, Category(name="Outerwear"))
+    first.invalidate()
+
+    after = first.version(db)
+    assert after != before
+    assert after == ReferenceData().version(db)
@@ -0,0 +1,117 @@
+# tests/test_sales.py
+
+from datetime import timedelta
+
+from sqlalchemy import event, select
+
+from app.crud import sales as sales_crud
+from app.db.session import engine
+from app.models.product_model import Product
+from app.models.sales_model import ProductSales, ProductSalesDay
+
+
+def counters(db, product_id):
+    db.expire_all()
+    sales = db.get(ProductSales, product_id)
+    return {
+        "popularity": db.get(Product, product_id).popularity,
+        "units_7d": sales.units_7d,
+        "units_30d": sales.units_30d,
+        "units_total": sales.units_total,
+        "revenue_total": sales.revenue_total,
+    }
+
+
+def test_orders_are_counted_and_sort_popular_follows_them(client, db, make_products, place_order):
+    ids = make_products(3)
+    assert place_order({ids[0]: 1, ids[2]: 4}).status_code == 201
+    assert place_order({ids[2]: 1, ids[0]: 2}).status_code == 201
+
+    assert counters(db, ids[2]) == {
+        "popularity": 5,
+        "units_7d": 5,
+        "units_30d": 5,
+        "units_total": 5,
+        "revenue_total": 5 * 24.0,
+    }
+    listing = client.get("/api/v1/product/", params={"sort_by": "popular"}).json()
+    assert [item["id"] for item in listing["items"]] == [ids[2], ids[0], ids[1]]
+
+
+def test_cancelling_and_reinstating_moves_the_counters(client, db, admin_headers, make_products, place_order):
+    product_id = make_products(1)[0]
+    order_id = place_order({product_id: 3}).json()["id"]
+
+    def set_status(value):
+        response = client.patch(
+            f"/api/v1/order/admin/{order_id}", headers=admin_headers, json={"status": value}
+        )
+        assert response.status_code == 200, response.text
+
+    set_status("cancelled")
+    assert counters(db, product_id)["popularity"] == counters(db, product_id)["units_total"] == 0
+    set_status("processing")
+    assert counters(db, product_id)["popularity"] == counters(db, product_id)["units_total"] == 3
+
+
+def test_refresh_drops_days_that_left_a_window(db, make_products, place_order):
+    product_id = make_products(1)[0]
+    place_order({product_id: 2})
+    today = sales_crud._today()
+
+    sales_crud.refresh_sales_windows(db, today=today + timedelta(days=10))
+    db.commit()
+    assert counters(db, product_id) == {
+        "popularity": 2,
+        "units_7d": 0,
+        "units_30d": 2,
+        "units_total": 2,
+        "revenue_total": 20.0,
+    }
+
+    sales_crud.refresh_sales_windows(db, today=today + timedelta(days=30))
+    db.commit()
+    assert counters(db, product_id)["popularity"] == counters(db, product_id)["units_30d"] == 0
+    assert counters(db, product_id)["units_total"] == 2
+
+
+def test_rebuild_matches_the_incremental_counters(client, db, admin_headers, make_products, place_order):
+    ids = make_products(4)
+    place_order({ids[0]: 1, ids[1]: 2})
+    cancelled = place_order({ids[1]: 5, ids[3]: 1}).json()["id"]
+    place_order({ids[3]: 2, ids[0]: 1})
+    client.patch(f"/api/v1/order/admin/{cancelled}", headers=admin_headers, json={"status": "cancelled"})
+
+    def snapshot():
+        db.expire_all()
+        return (
+            db.execute(select(ProductSalesDay.__table__).order_by("product_id", "day")).all(),
+            [counters(db, product_id) for product_id in ids if db.get(ProductSales, product_id)],
+        )
+
+    incremental = snapshot()
+    sales_crud.rebuild_sales_counters(db)
+    db.commit()
+    assert snapshot() == incremental
+
+
+def test_counters_are_written_in_product_id_order(db, make_products):
+    ids = make_products(3)
+    written = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if executemany:
+            written.append([list(row) for row in parameters])
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        sales_crud.record_sales(
+            db, sales_crud._today(), [(product_id, 1, 10.0) for product_id in reversed(ids)]
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    db.rollback()
+
+    assert written
+    for rows in written:
+        assert rows == sorted(rows), rows